@@ -1,5 +1,6 @@
 import reflex as rx
 from app.states.apartment_state import ApartmentState
+from app.validation import APARTMENT_RULES, FieldRule, html_attributes
 from app.components.navbar import navbar
 
 
@@ -7,8 +8,8 @@ def apartment_form_field(
     label: str,
     name: str,
     placeholder: str,
-    on_change_fn,
     error_var: rx.Var[str],
+    rule: FieldRule,
     field_type: str = "text",
 ) -> rx.Component:
     return rx.el.div(
@@ -17,7 +18,7 @@ def apartment_form_field(
             name=name,
             placeholder=placeholder,
             type=field_type,
-            on_change=on_change_fn,
+            **html_attributes(rule),
             class_name=rx.cond(
                 error_var,
                 "w-full px-4 py-2 mt-1 bg-white border border-red-300 rounded-lg shadow-sm focus:outline-none focus:ring-2 focus:ring-red-500 focus:border-transparent transition-shadow",
@@ -56,39 +57,39 @@ def apartments_page() -> rx.Component:
                             "Apartment Name",
                             "name",
                             "e.g., The Grand Lux",
-                            ApartmentState.set_name,
                             ApartmentState.name_error,
+                            APARTMENT_RULES["name"],
                         ),
                         apartment_form_field(
                             "Address",
                             "address",
                             "123 Main St, Anytown, USA",
-                            ApartmentState.set_address,
                             ApartmentState.address_error,
+                            APARTMENT_RULES["address"],
                         ),
                         rx.el.div(
                             apartment_form_field(
                                 "Bedrooms",
                                 "bedrooms",
                                 "e.g., 2",
-                                ApartmentState.set_bedrooms,
                                 ApartmentState.bedrooms_error,
+                                APARTMENT_RULES["bedrooms"],
                                 field_type="number",
                             ),
                             apartment_form_field(
                                 "Bathrooms",
                                 "bathrooms",
                                 "e.g., 1.5",
-                                ApartmentState.set_bathrooms,
                                 ApartmentState.bathrooms_error,
+                                APARTMENT_RULES["bathrooms"],
                                 field_type="number",
                             ),
                             apartment_form_field(
                                 "Monthly Rent ($)",
                                 "rent",
                                 "e.g., 1500",
-                                ApartmentState.set_rent,
                                 ApartmentState.rent_error,
+                                APARTMENT_RULES["rent"],
                                 field_type="number",
                             ),
                             class_name="grid md:grid-cols-3 gap-6",
@@ -101,7 +102,6 @@ def apartments_page() -> rx.Component:
                             rx.el.textarea(
                                 name="description",
                                 placeholder="A brief description of the apartment...",
-                                on_change=ApartmentState.set_description,
                                 class_name="w-full px-4 py-2 mt-1 bg-white border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-2 focus:ring-orange-500 focus:border-transparent transition-shadow",
                                 rows=4,
                             ),
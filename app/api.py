@@ -0,0 +1,75 @@
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import (
+    FileResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
+from starlette.routing import Route
+from app.auth import ticket_account
+from app.metrics import render
+from app.profiling import profile_path
+from app.registry.exports import DATASETS, FORMATS, export_stream
+from app.registry.imports import MAX_IMPORT_BYTES, ImportTooLarge, spool_upload
+from app.registry.store import registry
+
+
+async def export(request: Request):
+    dataset = request.path_params["dataset"]
+    fmt = request.path_params["fmt"]
+    if dataset not in DATASETS or fmt not in FORMATS:
+        return PlainTextResponse("Not Found", status_code=404)
+    if not ticket_account(request.query_params.get("ticket", ""), request.url.path):
+        return PlainTextResponse("Forbidden", status_code=403)
+    try:
+        stream = export_stream(dataset, fmt)
+    except ValueError as e:
+        return PlainTextResponse(str(e), status_code=501)
+    return StreamingResponse(
+        stream,
+        media_type=FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{fmt}"'},
+    )
+
+
+async def import_upload(request: Request):
+    """Spool a raw upload body to disk; ImportState imports it from there."""
+    if not ticket_account(request.query_params.get("ticket", ""), request.url.path):
+        return JSONResponse({"error": "Forbidden"}, status_code=403)
+    length = request.headers.get("content-length", "")
+    try:
+        if length.isdigit() and int(length) > MAX_IMPORT_BYTES:
+            raise ImportTooLarge()
+        upload = await spool_upload(
+            request.query_params.get("name", ""), request.stream()
+        )
+    except ImportTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({"upload": upload})
+
+
+async def metrics(request: Request):
+    cache = await registry.cache_stats()
+    return PlainTextResponse(render(cache), media_type="text/plain; version=0.0.4")
+
+
+async def profile(request: Request):
+    if not ticket_account(request.query_params.get("ticket", ""), request.url.path):
+        return PlainTextResponse("Forbidden", status_code=403)
+    path = profile_path(request.path_params["name"])
+    if path is None:
+        return PlainTextResponse("Not Found", status_code=404)
+    return FileResponse(path, filename=path.name)
+
+
+api = Starlette(
+    routes=[
+        Route("/export/{dataset}.{fmt}", export),
+        Route("/import", import_upload, methods=["POST"]),
+        Route("/metrics", metrics),
+        Route("/profiles/{name}", profile),
+    ]
+)
\ No newline at end of file
@@ -1,12 +1,19 @@
 import reflex as rx
 from app.state import RegistrationState, form_field
+from app.validation import REGISTRATION_RULES
 from app.login import login
 from app.dashboard import dashboard
 from app.profile import profile_page
 from app.apartments import apartments_page
 from app.citizen_registration import citizen_registration_page
 from app.match_results import match_results_page
+from app.bulk_import import bulk_import_page
+from app.buildings import buildings_page
+from app.profiles import profiles_page
 from app.components.navbar import navbar
+from app.api import api
+from app.metrics import EventMetrics, count_exception
+from app.profiling import profiler
 
 
 def registration_form() -> rx.Component:
@@ -26,23 +33,22 @@ def registration_form() -> rx.Component:
                     "email",
                     "you@example.com",
                     "email",
-                    RegistrationState.set_email,
                     RegistrationState.email_error,
+                    REGISTRATION_RULES["email"],
                 ),
                 form_field(
                     "Password",
                     "password",
                     "••••••••",
                     "password",
-                    RegistrationState.set_password,
                     RegistrationState.password_error,
+                    REGISTRATION_RULES["password"],
                 ),
                 form_field(
                     "Confirm Password",
                     "confirm_password",
                     "••••••••",
                     "password",
-                    RegistrationState.set_confirm_password,
                     RegistrationState.confirm_password_error,
                 ),
                 form_field(
@@ -50,8 +56,8 @@ def registration_form() -> rx.Component:
                     "mobile_number",
                     "+1234567890",
                     "tel",
-                    RegistrationState.set_mobile_number,
                     RegistrationState.mobile_number_error,
+                    REGISTRATION_RULES["mobile_number"],
                 ),
                 rx.el.button(
                     rx.cond(
@@ -138,11 +144,18 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
+    backend_exception_handler=count_exception,
 )
+app.add_middleware(EventMetrics())
+app.add_middleware(profiler)
 app.add_page(index)
 app.add_page(login, route="/login")
 app.add_page(dashboard, route="/dashboard")
 app.add_page(profile_page, route="/profile")
 app.add_page(apartments_page, route="/apartments")
 app.add_page(citizen_registration_page, route="/exchange-request")
-app.add_page(match_results_page, route="/match-results")
\ No newline at end of file
+app.add_page(match_results_page, route="/match-results")
+app.add_page(bulk_import_page, route="/bulk-import")
+app.add_page(buildings_page, route="/buildings")
+app.add_page(profiles_page, route="/profiles")
\ No newline at end of file
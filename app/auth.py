@@ -0,0 +1,60 @@
+"""Signed links that let a logged-in session use the plain HTTP routes.
+
+The routes in app.api run outside Reflex and cannot see a session, so a
+page asks its state for a link instead: ``signed_url`` adds a ticket that
+names the account, the path it opens and an expiry, signed with
+APP_SECRET, and ``ticket_account`` checks it on the way in. Set APP_SECRET
+when running several backend workers; without it each process signs with
+its own random key and only accepts its own links.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+from urllib.parse import urlencode, urlsplit
+import reflex as rx
+from reflex.event import EventSpec
+from app.login import LoginState
+
+SECRET = os.environ.get("APP_SECRET", "").encode() or os.urandom(32)
+# Links are followed as soon as they are issued, so they can expire quickly.
+TICKET_SECONDS = 60
+
+
+def _signature(payload: bytes) -> str:
+    return hmac.new(SECRET, payload, hashlib.sha256).hexdigest()
+
+
+def signed_url(url: str, email: str, **params: str) -> str:
+    """``url`` plus ``params`` and a ticket for ``email``, valid TICKET_SECONDS."""
+    path = urlsplit(url).path
+    payload = json.dumps([email, path, int(time.time()) + TICKET_SECONDS]).encode()
+    ticket = base64.urlsafe_b64encode(payload).decode() + "." + _signature(payload)
+    return f"{url}?{urlencode({**params, 'ticket': ticket})}"
+
+
+def ticket_account(ticket: str, path: str) -> str:
+    """The account a ticket for ``path`` was issued to; "" if it is not valid."""
+    encoded, _, signature = ticket.partition(".")
+    try:
+        payload = base64.urlsafe_b64decode(encoded.encode())
+    except ValueError:
+        return ""
+    if not hmac.compare_digest(signature.encode(), _signature(payload).encode()):
+        return ""
+    email, signed_path, expires = json.loads(payload)
+    if signed_path != path or expires < time.time():
+        return ""
+    return email
+
+
+async def session_account(state: rx.State) -> str:
+    """The logged-in account of ``state``'s session; "" when logged out."""
+    return (await state.get_state(LoginState))._account
+
+
+def open_url(url: str) -> EventSpec:
+    """Navigate to ``url``; downloads leave the page where it is."""
+    return rx.call_script(f"window.location.assign({json.dumps(url)})")
\ No newline at end of file
@@ -0,0 +1,133 @@
+import reflex as rx
+from app.states.building_state import Building, BuildingState
+from app.validation import BUILDING_RULES, html_attributes
+from app.components.navbar import navbar
+
+
+def building_field(
+    label: str,
+    name: str,
+    placeholder: str,
+    error_var: rx.Var[str],
+    input_type: str = "text",
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.label(
+            label,
+            htmlFor=name,
+            class_name="block text-sm font-medium text-gray-700 text-right",
+        ),
+        rx.el.input(
+            name=name,
+            id=name,
+            type=input_type,
+            placeholder=placeholder,
+            **html_attributes(BUILDING_RULES[name]),
+            class_name=rx.cond(
+                error_var != "",
+                "mt-1 block w-full px-3 py-2 bg-white border border-red-300 rounded-md shadow-sm focus:outline-none focus:ring-red-500 focus:border-red-500 sm:text-sm text-right",
+                "mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-orange-500 focus:border-orange-500 sm:text-sm text-right",
+            ),
+        ),
+        rx.cond(
+            error_var != "",
+            rx.el.p(error_var, class_name="mt-2 text-sm text-red-600 text-right"),
+            None,
+        ),
+        class_name="w-full",
+    )
+
+
+def building_row(building: Building) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(building["name"], class_name="px-4 py-2 text-sm text-gray-800"),
+        rx.el.td(building["district"], class_name="px-4 py-2 text-sm text-gray-700"),
+        rx.el.td(
+            rx.cond(
+                building["latitude"].is_not_none(),
+                f"{building['latitude']}, {building['longitude']}",
+                "—",
+            ),
+            class_name="px-4 py-2 text-sm text-gray-500",
+            dir="ltr",
+        ),
+    )
+
+
+def building_form() -> rx.Component:
+    return rx.el.form(
+        rx.el.div(
+            building_field(
+                "رقم العمارة", "name", "كما يكتبه المواطنون", BuildingState.name_error
+            ),
+            building_field(
+                "الحي", "district", "مثال: الحي الأول", BuildingState.district_error
+            ),
+            building_field(
+                "خط العرض",
+                "latitude",
+                "اختياري، مثال: 30.0444",
+                BuildingState.latitude_error,
+                input_type="number",
+            ),
+            building_field(
+                "خط الطول",
+                "longitude",
+                "اختياري، مثال: 31.2357",
+                BuildingState.longitude_error,
+                input_type="number",
+            ),
+            class_name="grid grid-cols-1 md:grid-cols-2 gap-6",
+        ),
+        rx.el.button(
+            rx.cond(
+                BuildingState.is_loading,
+                rx.spinner(class_name="w-5 h-5"),
+                "حفظ العمارة",
+            ),
+            type="submit",
+            disabled=BuildingState.is_loading,
+            class_name="mt-6 px-6 py-3 text-white font-semibold bg-orange-500 rounded-lg shadow-md hover:bg-orange-600 disabled:bg-orange-300",
+        ),
+        on_submit=BuildingState.handle_submit,
+        reset_on_submit=True,
+    )
+
+
+def buildings_page() -> rx.Component:
+    return rx.el.div(
+        navbar(),
+        rx.el.main(
+            rx.el.div(
+                rx.el.h2(
+                    "العمارات والأحياء",
+                    class_name="text-3xl font-bold text-gray-900 mb-2 text-right",
+                ),
+                rx.el.p(
+                    "سجل حي كل عمارة وموقعها ليتمكن البحث من حصر الترشيحات في الحي أو في نطاق مسافة.",
+                    class_name="text-gray-500 mb-8 text-right",
+                ),
+                rx.el.div(
+                    building_form(),
+                    rx.el.table(
+                        rx.el.thead(
+                            rx.el.tr(
+                                rx.el.th("العمارة", class_name="px-4 py-2 text-right"),
+                                rx.el.th("الحي", class_name="px-4 py-2 text-right"),
+                                rx.el.th("الموقع", class_name="px-4 py-2 text-right"),
+                                class_name="text-sm text-gray-600 bg-gray-50",
+                            )
+                        ),
+                        rx.el.tbody(rx.foreach(BuildingState.buildings, building_row)),
+                        class_name="w-full mt-10 border border-gray-200 rounded-lg",
+                    ),
+                    class_name="w-full max-w-4xl p-8 bg-white rounded-xl shadow-lg border border-gray-200",
+                ),
+                class_name="relative flex flex-col items-center min-h-screen py-12 px-4 sm:px-6 lg:px-8 pt-24",
+            ),
+            class_name="w-full bg-gray-50 font-['Lora']",
+        ),
+        dir="rtl",
+        class_name="font-['Lora']",
+        on_mount=BuildingState.load_buildings,
+    )
\ No newline at end of file
@@ -0,0 +1,143 @@
+import reflex as rx
+from app.states.import_state import UPLOAD_ID, ImportState
+from app.registry.exports import AVAILABLE_FORMATS
+from app.registry.imports import ImportRowError
+from app.components.navbar import navbar
+
+
+def import_stat(label: str, value: rx.Var[int], color: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(value, class_name=f"text-2xl font-bold {color}"),
+        rx.el.span(label, class_name="text-sm text-gray-500"),
+        class_name="flex flex-col items-center p-4 bg-gray-50 rounded-lg",
+    )
+
+
+def row_error(error: ImportRowError) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(error["row"], class_name="px-4 py-2 text-sm text-gray-700"),
+        rx.el.td(error["field"], class_name="px-4 py-2 text-sm text-gray-700"),
+        rx.el.td(error["message"], class_name="px-4 py-2 text-sm text-red-600"),
+    )
+
+
+def import_report() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            import_stat("صفوف", ImportState.rows, "text-gray-800"),
+            import_stat("جديد", ImportState.inserted, "text-green-600"),
+            import_stat("تحديث", ImportState.updated, "text-blue-600"),
+            import_stat("بدون تغيير", ImportState.unchanged, "text-gray-500"),
+            import_stat("مرفوض", ImportState.failed, "text-red-600"),
+            class_name="grid grid-cols-2 md:grid-cols-5 gap-4",
+        ),
+        rx.cond(
+            ImportState.row_errors.length() > 0,
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th("الصف", class_name="px-4 py-2 text-right"),
+                        rx.el.th("الحقل", class_name="px-4 py-2 text-right"),
+                        rx.el.th("الخطأ", class_name="px-4 py-2 text-right"),
+                        class_name="text-sm text-gray-600 bg-gray-50",
+                    )
+                ),
+                rx.el.tbody(rx.foreach(ImportState.row_errors, row_error)),
+                class_name="w-full mt-6 border border-gray-200 rounded-lg",
+            ),
+            None,
+        ),
+        class_name="mt-8",
+    )
+
+
+def export_link(dataset: str, fmt: str) -> rx.Component:
+    return rx.el.button(
+        fmt.upper(),
+        on_click=ImportState.export_dataset(dataset, fmt),
+        class_name="px-4 py-2 text-sm font-medium text-orange-600 border border-orange-300 rounded-lg hover:bg-orange-50",
+    )
+
+
+def export_row(label: str, dataset: str) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(label, class_name="text-gray-700"),
+        rx.el.div(
+            *(export_link(dataset, fmt) for fmt in AVAILABLE_FORMATS),
+            class_name="flex gap-2",
+        ),
+        class_name="flex items-center justify-between py-3",
+    )
+
+
+def export_section() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3(
+            "تصدير البيانات",
+            class_name="text-xl font-bold text-gray-900 mb-2 text-right",
+        ),
+        export_row("جميع المواطنين", "citizens"),
+        export_row("جميع الترشيحات لكل مواطن", "matches"),
+        class_name="mt-10 pt-6 border-t border-gray-200 divide-y divide-gray-100",
+    )
+
+
+def bulk_import_page() -> rx.Component:
+    return rx.el.div(
+        navbar(),
+        rx.el.main(
+            rx.el.div(
+                rx.el.div(
+                    rx.el.h2(
+                        "استيراد طلبات التبديل",
+                        class_name="text-3xl font-bold text-gray-900 mb-2 text-right",
+                    ),
+                    rx.el.p(
+                        "ارفع ملف CSV أو Excel (xlsx) يحتوي على الأعمدة: الرقم القومي، الاسم، رقم العمارة، الدور الحالي، الاتجاه الحالي، رقم الموبايل، الرغبة في الدور، الرغبة في الاتجاه.",
+                        class_name="text-gray-500 mb-8 text-right",
+                    ),
+                    rx.el.label(
+                        rx.icon(
+                            tag="file_spreadsheet", class_name="w-12 h-12 text-gray-400"
+                        ),
+                        rx.el.p(
+                            "اختر ملف CSV أو xlsx",
+                            class_name="mt-2 text-gray-600",
+                        ),
+                        rx.el.input(
+                            type="file",
+                            id=UPLOAD_ID,
+                            accept=".csv,.xlsx",
+                            class_name="mt-4 text-sm text-gray-600 file:mr-0 file:ml-4 file:py-2 file:px-4 file:rounded-lg file:border-0 file:bg-orange-50 file:text-orange-600 hover:file:bg-orange-100",
+                        ),
+                        class_name="flex flex-col items-center justify-center p-10 border-2 border-dashed border-gray-300 rounded-lg cursor-pointer hover:border-orange-400",
+                    ),
+                    rx.el.button(
+                        rx.cond(
+                            ImportState.is_importing,
+                            rx.el.div(
+                                rx.spinner(class_name="w-5 h-5 mr-2"),
+                                f"جاري الاستيراد... ({ImportState.rows})",
+                                class_name="flex items-center",
+                            ),
+                            "استيراد",
+                        ),
+                        on_click=ImportState.start_import,
+                        disabled=ImportState.is_importing,
+                        class_name="mt-6 px-8 py-3 text-white font-semibold bg-orange-500 rounded-lg shadow-md hover:bg-orange-600 disabled:bg-orange-300",
+                    ),
+                    rx.cond(
+                        ImportState.import_done | ImportState.is_importing,
+                        import_report(),
+                        None,
+                    ),
+                    export_section(),
+                    class_name="w-full max-w-4xl p-8 bg-white rounded-xl shadow-lg border border-gray-200",
+                ),
+                class_name="relative flex flex-col items-center min-h-screen py-12 px-4 sm:px-6 lg:px-8 pt-24",
+            ),
+            class_name="w-full bg-gray-50 font-['Lora']",
+        ),
+        dir="rtl",
+        class_name="font-['Lora']",
+    )
\ No newline at end of file
@@ -1,5 +1,6 @@
 import reflex as rx
 from app.states.citizen_state import CitizenState
+from app.validation import CITIZEN_RULES, html_attributes
 from app.components.navbar import navbar
 
 
@@ -7,7 +8,6 @@ def form_input_field(
     label: str,
     name: str,
     placeholder: str,
-    on_change_fn,
     error_var: rx.Var[str],
     input_type: str = "text",
 ) -> rx.Component:
@@ -22,7 +22,7 @@ def form_input_field(
             id=name,
             type=input_type,
             placeholder=placeholder,
-            on_change=on_change_fn,
+            **html_attributes(CITIZEN_RULES[name]),
             class_name=rx.cond(
                 error_var != "",
                 "mt-1 block w-full px-3 py-2 bg-white border border-red-300 rounded-md shadow-sm focus:outline-none focus:ring-red-500 focus:border-red-500 sm:text-sm text-right",
@@ -43,7 +43,6 @@ def form_select_field(
     name: str,
     placeholder: str,
     options: list[str],
-    on_change_fn,
     error_var: rx.Var[str],
 ) -> rx.Component:
     return rx.el.div(
@@ -57,7 +56,7 @@ def form_select_field(
             rx.foreach(options, lambda option: rx.el.option(option, value=option)),
             name=name,
             id=name,
-            on_change=on_change_fn,
+            **html_attributes(CITIZEN_RULES[name]),
             class_name=rx.cond(
                 error_var != "",
                 "mt-1 block w-full pl-3 pr-10 py-2 text-base border-red-300 focus:outline-none focus:ring-red-500 focus:border-red-500 sm:text-sm rounded-md text-right",
@@ -81,29 +80,24 @@ def registration_form_content() -> rx.Component:
                 "الاسم",
                 "name",
                 "محمد علي",
-                CitizenState.set_name,
                 CitizenState.name_error,
             ),
             form_input_field(
                 "الرقم القومي",
                 "national_id",
                 "14 رقم",
-                CitizenState.set_national_id,
                 CitizenState.national_id_error,
-                input_type="number",
             ),
             form_input_field(
                 "رقم العمارة",
                 "building",
                 "مثال: 12",
-                CitizenState.set_building,
                 CitizenState.building_error,
             ),
             form_input_field(
                 "الدور الحالي",
                 "floor",
                 "مثال: 3",
-                CitizenState.set_floor,
                 CitizenState.floor_error,
                 input_type="number",
             ),
@@ -112,14 +106,12 @@ def registration_form_content() -> rx.Component:
                 "direction",
                 "اختر الاتجاه",
                 CitizenState.DIRECTION_OPTIONS,
-                CitizenState.set_direction,
                 CitizenState.direction_error,
             ),
             form_input_field(
                 "رقم الموبايل (اختياري)",
                 "phone",
                 "01xxxxxxxxx",
-                CitizenState.set_phone,
                 CitizenState.phone_error,
                 input_type="tel",
             ),
@@ -128,7 +120,6 @@ def registration_form_content() -> rx.Component:
                 "wish_floor",
                 "اختر رغبتك",
                 CitizenState.WISH_FLOOR_OPTIONS,
-                CitizenState.set_wish_floor,
                 CitizenState.wish_floor_error,
             ),
             form_select_field(
@@ -136,7 +127,6 @@ def registration_form_content() -> rx.Component:
                 "wish_direction",
                 "اختر رغبتك",
                 CitizenState.WISH_DIRECTION_OPTIONS,
-                CitizenState.set_wish_direction,
                 CitizenState.wish_direction_error,
             ),
             class_name="grid grid-cols-1 md:grid-cols-2 gap-6",
@@ -23,6 +23,9 @@ def navbar() -> rx.Component:
                         nav_link("Apartments", "/apartments"),
                         nav_link("طلب تبديل", "/exchange-request"),
                         nav_link("نتائج المطابقة", "/match-results"),
+                        nav_link("استيراد جماعي", "/bulk-import"),
+                        nav_link("العمارات", "/buildings"),
+                        nav_link("تحليل الأداء", "/profiles"),
                         rx.el.button(
                             "Logout",
                             on_click=NavbarState.logout,
@@ -3,6 +3,54 @@ from app.states.dashboard_state import DashboardState
 from app.components.navbar import navbar
 
 
+def rematch_card() -> rx.Component:
+    return rx.el.div(
+        rx.el.h3(
+            "إعادة المطابقة الشاملة",
+            class_name="text-xl font-bold text-gray-900",
+        ),
+        rx.el.p(
+            "احسب الترشيحات لجميع المواطنين مرة واحدة لتظهر نتائج البحث فورًا.",
+            class_name="text-gray-500 mt-2 mb-6",
+        ),
+        rx.el.div(
+            rx.el.div(
+                class_name="h-3 bg-orange-500 rounded-full transition-all duration-300",
+                style={"width": f"{DashboardState.rematch_percent}%"},
+            ),
+            class_name="w-full h-3 bg-gray-100 rounded-full overflow-hidden",
+        ),
+        rx.el.p(
+            rx.cond(
+                DashboardState.is_rematching,
+                f"المباني: {DashboardState.rematch_done} / {DashboardState.rematch_total}",
+                rx.cond(
+                    DashboardState.rematch_finished,
+                    f"تمت مطابقة {DashboardState.rematch_citizens} مواطن.",
+                    "",
+                ),
+            ),
+            class_name="text-sm text-gray-600 mt-2 h-5",
+        ),
+        rx.el.button(
+            rx.cond(
+                DashboardState.is_rematching,
+                rx.el.div(
+                    rx.spinner(class_name="w-5 h-5 ml-2"),
+                    f"{DashboardState.rematch_percent}%",
+                    class_name="flex items-center justify-center",
+                ),
+                "بدء إعادة المطابقة",
+            ),
+            on_click=DashboardState.start_rematch,
+            disabled=DashboardState.is_rematching,
+            class_name="w-full mt-4 py-3 text-white font-semibold bg-orange-500 rounded-lg shadow-md hover:bg-orange-600 disabled:bg-orange-300",
+        ),
+        dir="rtl",
+        class_name="w-full max-w-md p-8 mt-8 bg-white rounded-xl shadow-lg border border-gray-200 text-right",
+    )
+
+
 def dashboard() -> rx.Component:
     return rx.el.div(
         navbar(),
@@ -24,6 +72,7 @@ def dashboard() -> rx.Component:
                     ),
                     class_name="w-full max-w-md p-8 bg-white rounded-xl shadow-lg border border-gray-200 text-center",
                 ),
+                rematch_card(),
                 class_name="relative flex flex-col items-center justify-center min-h-screen",
             ),
             class_name="w-full bg-gray-50 font-['Lora'] pt-16",
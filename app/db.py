@@ -0,0 +1,85 @@
+import asyncio
+import os
+from sqlalchemy import Column, Float, Index, Integer, MetaData, String, Table
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+DATABASE_URL = os.environ.get("APP_DATABASE_URL", "sqlite+aiosqlite:///app.db")
+
+metadata = MetaData()
+
+citizens_table = Table(
+    "citizens",
+    metadata,
+    Column("national_id", String(14), primary_key=True),
+    Column("name", String, nullable=False),
+    Column("building", String, nullable=False),
+    Column("floor", Integer, nullable=False),
+    Column("direction", String, nullable=False),
+    Column("phone", String, nullable=False, default=""),
+    Column("wish_floor", String, nullable=False),
+    Column("wish_direction", String, nullable=False),
+    Index("ix_citizens_building_floor", "building", "floor"),
+    Index("ix_citizens_direction_wish_direction", "direction", "wish_direction"),
+)
+
+buildings_table = Table(
+    "buildings",
+    metadata,
+    Column("name", String, primary_key=True),
+    Column("district", String, nullable=False),
+    Column("latitude", Float),
+    Column("longitude", Float),
+    Index("ix_buildings_district", "district"),
+)
+
+accounts_table = Table(
+    "accounts",
+    metadata,
+    Column("email", String, primary_key=True),
+    Column("password_hash", String, nullable=False),
+    Column("mobile_number", String, nullable=False, default=""),
+)
+
+apartments_table = Table(
+    "apartments",
+    metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("name", String, nullable=False),
+    Column("address", String, nullable=False),
+    Column("bedrooms", Integer),
+    Column("bathrooms", Float),
+    Column("rent", Float),
+    Column("description", String, nullable=False, default=""),
+)
+
+profiles_table = Table(
+    "profiles",
+    metadata,
+    Column("account_email", String, primary_key=True),
+    Column("full_name", String, nullable=False, default=""),
+    Column("email", String, nullable=False, default=""),
+    Column("mobile_number", String, nullable=False, default=""),
+    Column("date_of_birth", String, nullable=False, default=""),
+    Column("address", String, nullable=False, default=""),
+    Column("city", String, nullable=False, default=""),
+    Column("state_province", String, nullable=False, default=""),
+    Column("postal_code", String, nullable=False, default=""),
+    Column("country", String, nullable=False, default=""),
+    Column("bio", String, nullable=False, default=""),
+    Column("avatar_url", String, nullable=False, default=""),
+)
+
+engine = create_async_engine(DATABASE_URL)
+
+_schema_ready: set[AsyncEngine] = set()
+_schema_lock = asyncio.Lock()
+
+
+async def ensure_schema(bind: AsyncEngine = engine):
+    if bind in _schema_ready:
+        return
+    async with _schema_lock:
+        if bind not in _schema_ready:
+            async with bind.begin() as conn:
+                await conn.run_sync(metadata.create_all)
+            _schema_ready.add(bind)
\ No newline at end of file
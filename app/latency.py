@@ -0,0 +1,10 @@
+import asyncio
+import os
+
+SIMULATED_LATENCY = os.environ.get("SIMULATED_LATENCY", "").lower() in ("1", "true", "yes")
+
+
+async def simulated_latency(seconds: float):
+    """Demo-only pause; a no-op unless SIMULATED_LATENCY is switched on."""
+    if SIMULATED_LATENCY:
+        await asyncio.sleep(seconds)
\ No newline at end of file
@@ -1,40 +1,36 @@
 import reflex as rx
 from typing import Optional
-import re
+from app.latency import simulated_latency
+from app.registry.accounts import verify_account
+from app.validation import LOGIN_RULES, FieldRule, check, html_attributes
 
 
 class LoginState(rx.State):
-    email: str = ""
     password: str = ""
     email_error: Optional[str] = None
     password_error: Optional[str] = None
     is_loading: bool = False
-
-    def _validate_email(self) -> None:
-        self.email_error = None
-        if not self.email:
-            self.email_error = "Email cannot be empty."
-        elif not re.match("[^@]+@[^@]+\\.[^@]+", self.email):
-            self.email_error = "Invalid email format."
-
-    def _validate_password(self) -> None:
-        self.password_error = None
-        if not self.password:
-            self.password_error = "Password cannot be empty."
+    # The session's account, set only once its password has been verified.
+    # A backend-only var, so no client event can set it.
+    _account: str = ""
 
     @rx.event
     async def handle_login(self, form_data: dict):
         self.is_loading = True
-        self.email = form_data.get("email", "").strip()
-        self.password = form_data.get("password", "")
-        self._validate_email()
-        self._validate_password()
+        self._account = ""
+        email = form_data.get("email", "").strip()
+        password = form_data.get("password", "")
+        self.email_error = check(LOGIN_RULES["email"], email) or None
+        self.password_error = check(LOGIN_RULES["password"], password) or None
         if self.email_error or self.password_error:
             self.is_loading = False
             return
-        import asyncio
-
-        await asyncio.sleep(1.5)
+        await simulated_latency(1.5)
+        if not await verify_account(email, password):
+            self.password_error = "Incorrect email or password."
+            self.is_loading = False
+            return
+        self._account = email
         self.is_loading = False
         yield rx.redirect("/dashboard")
 
@@ -58,8 +54,8 @@ def login_form_field(
     name: str,
     placeholder: str,
     field_type: str,
-    on_change_fn,
     error_var: rx.Var[str],
+    rule: FieldRule,
 ) -> rx.Component:
     return rx.el.div(
         rx.el.label(label, class_name="text-sm font-medium text-gray-700"),
@@ -67,7 +63,7 @@ def login_form_field(
             name=name,
             placeholder=placeholder,
             type=field_type,
-            on_change=on_change_fn,
+            **html_attributes(rule),
             class_name=rx.cond(
                 error_var,
                 "w-full px-4 py-2 mt-1 bg-white border border-red-300 rounded-lg shadow-sm focus:outline-none focus:ring-2 focus:ring-red-500 focus:border-transparent transition-shadow",
@@ -95,16 +91,16 @@ def login_form() -> rx.Component:
                     "email",
                     "you@example.com",
                     "email",
-                    LoginState.set_email,
                     LoginState.email_error,
+                    LOGIN_RULES["email"],
                 ),
                 login_form_field(
                     "Password",
                     "password",
                     "••••••••",
                     "password",
-                    LoginState.set_password,
                     LoginState.password_error,
+                    LOGIN_RULES["password"],
                 ),
                 rx.el.button(
                     rx.cond(
@@ -1,22 +1,44 @@
 import reflex as rx
-from app.states.citizen_state import CitizenState, MatchResult
+from app.states.citizen_state import (
+    CitizenOption,
+    CitizenState,
+    ExchangeCycleView,
+)
 from app.components.navbar import navbar
+from app.validation import MATCH_RADIUS_RULE, html_attributes
+
+
+def citizen_suggestion(option: CitizenOption) -> rx.Component:
+    return rx.el.button(
+        rx.el.span(option["name"], class_name="font-medium text-gray-800"),
+        rx.el.span(option["national_id"], class_name="text-sm text-gray-500"),
+        on_click=lambda: CitizenState.select_citizen(option),
+        type="button",
+        class_name="flex items-center justify-between w-full px-4 py-2 text-right hover:bg-orange-50",
+    )
 
 
 def citizen_selector() -> rx.Component:
     return rx.el.div(
-        rx.el.select(
-            rx.el.option("اختر مواطن لبدء البحث", value="", disabled=True),
-            rx.foreach(
-                CitizenState.citizens,
-                lambda citizen: rx.el.option(
-                    f"{citizen['name']} ({citizen['national_id']})",
-                    value=citizen["national_id"],
+        rx.el.div(
+            rx.debounce_input(
+                rx.el.input(
+                    value=CitizenState.citizen_query,
+                    on_change=CitizenState.search_citizens,
+                    placeholder="ابحث بالاسم أو الرقم القومي",
+                    class_name="w-full p-3 bg-white border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-2 focus:ring-orange-500",
+                ),
+                debounce_timeout=300,
+            ),
+            rx.cond(
+                CitizenState.citizen_suggestions.length() > 0,
+                rx.el.div(
+                    rx.foreach(CitizenState.citizen_suggestions, citizen_suggestion),
+                    class_name="absolute z-10 w-full mt-1 max-h-72 overflow-y-auto bg-white border border-gray-200 rounded-lg shadow-lg divide-y divide-gray-100",
                 ),
+                None,
             ),
-            on_change=CitizenState.set_current_citizen_id,
-            class_name="w-full md:w-1/2 p-3 bg-white border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-2 focus:ring-orange-500",
-            default_value="",
+            class_name="relative w-full md:w-1/2",
         ),
         rx.el.button(
             rx.cond(
@@ -43,26 +65,60 @@ def citizen_selector() -> rx.Component:
     )
 
 
-def match_card(result: MatchResult) -> rx.Component:
-    citizen = result["citizen"]
-    score = result["score"]
+def match_filters() -> rx.Component:
+    return rx.el.div(
+        rx.el.select(
+            rx.el.option("كل الأحياء", value=""),
+            rx.foreach(
+                CitizenState.district_options,
+                lambda district: rx.el.option(district, value=district),
+            ),
+            value=CitizenState.match_district,
+            on_change=CitizenState.set_match_district,
+            class_name="p-2 bg-white border border-gray-300 rounded-lg text-sm",
+        ),
+        rx.el.input(
+            default_value=CitizenState.match_radius_km,
+            on_blur=CitizenState.set_match_radius_km,
+            input_mode="decimal",
+            pattern=html_attributes(MATCH_RADIUS_RULE)["pattern"],
+            placeholder="نطاق المسافة (كم)",
+            class_name="w-44 p-2 bg-white border border-gray-300 rounded-lg text-sm",
+        ),
+        rx.el.span(
+            "النطاق يُحسب من موقع عمارتك المسجل.",
+            class_name="text-xs text-gray-500",
+        ),
+        class_name="flex flex-wrap items-center gap-3 w-full mt-4",
+    )
+
+
+def match_card(match: rx.Var[tuple[str, int]]) -> rx.Component:
+    details = CitizenState.match_details[match[0]]
+    name, building, floor, phone, direction, wish_floor, wish_direction = (
+        details[i] for i in range(7)
+    )
+    direction = rx.Var.create(CitizenState.DIRECTION_OPTIONS)[direction]
+    wish_floor = rx.Var.create(CitizenState.WISH_FLOOR_OPTIONS)[wish_floor]
+    wish_direction = rx.Var.create(CitizenState.WISH_DIRECTION_OPTIONS)[
+        wish_direction
+    ]
+    score = match[1]
     return rx.el.div(
         rx.el.div(
             rx.el.div(
                 rx.el.image(
-                    src=f"https://api.dicebear.com/9.x/initials/svg?seed={citizen['name']}",
+                    src=f"https://api.dicebear.com/9.x/initials/svg?seed={name}",
                     class_name="w-16 h-16 rounded-full border-2 border-white",
                 ),
                 rx.el.div(
-                    rx.el.h3(
-                        citizen["name"], class_name="text-lg font-bold text-gray-800"
-                    ),
+                    rx.el.h3(name, class_name="text-lg font-bold text-gray-800"),
                     rx.el.p(
-                        f"عمارة: {citizen['building']}, دور: {citizen['floor']}, اتجاه: {citizen['direction']}",
+                        f"عمارة: {building}, دور: {floor}, اتجاه: {direction}",
                         class_name="text-sm text-gray-600",
                     ),
                     rx.el.p(
-                        f"رغبة الدور: {citizen['wish_floor']}, رغبة الاتجاه: {citizen['wish_direction']}",
+                        f"رغبة الدور: {wish_floor}, رغبة الاتجاه: {wish_direction}",
                         class_name="text-sm text-gray-500 mt-1",
                     ),
                 ),
@@ -82,6 +138,10 @@ def match_card(result: MatchResult) -> rx.Component:
                         },
                     ),
                     rx.el.span("توافق", class_name="text-xs text-gray-500"),
+                    rx.el.span(
+                        CitizenState.match_breakdowns[match[0]],
+                        class_name="text-[10px] text-gray-400 whitespace-nowrap",
+                    ),
                     class_name="flex flex-col items-center justify-center text-center",
                 ),
                 class_name="flex items-center justify-center p-2 rounded-full",
@@ -92,8 +152,8 @@ def match_card(result: MatchResult) -> rx.Component:
             rx.el.div(
                 rx.icon(tag="phone", class_name="w-4 h-4 ml-2 text-gray-400"),
                 rx.el.a(
-                    citizen["phone"],
-                    href=f"tel:{citizen['phone']}",
+                    phone,
+                    href=f"tel:{phone}",
                     class_name="text-orange-600 hover:underline",
                 ),
                 class_name="flex items-center text-sm",
@@ -104,8 +164,51 @@ def match_card(result: MatchResult) -> rx.Component:
     )
 
 
+def match_pagination() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            rx.icon(tag="chevron_right", class_name="w-5 h-5"),
+            "السابق",
+            on_click=CitizenState.prev_match_page,
+            disabled=~CitizenState.has_prev_match_page,
+            class_name="flex items-center gap-1 px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        rx.el.span(CitizenState.match_page_label, class_name="text-sm text-gray-600"),
+        rx.el.button(
+            "التالي",
+            rx.icon(tag="chevron_left", class_name="w-5 h-5"),
+            on_click=CitizenState.next_match_page,
+            disabled=~CitizenState.has_next_match_page,
+            class_name="flex items-center gap-1 px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-lg hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed",
+        ),
+        class_name="flex items-center justify-center gap-4 mt-8",
+    )
+
+
+def new_matches_banner() -> rx.Component:
+    return rx.cond(
+        CitizenState.new_match_count > 0,
+        rx.el.div(
+            rx.el.span(
+                f"سجل {CitizenState.new_match_count} مواطن جديد متوافق منذ آخر بحث.",
+                class_name="text-sm text-green-800",
+            ),
+            rx.el.button(
+                "تحديث النتائج",
+                on_click=lambda: CitizenState.match_requests(
+                    CitizenState.current_citizen_id
+                ),
+                class_name="px-4 py-1 text-sm font-medium text-green-800 border border-green-300 rounded-lg hover:bg-green-100",
+            ),
+            class_name="flex items-center justify-between gap-4 p-3 mb-6 bg-green-50 border border-green-200 rounded-lg",
+        ),
+        None,
+    )
+
+
 def results_display() -> rx.Component:
     return rx.el.div(
+        new_matches_banner(),
         rx.cond(
             CitizenState.is_searching,
             rx.el.div(
@@ -120,8 +223,11 @@ def results_display() -> rx.Component:
                 rx.cond(
                     CitizenState.matches.length() > 0,
                     rx.el.div(
-                        rx.foreach(CitizenState.matches, match_card),
-                        class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6",
+                        rx.el.div(
+                            rx.foreach(CitizenState.matches, match_card),
+                            class_name="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6",
+                        ),
+                        match_pagination(),
                     ),
                     rx.el.div(
                         rx.icon(
@@ -152,6 +258,73 @@ def results_display() -> rx.Component:
     )
 
 
+def exchange_cycle_card(cycle: ExchangeCycleView) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.foreach(
+                cycle["members"],
+                lambda member: rx.el.span(
+                    member,
+                    class_name="px-3 py-1 text-sm text-gray-700 bg-gray-100 rounded-full",
+                ),
+            ),
+            class_name="flex flex-wrap items-center gap-2",
+        ),
+        rx.el.span(
+            f"{cycle['score']}%", class_name="text-lg font-bold text-orange-500"
+        ),
+        class_name="flex items-center justify-between gap-4 p-4 bg-white rounded-lg border border-gray-200",
+    )
+
+
+def exchange_plan_section() -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.div(
+                rx.el.h3(
+                    "خطة التبادل الشاملة",
+                    class_name="text-xl font-bold text-gray-900 text-right",
+                ),
+                rx.el.p(
+                    "توزيع دوائر تبادل (ثنائية وثلاثية وأكثر) على جميع المسجلين.",
+                    class_name="text-sm text-gray-500 text-right",
+                ),
+            ),
+            rx.el.button(
+                rx.cond(
+                    CitizenState.is_planning,
+                    rx.el.div(
+                        rx.spinner(class_name="w-5 h-5 mr-2"),
+                        "جاري الحساب...",
+                        class_name="flex items-center",
+                    ),
+                    "إنشاء خطة التبادل",
+                ),
+                on_click=CitizenState.build_exchange_plan,
+                disabled=CitizenState.is_planning,
+                class_name="px-6 py-3 text-white font-semibold bg-gray-800 rounded-lg shadow-md hover:bg-gray-900 disabled:bg-gray-400 transition-all",
+            ),
+            class_name="flex flex-col md:flex-row items-center justify-between gap-4",
+        ),
+        rx.cond(
+            CitizenState.plan_built,
+            rx.el.div(
+                rx.el.p(
+                    f"{CitizenState.plan_cycle_count} دائرة تبادل، {CitizenState.plan_matched_count} مواطن تم توزيعهم، {CitizenState.plan_unmatched_count} بدون شريك.",
+                    class_name="text-gray-700 text-right",
+                ),
+                rx.el.div(
+                    rx.foreach(CitizenState.exchange_cycles, exchange_cycle_card),
+                    class_name="flex flex-col gap-3 mt-4",
+                ),
+                class_name="mt-6",
+            ),
+            None,
+        ),
+        class_name="w-full mt-12 pt-8 border-t border-gray-200",
+    )
+
+
 def match_results_page() -> rx.Component:
     return rx.el.div(
         navbar(),
@@ -167,7 +340,9 @@ def match_results_page() -> rx.Component:
                 ),
                 rx.el.div(
                     citizen_selector(),
+                    match_filters(),
                     results_display(),
+                    exchange_plan_section(),
                     class_name="w-full max-w-6xl p-8 bg-white rounded-xl shadow-lg border border-gray-200",
                 ),
                 class_name="relative flex flex-col items-center min-h-screen py-12 px-4 sm:px-6 lg:px-8 pt-24",
@@ -176,4 +351,5 @@ def match_results_page() -> rx.Component:
         ),
         dir="rtl",
         class_name="font-['Lora']",
+        on_mount=CitizenState.load_match_filters,
     )
\ No newline at end of file
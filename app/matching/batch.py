@@ -0,0 +1,117 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Iterable, Optional, Sequence
+import numpy as np
+from app.matching.vectorized import CitizenColumns
+
+# Score-matrix cells per numpy call inside a worker: rows are scored in
+# blocks of BLOCK_CELLS // N so the temporaries stay around 100 MB however
+# large the population grows.
+BLOCK_CELLS = 1 << 22
+
+Ranking = list[tuple[int, int]]
+RankedRows = list[tuple[int, np.ndarray, np.ndarray]]
+
+_columns: Optional[CitizenColumns] = None
+
+
+def _init_worker(columns: CitizenColumns):
+    global _columns
+    _columns = columns
+
+
+def rank_rows(
+    columns: CitizenColumns, rows: list[int], limit: Optional[int] = None
+) -> RankedRows:
+    """(row, positions, scores) of the best ``limit`` matches for each row.
+
+    Positions are ordered like ``scan_matches``: score descending, then
+    registration order.
+    """
+    ranked = []
+    block_size = max(1, BLOCK_CELLS // max(1, len(columns)))
+    for start in range(0, len(rows), block_size):
+        block = np.asarray(rows[start : start + block_size])
+        scores = columns.score_rows(block)
+        for row, row_scores in zip(block, scores):
+            hits = np.flatnonzero(row_scores)
+            order = hits[np.argsort(-row_scores[hits], kind="stable")][:limit]
+            ranked.append(
+                (int(row), order.astype(np.int32), row_scores[order].astype(np.int8))
+            )
+    return ranked
+
+
+def _rank_in_worker(rows: list[int], limit: Optional[int]) -> RankedRows:
+    return rank_rows(_columns, rows, limit)
+
+
+class RematchRunning(RuntimeError):
+    """A rematch was asked for while another one is still running."""
+
+
+class Rankings:
+    """Precomputed rankings for a whole population, kept as compact arrays.
+
+    Each entry holds the matched rows and their scores, a few bytes per
+    match instead of a tuple per match.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self._entries: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, row: int, positions: np.ndarray, scores: np.ndarray):
+        self._entries[row] = (positions, scores)
+
+    def get(self, row: int, limit: Optional[int] = None) -> Optional[Ranking]:
+        entry = self._entries.get(row)
+        if entry is None:
+            return None
+        if self.limit is not None and (limit is None or limit > self.limit):
+            return None
+        positions, scores = entry
+        return list(zip(positions[:limit].tolist(), scores[:limit].tolist()))
+
+    def discard(self, rows: Iterable[int]):
+        for row in rows:
+            self._entries.pop(row, None)
+
+
+async def rank_all(
+    columns: CitizenColumns,
+    groups: Sequence[list[int]],
+    rankings: Rankings,
+    workers: Optional[int] = None,
+) -> AsyncIterator[tuple[int, int]]:
+    """Fill ``rankings`` for the rows in ``groups``, yielding (groups done, total).
+
+    Each group, one building in the registry's job, is a task on a process
+    pool whose workers receive the columns once, at start-up.
+    """
+    total = len(groups)
+    yield 0, total
+    if not total:
+        return
+    loop = asyncio.get_running_loop()
+    # Workers are spawned rather than forked: the server process runs an
+    # event loop and threads that must not be copied into the children.
+    with ProcessPoolExecutor(
+        max_workers=min(workers or os.cpu_count() or 1, total),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(columns,),
+    ) as pool:
+        tasks = [
+            loop.run_in_executor(pool, _rank_in_worker, rows, rankings.limit)
+            for rows in groups
+        ]
+        for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+            for row, positions, scores in await task:
+                rankings.put(row, positions, scores)
+            yield done, total
\ No newline at end of file
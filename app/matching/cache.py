@@ -0,0 +1,66 @@
+from collections import OrderedDict
+from typing import Optional
+from app.matching.engine import MatchIndex
+from app.matching.records import CitizenTable
+from app.matching.rules import MatchProfile
+
+Ranking = list[tuple[int, int]]
+
+
+class MatchCache:
+    """LRU cache of ranked (row, score) matches per searching citizen.
+
+    The cached citizens are themselves kept in a MatchIndex, so when someone
+    registers or changes their flat only the entries whose owner is
+    compatible with the old or new record are dropped, found through the
+    same bucket and floor-range lookup a search uses.
+    """
+
+    def __init__(self, table: CitizenTable, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[
+            int, tuple[Optional[int], Ranking, MatchProfile]
+        ] = OrderedDict()
+        self._owners = MatchIndex(table)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, row: int, limit: Optional[int] = None) -> Optional[Ranking]:
+        entry = self._entries.get(row)
+        if entry is not None:
+            cached_limit, ranking, _ = entry
+            if cached_limit is None or (limit is not None and limit <= cached_limit):
+                self._entries.move_to_end(row)
+                self.hits += 1
+                return ranking if limit is None else ranking[:limit]
+        self.misses += 1
+        return None
+
+    def put(self, row: int, user: MatchProfile, limit: Optional[int], ranking: Ranking):
+        self._drop(row)
+        self._entries[row] = (limit, ranking, user)
+        self._owners.add(row, user)
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, row: int):
+        entry = self._entries.pop(row, None)
+        if entry is not None:
+            self._owners.remove(row, entry[2])
+
+    def invalidate(
+        self, row: int, citizen: MatchProfile, previous: Optional[MatchProfile] = None
+    ):
+        """Drop entries a change of ``row`` from ``previous`` could affect."""
+        stale = set(self._owners.candidates(citizen, row))
+        if previous is not None:
+            stale.update(self._owners.candidates(previous, row))
+        stale.add(row)
+        for owner in stale:
+            self._drop(owner)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
\ No newline at end of file
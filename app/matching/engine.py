@@ -0,0 +1,215 @@
+import bisect
+import heapq
+from array import array
+from typing import Container, Iterable, Optional
+from app.matching.records import CitizenTable
+from app.matching.rules import (
+    ANY_DIRECTION,
+    UNKNOWN,
+    WISH_ANY,
+    WISH_HIGHER,
+    WISH_LOWER,
+    MatchProfile,
+    floor_range,
+    is_match,
+    profile,
+)
+from app.matching.scoring import scorer
+from app.matching.trace import MatchTrace
+
+
+def scan_matches(user: dict, citizens: Iterable[dict]) -> list[dict]:
+    """Reference implementation: checks every citizen against the user."""
+    user_profile = profile(user)
+    matches = []
+    for other in citizens:
+        other_profile = profile(other)
+        if other["national_id"] != user["national_id"] and is_match(
+            user_profile, other_profile
+        ):
+            score = scorer.score(
+                user_profile, other_profile, other["building"] == user["building"]
+            )
+            matches.append({"citizen": other, "score": score})
+    matches.sort(key=lambda x: x["score"], reverse=True)
+    return matches
+
+
+def _intersect(a, b):
+    low = a[0] if b[0] is None else b[0] if a[0] is None else max(a[0], b[0])
+    high = a[1] if b[1] is None else b[1] if a[1] is None else min(a[1], b[1])
+    if low is not None and high is not None and high - low < 2:
+        return None
+    return low, high
+
+
+class _Bucket:
+    __slots__ = ("floors", "rows")
+
+    def __init__(self):
+        self.floors = array("h")
+        self.rows = array("i")
+
+    def add(self, floor: int, row: int):
+        i = bisect.bisect_right(self.floors, floor)
+        self.floors.insert(i, floor)
+        self.rows.insert(i, row)
+
+    def remove(self, floor: int, row: int):
+        i = bisect.bisect_left(self.floors, floor)
+        j = bisect.bisect_right(self.floors, floor)
+        i += self.rows[i:j].index(row)
+        del self.floors[i]
+        del self.rows[i]
+
+    def between(self, low: Optional[int], high: Optional[int]) -> array:
+        i = 0 if low is None else bisect.bisect_right(self.floors, low)
+        j = len(self.floors) if high is None else bisect.bisect_left(self.floors, high)
+        return self.rows[i:j]
+
+
+class MatchIndex:
+    """Rows of a CitizenTable bucketed by (direction, wish_direction, wish_floor).
+
+    Buckets hold row numbers sorted by floor in typed arrays. A query only
+    visits the buckets whose members can accept the user's flat and whose
+    flat the user accepts, then slices the floor range with bisect. Results
+    are (row, score) pairs and equal ``scan_matches`` over the rows in
+    registration order.
+
+    The index does not remember what it filed a row under, so ``remove`` is
+    given the profile the row was added with.
+    """
+
+    def __init__(self, table: CitizenTable):
+        self.table = table
+        self._size = 0
+        self._buckets: dict[tuple[int, int, int], _Bucket] = {}
+        self._directions: dict[int, int] = {}
+
+    @classmethod
+    def from_citizens(cls, citizens: Iterable[dict]) -> "MatchIndex":
+        index = cls(CitizenTable())
+        for citizen in citizens:
+            row = index.table.put(citizen)
+            index.add(row, index.table.profile(row))
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, row: int, profile: MatchProfile):
+        key = (profile.direction, profile.wish_direction, profile.wish_floor)
+        self._buckets.setdefault(key, _Bucket()).add(profile.floor, row)
+        self._directions[profile.direction] = (
+            self._directions.get(profile.direction, 0) + 1
+        )
+        self._size += 1
+
+    def remove(self, row: int, profile: MatchProfile):
+        key = (profile.direction, profile.wish_direction, profile.wish_floor)
+        bucket = self._buckets[key]
+        bucket.remove(profile.floor, row)
+        if not bucket.rows:
+            del self._buckets[key]
+        self._directions[profile.direction] -= 1
+        if not self._directions[profile.direction]:
+            del self._directions[profile.direction]
+        self._size -= 1
+
+    def candidates(
+        self,
+        user: MatchProfile,
+        exclude: Optional[int] = None,
+        trace: Optional[MatchTrace] = None,
+        area: Optional[Container[int]] = None,
+    ) -> list[int]:
+        """Rows of every citizen compatible with ``user`` in both directions.
+
+        With ``area``, only citizens whose building code is in it are kept.
+        """
+        wanted = floor_range(user.wish_floor, user.floor)
+        if wanted is None or user.wish_direction == UNKNOWN:
+            if trace:
+                trace.filtered["floor"] += len(self)
+            return []
+        if user.wish_direction == ANY_DIRECTION:
+            directions = list(self._directions)
+        else:
+            directions = [user.wish_direction]
+        wish_directions = [ANY_DIRECTION]
+        if user.direction != UNKNOWN:
+            wish_directions.append(user.direction)
+        found = []
+        for direction in directions:
+            for wish_direction in wish_directions:
+                for wish_floor in (WISH_HIGHER, WISH_LOWER, WISH_ANY):
+                    bucket = self._buckets.get((direction, wish_direction, wish_floor))
+                    if bucket is None:
+                        continue
+                    # The partner's wish is evaluated from their side: "higher"
+                    # means the user must live below them, and vice versa.
+                    accepted = floor_range(
+                        {WISH_HIGHER: WISH_LOWER, WISH_LOWER: WISH_HIGHER}.get(
+                            wish_floor, WISH_ANY
+                        ),
+                        user.floor,
+                    )
+                    floors = _intersect(wanted, accepted)
+                    hits = () if floors is None else bucket.between(*floors)
+                    if trace:
+                        trace.scanned += len(bucket.rows)
+                        trace.filtered["floor"] += len(bucket.rows) - len(hits)
+                    if area is not None:
+                        buildings = self.table.building
+                        kept = [row for row in hits if buildings[row] in area]
+                        if trace:
+                            trace.filtered["area"] += len(hits) - len(kept)
+                        hits = kept
+                    found.extend(hits)
+        if trace:
+            trace.pruned = len(self) - trace.scanned
+        if exclude is not None and exclude in found:
+            found.remove(exclude)
+            if trace:
+                trace.filtered["self"] += 1
+        return found
+
+    def query(
+        self,
+        user: MatchProfile,
+        exclude: Optional[int] = None,
+        trace: Optional[MatchTrace] = None,
+        limit: Optional[int] = None,
+        building: Optional[int] = None,
+        area: Optional[Container[int]] = None,
+    ) -> list[tuple[int, int]]:
+        """(row, score) matches for ``user``, best first; only the top ``limit``.
+
+        ``building`` is the user's building code, for the same-building factor;
+        ``area`` limits candidates to those building codes before scoring.
+        """
+        rows = self.candidates(user, exclude, trace, area)
+        rows.sort()
+        profile_of = self.table.profile
+        score = scorer.score
+        if scorer.uses_building and building is not None:
+            buildings = self.table.building
+            matches = [
+                (row, score(user, profile_of(row), buildings[row] == building))
+                for row in rows
+            ]
+        else:
+            matches = [(row, score(user, profile_of(row))) for row in rows]
+        if limit is not None and limit < len(matches):
+            matches = heapq.nlargest(limit, matches, key=lambda x: x[1])
+        else:
+            matches.sort(key=lambda x: x[1], reverse=True)
+        if trace:
+            trace.hits = len(matches)
+            if trace.debug:
+                for row, score in matches:
+                    trace.record(
+                        self.table.national_id_of(row), self.table.floor[row], score
+                    )
+        return matches
\ No newline at end of file
@@ -0,0 +1,158 @@
+import bisect
+from typing import Iterable, Optional, TypedDict
+from app.matching.rules import (
+    ANY_DIRECTION,
+    UNKNOWN,
+    MatchProfile,
+    floor_range,
+)
+from app.matching.scoring import scorer
+
+
+class ExchangeCycle(TypedDict):
+    members: list[str]
+    score: int
+
+
+class ExchangePlan(TypedDict):
+    cycles: list[ExchangeCycle]
+    unmatched: list[str]
+    total_score: int
+
+
+def _successors(classes: list[MatchProfile]) -> list[list[int]]:
+    """For every class, the classes whose flats it would accept, best score first."""
+    by_direction: dict[str, tuple[list[int], list[int]]] = {}
+    for i in sorted(range(len(classes)), key=lambda i: classes[i].floor):
+        floors, members = by_direction.setdefault(classes[i].direction, ([], []))
+        floors.append(classes[i].floor)
+        members.append(i)
+    successors = []
+    for a in classes:
+        bounds = floor_range(a.wish_floor, a.floor)
+        if bounds is None:
+            successors.append([])
+            continue
+        low, high = bounds
+        if a.wish_direction == ANY_DIRECTION:
+            directions = list(by_direction)
+        elif a.wish_direction == UNKNOWN:
+            directions = []
+        else:
+            directions = [a.wish_direction]
+        found = []
+        for direction in directions:
+            if direction not in by_direction:
+                continue
+            floors, members = by_direction[direction]
+            i = 0 if low is None else bisect.bisect_right(floors, low)
+            j = len(floors) if high is None else bisect.bisect_left(floors, high)
+            found.extend(members[i:j])
+        found.sort(key=lambda b: scorer.score(a, classes[b]), reverse=True)
+        successors.append(found)
+    return successors
+
+
+def _swap_score(a: MatchProfile, b: MatchProfile) -> int:
+    """What a two-way swap adds to the plan: both members' scores."""
+    return scorer.score(a, b) + scorer.score(b, a)
+
+
+def _find_cycle(
+    start: int,
+    successors: list[list[int]],
+    accepted: list[set[int]],
+    capacity: list[int],
+    max_length: int,
+) -> Optional[list[int]]:
+    """Shortest simple cycle through ``start`` using classes with spare capacity."""
+    parent = {start: start}
+    frontier = [start]
+    for depth in range(1, max_length):
+        next_frontier = []
+        for node in frontier:
+            successors[node] = [n for n in successors[node] if capacity[n]]
+            for nxt in successors[node]:
+                if nxt in parent:
+                    continue
+                parent[nxt] = node
+                if start in accepted[nxt]:
+                    cycle = [nxt]
+                    while cycle[-1] != start:
+                        cycle.append(parent[cycle[-1]])
+                    cycle.reverse()
+                    return cycle
+                next_frontier.append(nxt)
+        frontier = next_frontier
+        if not frontier:
+            break
+    return None
+
+
+def solve_exchanges(
+    citizens: Iterable[tuple[str, MatchProfile]], max_cycle_length: int = 4
+) -> ExchangePlan:
+    """Pack disjoint exchange cycles over (national_id, profile) pairs.
+
+    Citizens sharing floor, direction and both wishes are interchangeable, so
+    the "would accept that flat" graph is built between those classes rather
+    than between individuals, which keeps it small for any population size.
+    Two-way swaps are taken first, greedily by the swap's score in both
+    directions. That is greedy weighted matching, not an exact maximum: the
+    swaps taken score at least half of the best possible set of two-way
+    swaps (tests/test_exchange.py checks this against brute force). The
+    leftover capacity is then packed into the shortest cycles of
+    3..max_cycle_length, which adds to the plan but carries no bound.
+    In every cycle, member i moves into the flat of member i + 1. Classes
+    do not carry buildings, so the same-building factor plays no part here.
+    """
+    groups: dict[MatchProfile, list[str]] = {}
+    for national_id, profile in citizens:
+        groups.setdefault(profile, []).append(national_id)
+    members = list(groups.values())
+    classes = list(groups)
+    capacity = [len(group) for group in members]
+    successors = _successors(classes)
+    accepted = [set(s) for s in successors]
+    packed: list[tuple[list[int], int]] = []
+    pairs = [
+        (_swap_score(classes[a], classes[b]), a, b)
+        for a, succ in enumerate(successors)
+        for b in succ
+        if b >= a and a in accepted[b]
+    ]
+    pairs.sort(key=lambda p: p[0], reverse=True)
+    for _, a, b in pairs:
+        times = capacity[a] // 2 if a == b else min(capacity[a], capacity[b])
+        if times:
+            packed.append(([a, b], times))
+            capacity[a] -= times
+            capacity[b] -= times
+    for length in range(3, max_cycle_length + 1):
+        for start in range(len(classes)):
+            while capacity[start]:
+                cycle = _find_cycle(start, successors, accepted, capacity, length)
+                if cycle is None:
+                    break
+                times = min(capacity[c] for c in cycle)
+                packed.append((cycle, times))
+                for c in cycle:
+                    capacity[c] -= times
+    cycles: list[ExchangeCycle] = []
+    for cycle, times in packed:
+        score = sum(
+            scorer.score(classes[c], classes[cycle[(i + 1) % len(cycle)]])
+            for i, c in enumerate(cycle)
+        )
+        for _ in range(times):
+            cycles.append(
+                {
+                    "members": [members[c].pop() for c in cycle],
+                    "score": score,
+                }
+            )
+    return {
+        "cycles": cycles,
+        "unmatched": [national_id for group in members for national_id in group],
+        "total_score": sum(c["score"] for c in cycles),
+    }
\ No newline at end of file
@@ -0,0 +1,214 @@
+from array import array
+from typing import Iterator, Optional
+from app.matching.rules import (
+    MatchProfile,
+    direction_code,
+    direction_name,
+    wish_direction_code,
+    wish_direction_name,
+    wish_floor_code,
+    wish_floor_name,
+)
+
+_HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+# Floors are stored as int16.
+_FLOOR_MIN, _FLOOR_MAX = -(1 << 15), (1 << 15) - 1
+
+
+def national_id_key(national_id: str) -> Optional[int]:
+    """The 14-digit national ID as an int, None if it is not one."""
+    if len(national_id) == 14 and national_id.isascii() and national_id.isdigit():
+        return int(national_id)
+    return None
+
+
+class _Interner:
+    """Small-int codes for a column with few distinct values, such as buildings."""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self):
+        self.values: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _Strings:
+    """Per-row text packed into one UTF-8 buffer.
+
+    Rewriting a row appends the new text and repoints the row; the old bytes
+    are left behind, which is cheap because names and phones rarely change.
+    """
+
+    __slots__ = ("_buffer", "_offsets", "_lengths")
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offsets = array("q")
+        self._lengths = array("I")
+
+    def __getitem__(self, row: int) -> str:
+        offset = self._offsets[row]
+        return self._buffer[offset : offset + self._lengths[row]].decode()
+
+    def append(self, text: str):
+        data = text.encode()
+        self._offsets.append(len(self._buffer))
+        self._lengths.append(len(data))
+        self._buffer += data
+
+    def set(self, row: int, text: str):
+        if self[row] == text:
+            return
+        data = text.encode()
+        self._offsets[row] = len(self._buffer)
+        self._lengths[row] = len(data)
+        self._buffer += data
+
+
+class CitizenTable:
+    """Citizens stored column by column in typed arrays, one row per national ID.
+
+    National IDs are int64, floors int16, directions and wishes interned
+    one-byte codes (see app.matching.rules) and buildings int32 codes; names
+    and phones share packed UTF-8 buffers. Rows are appended in registration
+    order and never move, so a row number is a stable reference to a citizen.
+    National IDs are found through an open-addressing hash table of row
+    numbers rather than a dict of boxed keys.
+    """
+
+    def __init__(self):
+        self.national_id = array("q")
+        self.floor = array("h")
+        self.direction = array("b")
+        self.wish_floor = array("b")
+        self.wish_direction = array("b")
+        self.building = array("i")
+        self._buildings = _Interner()
+        self._names = _Strings()
+        self._phones = _Strings()
+        self._slots = array("i", bytes(4 * 8))
+        self._bits = 3
+
+    def __len__(self) -> int:
+        return len(self.national_id)
+
+    def _slot(self, key: int) -> int:
+        """Slot holding ``key``, or the empty slot where it would go."""
+        mask = len(self._slots) - 1
+        i = ((key * _HASH_MULTIPLIER) & _MASK64) >> (64 - self._bits)
+        while True:
+            row = self._slots[i] - 1
+            if row < 0 or self.national_id[row] == key:
+                return i
+            i = (i + 1) & mask
+
+    def _grow(self):
+        self._bits += 1
+        self._slots = array("i", bytes(4 << self._bits))
+        for row, key in enumerate(self.national_id):
+            self._slots[self._slot(key)] = row + 1
+
+    def row(self, national_id: str) -> Optional[int]:
+        key = national_id_key(national_id)
+        if key is None:
+            return None
+        row = self._slots[self._slot(key)] - 1
+        return None if row < 0 else row
+
+    def put(self, citizen: dict) -> int:
+        """Insert or overwrite the citizen's row and return its number.
+
+        A citizen the columns cannot hold raises ValueError before anything
+        is written, so the table is never left half-updated.
+        """
+        key = national_id_key(citizen["national_id"])
+        if key is None:
+            raise ValueError(f"Invalid national ID: {citizen['national_id']!r}")
+        floor = citizen["floor"]
+        if not isinstance(floor, int) or not _FLOOR_MIN <= floor <= _FLOOR_MAX:
+            raise ValueError(f"Invalid floor: {floor!r}")
+        slot = self._slot(key)
+        row = self._slots[slot] - 1
+        values = (
+            floor,
+            direction_code(citizen["direction"]),
+            wish_floor_code(citizen["wish_floor"]),
+            wish_direction_code(citizen["wish_direction"]),
+            self.building_code(citizen["building"]),
+        )
+        if row >= 0:
+            (
+                self.floor[row],
+                self.direction[row],
+                self.wish_floor[row],
+                self.wish_direction[row],
+                self.building[row],
+            ) = values
+            self._names.set(row, citizen["name"])
+            self._phones.set(row, citizen["phone"] or "")
+            return row
+        row = len(self)
+        self.national_id.append(key)
+        for column, value in zip(
+            (
+                self.floor,
+                self.direction,
+                self.wish_floor,
+                self.wish_direction,
+                self.building,
+            ),
+            values,
+        ):
+            column.append(value)
+        self._names.append(citizen["name"])
+        self._phones.append(citizen["phone"] or "")
+        self._slots[slot] = row + 1
+        if 2 * len(self) > len(self._slots):
+            self._grow()
+        return row
+
+    def building_code(self, building: str) -> int:
+        """The interned code of ``building``, allocated on first sight."""
+        return self._buildings.code(building)
+
+    def building_name(self, code: int) -> str:
+        return self._buildings.values[code]
+
+    def national_id_of(self, row: int) -> str:
+        return f"{self.national_id[row]:014d}"
+
+    def name(self, row: int) -> str:
+        return self._names[row]
+
+    def profile(self, row: int) -> MatchProfile:
+        return MatchProfile(
+            self.floor[row],
+            self.direction[row],
+            self.wish_floor[row],
+            self.wish_direction[row],
+        )
+
+    def record(self, row: int) -> dict:
+        """The row as the citizen dict the rest of the app works with."""
+        return {
+            "national_id": self.national_id_of(row),
+            "name": self._names[row],
+            "building": self.building_name(self.building[row]),
+            "floor": self.floor[row],
+            "direction": direction_name(self.direction[row]),
+            "phone": self._phones[row],
+            "wish_floor": wish_floor_name(self.wish_floor[row]),
+            "wish_direction": wish_direction_name(self.wish_direction[row]),
+        }
+
+    def profiles(self) -> Iterator[tuple[str, MatchProfile]]:
+        for row in range(len(self)):
+            yield self.national_id_of(row), self.profile(row)
\ No newline at end of file
@@ -0,0 +1,97 @@
+"""Exchange compatibility rules as pure functions over MatchProfile records.
+
+This module imports nothing from Reflex, the database or the rest of the
+app, so CLI tools, worker processes and benchmarks can load it on its own.
+Directions and wishes are interned as small ints: a direction is its
+position in DIRECTIONS (ANY_DIRECTION stands for "أى" in wish_direction)
+and a floor wish is its position in WISH_FLOORS. Values outside those
+lists become UNKNOWN, which never matches.
+"""
+from typing import Mapping, NamedTuple, Optional
+
+DIRECTIONS = ("بحرى", "قبلى", "شرقى", "غربى")
+ANY = "أى"
+HIGHER = "أعلى"
+LOWER = "أسفل"
+WISH_FLOORS = (HIGHER, LOWER, ANY)
+
+UNKNOWN = -1
+ANY_DIRECTION = len(DIRECTIONS)
+WISH_HIGHER, WISH_LOWER, WISH_ANY = range(len(WISH_FLOORS))
+
+_DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+_WISH_DIRECTION_CODES = {**_DIRECTION_CODES, ANY: ANY_DIRECTION}
+_WISH_FLOOR_CODES = {wish: code for code, wish in enumerate(WISH_FLOORS)}
+_WISH_DIRECTIONS = (*DIRECTIONS, ANY)
+
+
+def direction_code(direction: str) -> int:
+    return _DIRECTION_CODES.get(direction, UNKNOWN)
+
+
+def wish_direction_code(wish_direction: str) -> int:
+    return _WISH_DIRECTION_CODES.get(wish_direction, UNKNOWN)
+
+
+def wish_floor_code(wish_floor: str) -> int:
+    return _WISH_FLOOR_CODES.get(wish_floor, UNKNOWN)
+
+
+def direction_name(code: int) -> str:
+    return DIRECTIONS[code] if 0 <= code < len(DIRECTIONS) else ""
+
+
+def wish_direction_name(code: int) -> str:
+    return _WISH_DIRECTIONS[code] if 0 <= code < len(_WISH_DIRECTIONS) else ""
+
+
+def wish_floor_name(code: int) -> str:
+    return WISH_FLOORS[code] if 0 <= code < len(WISH_FLOORS) else ""
+
+
+class MatchProfile(NamedTuple):
+    """The four fields of a citizen that matching reads, as interned codes."""
+
+    floor: int
+    direction: int
+    wish_floor: int
+    wish_direction: int
+
+
+def profile(citizen: Mapping) -> MatchProfile:
+    return MatchProfile(
+        citizen["floor"],
+        direction_code(citizen["direction"]),
+        wish_floor_code(citizen["wish_floor"]),
+        wish_direction_code(citizen["wish_direction"]),
+    )
+
+
+def accepts(user: MatchProfile, other: MatchProfile) -> bool:
+    """Whether ``user`` would move into ``other``'s flat."""
+    floor_ok = (
+        (user.wish_floor == WISH_HIGHER and other.floor > user.floor)
+        or (user.wish_floor == WISH_LOWER and other.floor < user.floor)
+        or user.wish_floor == WISH_ANY
+    )
+    direction_ok = user.wish_direction == ANY_DIRECTION or (
+        user.wish_direction != UNKNOWN and other.direction == user.wish_direction
+    )
+    return floor_ok and direction_ok
+
+
+def is_match(user: MatchProfile, other: MatchProfile) -> bool:
+    return accepts(user, other) and accepts(other, user)
+
+
+def floor_range(
+    wish_floor: int, floor: int
+) -> Optional[tuple[Optional[int], Optional[int]]]:
+    """Exclusive (low, high) floor bounds a partner must fall in, None if unknown."""
+    if wish_floor == WISH_HIGHER:
+        return floor, None
+    if wish_floor == WISH_LOWER:
+        return None, floor
+    if wish_floor == WISH_ANY:
+        return None, None
+    return None
\ No newline at end of file
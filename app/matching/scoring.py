@@ -0,0 +1,140 @@
+"""Weighted match scores, compiled from a ScoringProfile.
+
+A score is ``base`` plus the points of every factor, capped at ``cap``. The
+default profile is the original formula: 50, +30 when the direction wish
+is met on either side, and 20 - 10 per floor of difference. Factors are
+expressions over the user's and the candidate's MatchProfile (``u`` and
+``o``) and whether both live in the same building; a Scorer joins the
+factors with a non-zero weight into one generated function, in a scalar
+and a numpy flavour, so factors that are switched off cost nothing.
+
+The active profile comes from the MATCH_SCORING environment variable, a
+JSON object of ScoringProfile fields, e.g. ``{"same_building": 10}``. Like
+the rules, this module imports nothing from Reflex or the database.
+"""
+import json
+import os
+from typing import NamedTuple
+import numpy as np
+from app.matching.rules import ANY_DIRECTION, UNKNOWN, WISH_LOWER, MatchProfile
+
+
+class ScoringProfile(NamedTuple):
+    base: int = 50
+    # The user's direction wish is met, or either side accepts any direction.
+    direction: int = 30
+    # Full points on the same floor, ``floor_step`` fewer per floor apart.
+    floor_proximity: int = 20
+    floor_step: int = 10
+    # Both flats are in the same building.
+    same_building: int = 0
+    # The user asked for a lower floor and the flat is on the ground floor.
+    ground_floor: int = 0
+    cap: int = 100
+
+
+DEFAULT_PROFILE = ScoringProfile()
+FACTORS = ("direction", "floor_proximity", "same_building", "ground_floor")
+
+# Scalar and numpy expression of each factor's points for weight ``{w}``.
+_EXPRESSIONS = {
+    "direction": (
+        "{w} if (u.wish_direction == o.direction and u.wish_direction != UNKNOWN)"
+        " or u.wish_direction == ANY_DIRECTION"
+        " or o.wish_direction == ANY_DIRECTION else 0",
+        "{w} * (((u.wish_direction == o.direction) & (u.wish_direction != UNKNOWN))"
+        " | (u.wish_direction == ANY_DIRECTION)"
+        " | (o.wish_direction == ANY_DIRECTION))",
+    ),
+    "floor_proximity": (
+        "max(0, {w} - {step} * abs(o.floor - u.floor))",
+        "np.maximum(0, {w} - {step} * np.abs(o.floor - u.floor))",
+    ),
+    "same_building": (
+        "{w} if same_building else 0",
+        "{w} * same_building",
+    ),
+    "ground_floor": (
+        "{w} if u.wish_floor == WISH_LOWER and o.floor == 0 else 0",
+        "{w} * ((u.wish_floor == WISH_LOWER) & (o.floor == 0))",
+    ),
+}
+
+
+class Scorer:
+    """A ScoringProfile compiled into ``score``, ``score_arrays`` and ``breakdown``.
+
+    ``score(u, o, same_building)`` scores two MatchProfiles. ``score_arrays``
+    takes MatchProfiles whose fields are numpy arrays and broadcasts like
+    numpy; its result is int8. ``breakdown`` returns the points of the base
+    and of every active factor, before the cap.
+    """
+
+    def __init__(self, profile: ScoringProfile = DEFAULT_PROFILE):
+        if not 1 <= profile.base <= profile.cap <= 100:
+            raise ValueError("Scores need 1 <= base <= cap <= 100.")
+        if min(profile) < 0:
+            raise ValueError("Scoring weights cannot be negative.")
+        self.profile = profile
+        self.factors = tuple(f for f in FACTORS if getattr(profile, f))
+        base = str(profile.base)
+        scalar, arrays = [], []
+        for factor in self.factors:
+            fields = {"w": getattr(profile, factor), "step": profile.floor_step}
+            scalar.append(_EXPRESSIONS[factor][0].format(**fields))
+            arrays.append(_EXPRESSIONS[factor][1].format(**fields))
+        scalar_sum = " + ".join([base, *(f"({term})" for term in scalar)])
+        arrays_sum = " + ".join([base, *(f"({term})" for term in arrays)])
+        source = (
+            "def score(u, o, same_building=False):\n"
+            f"    return min({profile.cap}, {scalar_sum})\n"
+            "def score_arrays(u, o, same_building=False):\n"
+            f"    return np.minimum({profile.cap}, {arrays_sum}).astype(np.int8)\n"
+            "def breakdown(u, o, same_building=False):\n"
+            f"    return ({', '.join([base, *scalar])},)\n"
+        )
+        namespace = {
+            "ANY_DIRECTION": ANY_DIRECTION,
+            "UNKNOWN": UNKNOWN,
+            "WISH_LOWER": WISH_LOWER,
+            "np": np,
+        }
+        exec(compile(source, f"<scoring {tuple(profile)}>", "exec"), namespace)
+        self.score = namespace["score"]
+        self.score_arrays = namespace["score_arrays"]
+        self._breakdown = namespace["breakdown"]
+
+    @property
+    def uses_building(self) -> bool:
+        return "same_building" in self.factors
+
+    def breakdown(
+        self, user: MatchProfile, other: MatchProfile, same_building: bool = False
+    ) -> dict[str, int]:
+        """Points per part of the score: "base" and each active factor."""
+        return dict(
+            zip(("base", *self.factors), self._breakdown(user, other, same_building))
+        )
+
+
+def profile_from_env(value: str) -> ScoringProfile:
+    """The default profile with the overrides of a MATCH_SCORING value.
+
+    Every override must be a whole number that fits the int8 scores.
+    """
+    overrides = json.loads(value) if value else {}
+    if not isinstance(overrides, dict):
+        raise ValueError("MATCH_SCORING must be a JSON object.")
+    unknown = set(overrides) - set(ScoringProfile._fields)
+    if unknown:
+        raise ValueError(f"Unknown MATCH_SCORING fields: {', '.join(sorted(unknown))}")
+    limit = np.iinfo(np.int8).max
+    for field, weight in overrides.items():
+        if type(weight) is not int or not 0 <= weight <= limit:
+            raise ValueError(
+                f"MATCH_SCORING {field} must be an integer from 0 to {limit}."
+            )
+    return DEFAULT_PROFILE._replace(**overrides)
+
+
+scorer = Scorer(profile_from_env(os.environ.get("MATCH_SCORING", "")))
\ No newline at end of file
@@ -0,0 +1,115 @@
+import math
+from typing import Optional
+
+EARTH_RADIUS_KM = 6371.0
+# Grid cells are this many degrees on a side, about 1.1 km north-south.
+CELL_DEGREES = 0.01
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class BuildingMap:
+    """District and location of buildings, keyed by CitizenTable building code.
+
+    Located buildings are bucketed in a uniform latitude/longitude grid, so
+    a radius lookup only measures the buildings in the cells the circle
+    covers. Buildings may have a district without coordinates; they are
+    found by district but never by radius.
+    """
+
+    def __init__(self, cell_degrees: float = CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._buildings: dict[int, tuple[str, Optional[float], Optional[float]]] = {}
+        self._districts: dict[str, set[int]] = {}
+        self._cells: dict[tuple[int, int], set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._buildings)
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return (
+            math.floor(latitude / self.cell_degrees),
+            math.floor(longitude / self.cell_degrees),
+        )
+
+    def put(
+        self,
+        code: int,
+        district: str,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ):
+        self.discard(code)
+        self._buildings[code] = (district, latitude, longitude)
+        self._districts.setdefault(district, set()).add(code)
+        if latitude is not None and longitude is not None:
+            self._cells.setdefault(self._cell(latitude, longitude), set()).add(code)
+
+    def discard(self, code: int):
+        entry = self._buildings.pop(code, None)
+        if entry is None:
+            return
+        district, latitude, longitude = entry
+        self._districts[district].discard(code)
+        if not self._districts[district]:
+            del self._districts[district]
+        if latitude is not None and longitude is not None:
+            cell = self._cell(latitude, longitude)
+            self._cells[cell].discard(code)
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def get(self, code: int) -> Optional[tuple[str, Optional[float], Optional[float]]]:
+        """(district, latitude, longitude) of building ``code``, if registered."""
+        return self._buildings.get(code)
+
+    def items(self):
+        return self._buildings.items()
+
+    def districts(self) -> list[str]:
+        return sorted(self._districts)
+
+    def in_district(self, district: str) -> set[int]:
+        return set(self._districts.get(district, ()))
+
+    def within(self, code: int, radius_km: float) -> set[int]:
+        """Codes of buildings within ``radius_km`` of building ``code``.
+
+        Empty when ``code`` has no coordinates, since no distance to it is
+        known. A negative or non-finite radius raises ValueError.
+        """
+        if not math.isfinite(radius_km) or radius_km < 0:
+            raise ValueError(f"Invalid radius: {radius_km!r} km")
+        _, latitude, longitude = self._buildings.get(code, ("", None, None))
+        if latitude is None or longitude is None:
+            return set()
+        # Past half the globe every span covers everything; clamping keeps
+        # the cell ranges small for very large radii.
+        lat_span = min(math.degrees(radius_km / EARTH_RADIUS_KM), 180.0)
+        cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+        lon_span = min(lat_span / cos_lat, 180.0)
+        low = self._cell(latitude - lat_span, longitude - lon_span)
+        high = self._cell(latitude + lat_span, longitude + lon_span)
+        rows, columns = range(low[0], high[0] + 1), range(low[1], high[1] + 1)
+        if len(rows) * len(columns) <= len(self._cells):
+            cells = [(i, j) for i in rows for j in columns if (i, j) in self._cells]
+        else:
+            # A wide radius covers more cells than are occupied; walk those.
+            cells = [(i, j) for i, j in self._cells if i in rows and j in columns]
+        found = set()
+        for cell in cells:
+            for other in self._cells[cell]:
+                _, other_lat, other_lon = self._buildings[other]
+                if distance_km(latitude, longitude, other_lat, other_lon) <= radius_km:
+                    found.add(other)
+        return found
\ No newline at end of file
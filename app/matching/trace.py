@@ -0,0 +1,79 @@
+import logging
+import os
+import random
+import time
+from collections import Counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = float(os.environ.get("MATCH_TRACE_SAMPLE_RATE", "0"))
+
+
+class MatchTrace:
+    """Counters for one search, written out as a single summary log record.
+
+    Per-candidate details are only kept when ``debug`` is set; they are stored
+    as plain tuples and formatted when the summary is emitted.
+    """
+
+    def __init__(self, label: str, debug: bool = False):
+        self.label = label
+        self.debug = debug
+        self.scanned = 0
+        self.pruned = 0
+        self.filtered: Counter[str] = Counter()
+        self.hits = 0
+        self.cache = ""
+        self.candidates: list[tuple] = []
+        self._started = time.perf_counter()
+
+    @classmethod
+    def sampled(
+        cls, label: str, force: bool = False, debug: bool = False
+    ) -> Optional["MatchTrace"]:
+        """A trace when forced, in debug mode or picked by MATCH_TRACE_SAMPLE_RATE."""
+        if force or debug or (SAMPLE_RATE and random.random() < SAMPLE_RATE):
+            return cls(label, debug=debug)
+        return None
+
+    def record(self, *candidate):
+        if self.debug:
+            self.candidates.append(candidate)
+
+    def merge(self, summary: dict, candidates: list = ()):
+        """Take over the counters of a trace recorded in another process."""
+        self.scanned = summary["scanned"]
+        self.pruned = summary["pruned"]
+        self.filtered = Counter(summary["filtered"])
+        self.hits = summary["hits"]
+        self.cache = summary["cache"]
+        self.candidates.extend(tuple(c) for c in candidates)
+
+    def summary(self) -> dict:
+        return {
+            "label": self.label,
+            "scanned": self.scanned,
+            "pruned": self.pruned,
+            "filtered": dict(self.filtered),
+            "hits": self.hits,
+            "cache": self.cache,
+            "elapsed_ms": round((time.perf_counter() - self._started) * 1000, 3),
+        }
+
+    def emit(self):
+        summary = self.summary()
+        logger.info(
+            "match trace %s: scanned=%d pruned=%d filtered=%s hits=%d cache=%s elapsed=%.3fms",
+            summary["label"],
+            summary["scanned"],
+            summary["pruned"],
+            summary["filtered"],
+            summary["hits"],
+            summary["cache"] or "-",
+            summary["elapsed_ms"],
+            extra={"match_trace": summary},
+        )
+        if self.debug and logger.isEnabledFor(logging.DEBUG):
+            for candidate in self.candidates:
+                logger.debug("match trace %s candidate %s", self.label, candidate)
\ No newline at end of file
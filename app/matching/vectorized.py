@@ -0,0 +1,125 @@
+from typing import Iterable
+import numpy as np
+from app.matching.records import CitizenTable
+from app.matching.rules import (
+    ANY_DIRECTION,
+    UNKNOWN,
+    WISH_ANY,
+    WISH_HIGHER,
+    WISH_LOWER,
+    MatchProfile,
+    profile,
+)
+from app.matching.scoring import scorer
+
+
+class CitizenColumns:
+    """Column-oriented copy of the citizen table for array-at-a-time scoring.
+
+    Floors are an int array; directions and wishes keep the interned codes
+    of app.matching.rules, so ``UNKNOWN`` never matches, as in the scalar
+    rule, and buildings are interned codes too. Positions are the rows the
+    columns were built from.
+    """
+
+    def __init__(self, floor, direction, wish_floor, wish_direction, building):
+        self.floor = np.asarray(floor, dtype=np.int32)
+        self.direction = np.asarray(direction, dtype=np.int8)
+        self.wish_floor = np.asarray(wish_floor, dtype=np.int8)
+        self.wish_direction = np.asarray(wish_direction, dtype=np.int8)
+        self.building = np.asarray(building, dtype=np.int32)
+
+    @classmethod
+    def from_table(cls, table: CitizenTable) -> "CitizenColumns":
+        """A snapshot of every row; later changes to the table are not seen."""
+        return cls(
+            np.array(table.floor),
+            np.array(table.direction),
+            np.array(table.wish_floor),
+            np.array(table.wish_direction),
+            np.array(table.building),
+        )
+
+    @classmethod
+    def from_citizens(cls, citizens: Iterable[dict]) -> "CitizenColumns":
+        codes: dict[str, int] = {}
+        rows = [
+            (*profile(c), codes.setdefault(c["building"], len(codes)))
+            for c in citizens
+        ]
+        return cls(*(zip(*rows) if rows else ((), (), (), (), ())))
+
+    def __len__(self) -> int:
+        return len(self.floor)
+
+    def _profile(self, index) -> MatchProfile:
+        """The rows at ``index`` as a MatchProfile of arrays."""
+        return MatchProfile(
+            self.floor[index],
+            self.direction[index],
+            self.wish_floor[index],
+            self.wish_direction[index],
+        )
+
+    def _same_building(self, index):
+        return scorer.uses_building and self.building[index] == self.building
+
+    def scores_for(self, i: int) -> np.ndarray:
+        """Score of every citizen for citizen ``i``; 0 where they don't match."""
+        return _scores(
+            self._profile(i),
+            self._profile(slice(None)),
+            self._same_building(i),
+            exclude=i,
+        )
+
+    def score_rows(self, rows: slice | np.ndarray) -> np.ndarray:
+        """Scores for a block of citizens against everyone, one row per citizen."""
+        index = np.arange(len(self))[rows]
+        column = (index, None)
+        scores = _scores(
+            self._profile(column),
+            self._profile(slice(None)),
+            self._same_building(column),
+        )
+        scores[np.arange(len(index)), index] = 0
+        return scores
+
+    def score_matrix(self) -> np.ndarray:
+        """All N×N scores at once; use ``score_rows`` in blocks for large N."""
+        return self.score_rows(slice(None))
+
+    def matches_for(self, i: int) -> list[tuple[int, int]]:
+        """(position, score) pairs ordered like ``scan_matches``."""
+        scores = self.scores_for(i)
+        hits = np.flatnonzero(scores)
+        order = hits[np.argsort(-scores[hits], kind="stable")]
+        return [(int(j), int(scores[j])) for j in order]
+
+
+def _accepts(floor, wish_floor, wish_direction, other_floor, other_direction):
+    floor_ok = (
+        ((wish_floor == WISH_HIGHER) & (other_floor > floor))
+        | ((wish_floor == WISH_LOWER) & (other_floor < floor))
+        | (wish_floor == WISH_ANY)
+    )
+    direction_ok = (wish_direction == ANY_DIRECTION) | (
+        (wish_direction == other_direction) & (wish_direction != UNKNOWN)
+    )
+    return floor_ok & direction_ok
+
+
+def _scores(
+    user: MatchProfile, other: MatchProfile, same_building, exclude=None
+) -> np.ndarray:
+    ok = _accepts(
+        user.floor, user.wish_floor, user.wish_direction, other.floor, other.direction
+    )
+    ok &= _accepts(
+        other.floor, other.wish_floor, other.wish_direction, user.floor, user.direction
+    )
+    scores = np.where(ok, scorer.score_arrays(user, other, same_building), 0)
+    scores = scores.astype(np.int8)
+    if exclude is not None:
+        scores[exclude] = 0
+    return scores
\ No newline at end of file
@@ -0,0 +1,172 @@
+"""Event handler metrics, served in the Prometheus text format at /metrics.
+
+EventMetrics is Reflex middleware, so every event handler of every state
+is measured without decorating each one: latency from the event arriving
+to its final update, the JSON size of every state delta sent back, and
+the exceptions that reached the backend exception handler. Background
+handlers only report deltas and exceptions, since a watch loop's running
+time says nothing about responsiveness. Searches add how many candidates
+the matching engine scanned, and the registry's match cache reports its
+hits, misses and size.
+
+Metrics live in the worker process; with several workers, scrape each.
+The cache figures come from the registry, so behind a matching service
+every worker reports the service's one cache.
+"""
+import bisect
+import contextvars
+import time
+from typing import Optional
+from reflex.app import default_backend_exception_handler
+from reflex.event import Event, EventSpec
+from reflex.middleware import Middleware
+from reflex.utils.format import json_dumps
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DELTA_BUCKETS = (128, 512, 2048, 8192, 32768, 131072, 524288)
+SCANNED_BUCKETS = (0, 10, 100, 1000, 10000, 100000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one label."""
+
+    def __init__(self, name: str, description: str, label: str, buckets: tuple):
+        self.name = name
+        self.description = description
+        self.label = label
+        self.buckets = buckets
+        # Per label value: a count per bucket plus +Inf, then the sum.
+        self._series: dict[str, list] = {}
+
+    def observe(self, value_of: str, value: float):
+        series = self._series.get(value_of)
+        if series is None:
+            series = self._series[value_of] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        for value_of, series in sorted(self._series.items()):
+            label = f'{self.label}="{value_of}"'
+            total = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                total += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {total}')
+            lines.append(f"{self.name}_sum{{{label}}} {series[-1]}")
+            lines.append(f"{self.name}_count{{{label}}} {total}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with one label."""
+
+    def __init__(self, name: str, description: str, label: str):
+        self.name = name
+        self.description = description
+        self.label = label
+        self._counts: dict[str, int] = {}
+
+    def inc(self, value_of: str, amount: int = 1):
+        self._counts[value_of] = self._counts.get(value_of, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        for value_of, count in sorted(self._counts.items()):
+            lines.append(f'{self.name}{{{self.label}="{value_of}"}} {count}')
+        return lines
+
+
+EVENT_SECONDS = Histogram(
+    "event_handler_seconds",
+    "Time from an event arriving to its final state update.",
+    "handler",
+    LATENCY_BUCKETS,
+)
+EVENT_DELTA_BYTES = Histogram(
+    "event_delta_bytes",
+    "Size of each serialized state delta sent to the client.",
+    "handler",
+    DELTA_BUCKETS,
+)
+EVENT_EXCEPTIONS = Counter(
+    "event_exceptions_total",
+    "Exceptions raised by event handlers.",
+    "handler",
+)
+MATCH_SCANNED = Histogram(
+    "match_candidates_scanned",
+    "Candidates the matching engine scanned per search, by cache outcome.",
+    "cache",
+    SCANNED_BUCKETS,
+)
+METRICS = (EVENT_SECONDS, EVENT_DELTA_BYTES, EVENT_EXCEPTIONS, MATCH_SCANNED)
+
+# The event being handled in this task: (event, handler name, start or None).
+_current: contextvars.ContextVar[Optional[tuple[Event, str, Optional[float]]]] = (
+    contextvars.ContextVar("current_event", default=None)
+)
+
+
+def event_handler(state, event: Event) -> tuple[str, bool]:
+    """The handler's "State.method" name and whether it runs in the background."""
+    substate, handler = state._get_event_handler(event)
+    name = f"{type(substate).__name__}.{event.name.rpartition('.')[2]}"
+    return name, handler.is_background
+
+
+class EventMetrics(Middleware):
+    async def preprocess(self, app, state, event: Event):
+        name, background = event_handler(state, event)
+        started = None if background else time.perf_counter()
+        _current.set((event, name, started))
+        return None
+
+    async def postprocess(self, app, state, event: Event, update):
+        current = _current.get()
+        if current is None or current[0] is not event:
+            # Upload handlers skip preprocessing.
+            current = (event, event_handler(state, event)[0], None)
+            _current.set(current)
+        _, name, started = current
+        if update.delta:
+            size = len(json_dumps(update.delta).encode())
+            EVENT_DELTA_BYTES.observe(name, size)
+        if update.final and started is not None:
+            EVENT_SECONDS.observe(name, time.perf_counter() - started)
+        return update
+
+
+def count_exception(exception: Exception) -> EventSpec:
+    """Backend exception handler: count, then report as Reflex does."""
+    current = _current.get()
+    EVENT_EXCEPTIONS.inc(current[1] if current else "")
+    return default_backend_exception_handler(exception)
+
+
+def cache_lines(stats: dict) -> list[str]:
+    """The match cache's ``stats()`` in the text format."""
+    return [
+        "# HELP match_cache_hits_total Searches answered from the match cache.",
+        "# TYPE match_cache_hits_total counter",
+        f"match_cache_hits_total {stats['hits']}",
+        "# HELP match_cache_misses_total Searches the match cache could not answer.",
+        "# TYPE match_cache_misses_total counter",
+        f"match_cache_misses_total {stats['misses']}",
+        "# HELP match_cache_entries Rankings held in the match cache.",
+        "# TYPE match_cache_entries gauge",
+        f"match_cache_entries {stats['size']}",
+    ]
+
+
+def render(cache: Optional[dict] = None) -> str:
+    lines = [line for metric in METRICS for line in metric.render()]
+    if cache is not None:
+        lines.extend(cache_lines(cache))
+    return "\n".join(lines) + "\n"
\ No newline at end of file
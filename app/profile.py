@@ -1,24 +1,26 @@
 import reflex as rx
 from app.states.profile_state import ProfileState
+from app.validation import PROFILE_RULES, FieldRule, html_attributes
 
 
 def profile_input(
     label: str,
     name: str,
     value: rx.Var[str],
-    on_change_fn,
     error_var: rx.Var[str],
     input_type: str = "text",
     placeholder: str = "",
+    rule: FieldRule = FieldRule(),
 ) -> rx.Component:
     return rx.el.div(
         rx.el.label(label, class_name="block text-sm font-medium text-gray-700"),
         rx.el.input(
             name=name,
             default_value=value,
+            key=value,
             type=input_type,
-            on_change=on_change_fn,
             placeholder=placeholder,
+            **html_attributes(rule),
             class_name=rx.cond(
                 error_var,
                 "mt-1 block w-full px-3 py-2 bg-white border border-red-300 rounded-md shadow-sm focus:outline-none focus:ring-red-500 focus:border-red-500 sm:text-sm",
@@ -55,7 +57,7 @@ def profile_page() -> rx.Component:
                     "Manage your personal information and settings.",
                     class_name="text-gray-500 mb-8",
                 ),
-                rx.el.div(
+                rx.el.form(
                     rx.el.div(
                         rx.el.image(
                             src=rx.cond(
@@ -67,6 +69,7 @@ def profile_page() -> rx.Component:
                         ),
                         rx.el.button(
                             "Change Picture",
+                            type="button",
                             class_name="ml-4 px-4 py-2 text-sm font-medium text-gray-700 bg-white border border-gray-300 rounded-md shadow-sm hover:bg-gray-50",
                         ),
                         class_name="flex items-center mb-8",
@@ -78,15 +81,14 @@ def profile_page() -> rx.Component:
                                 "Full Name",
                                 "full_name",
                                 ProfileState.full_name,
-                                ProfileState.set_full_name,
                                 ProfileState.full_name_error,
                                 placeholder="Your full name",
+                                rule=PROFILE_RULES["full_name"],
                             ),
                             profile_input(
                                 "Date of Birth",
                                 "date_of_birth",
                                 ProfileState.date_of_birth,
-                                ProfileState.set_date_of_birth,
                                 None,
                                 input_type="date",
                             ),
@@ -97,7 +99,6 @@ def profile_page() -> rx.Component:
                                 "Email Address",
                                 "email",
                                 ProfileState.email,
-                                ProfileState.set_email,
                                 ProfileState.email_error,
                                 input_type="email",
                                 placeholder="you@example.com",
@@ -106,10 +107,10 @@ def profile_page() -> rx.Component:
                                 "Mobile Number",
                                 "mobile_number",
                                 ProfileState.mobile_number,
-                                ProfileState.set_mobile_number,
                                 ProfileState.mobile_number_error,
                                 input_type="tel",
                                 placeholder="+1234567890",
+                                rule=PROFILE_RULES["mobile_number"],
                             ),
                         ),
                         profile_section(
@@ -118,7 +119,6 @@ def profile_page() -> rx.Component:
                                 "Street Address",
                                 "address",
                                 ProfileState.address,
-                                ProfileState.set_address,
                                 None,
                                 placeholder="123 Main St",
                             ),
@@ -126,7 +126,6 @@ def profile_page() -> rx.Component:
                                 "City",
                                 "city",
                                 ProfileState.city,
-                                ProfileState.set_city,
                                 None,
                                 placeholder="Anytown",
                             ),
@@ -134,7 +133,6 @@ def profile_page() -> rx.Component:
                                 "State / Province",
                                 "state_province",
                                 ProfileState.state_province,
-                                ProfileState.set_state_province,
                                 None,
                                 placeholder="CA",
                             ),
@@ -142,7 +140,6 @@ def profile_page() -> rx.Component:
                                 "Postal Code",
                                 "postal_code",
                                 ProfileState.postal_code,
-                                ProfileState.set_postal_code,
                                 None,
                                 placeholder="12345",
                             ),
@@ -153,8 +150,9 @@ def profile_page() -> rx.Component:
                                 class_name="text-lg font-semibold text-gray-900 mb-4",
                             ),
                             rx.el.textarea(
+                                name="bio",
                                 default_value=ProfileState.bio,
-                                on_change=ProfileState.set_bio,
+                                key=ProfileState.bio,
                                 placeholder="Tell us a little about yourself...",
                                 class_name="mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-orange-500 focus:border-orange-500 sm:text-sm",
                                 rows=4,
@@ -173,12 +171,14 @@ def profile_page() -> rx.Component:
                                 ),
                                 "Save Changes",
                             ),
-                            on_click=ProfileState.save_profile,
+                            type="submit",
                             disabled=ProfileState.is_loading,
                             class_name="w-full md:w-auto px-6 py-3 text-white font-semibold bg-orange-500 rounded-lg shadow-md hover:bg-orange-600 focus:outline-none focus:ring-2 focus:ring-orange-400 focus:ring-opacity-75 transition-all duration-200 disabled:bg-orange-300",
                         ),
                         class_name="flex justify-end mt-8",
                     ),
+                    on_submit=ProfileState.save_profile,
+                    reset_on_submit=False,
                 ),
                 class_name="w-full max-w-4xl mx-auto",
             ),
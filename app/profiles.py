@@ -0,0 +1,124 @@
+import reflex as rx
+from app.profiling import MAX_RUNS, PROFILE_COLLECTOR, PROFILE_HANDLERS
+from app.states.profiling_state import ProfileFile, ProfilingState
+from app.components.navbar import navbar
+
+
+def profile_row(profile: ProfileFile) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            rx.el.button(
+                profile["name"],
+                on_click=ProfilingState.show_profile(profile["name"]),
+                class_name="text-sm text-orange-600 hover:underline",
+            ),
+            class_name="px-4 py-2",
+            dir="ltr",
+        ),
+        rx.el.td(profile["recorded"], class_name="px-4 py-2 text-sm text-gray-500"),
+        rx.el.td(
+            f"{profile['size_kb']} KB", class_name="px-4 py-2 text-sm text-gray-500"
+        ),
+        rx.el.td(
+            rx.el.button(
+                "تنزيل",
+                on_click=ProfilingState.download_profile(profile["name"]),
+                class_name="text-sm text-orange-600 hover:underline",
+            ),
+            class_name="px-4 py-2",
+        ),
+    )
+
+
+def arm_form() -> rx.Component:
+    return rx.el.form(
+        rx.el.div(
+            rx.el.input(
+                name="runs",
+                type="number",
+                min=1,
+                max=MAX_RUNS,
+                default_value="5",
+                class_name="w-24 px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-orange-500 focus:border-orange-500 sm:text-sm",
+            ),
+            rx.el.button(
+                "تحليل العمليات التالية",
+                type="submit",
+                class_name="px-6 py-2 text-white font-semibold bg-orange-500 rounded-lg shadow-md hover:bg-orange-600",
+            ),
+            rx.cond(
+                ProfilingState.armed_runs > 0,
+                rx.el.button(
+                    f"إيقاف ({ProfilingState.armed_runs} متبقية)",
+                    type="button",
+                    on_click=ProfilingState.disarm_profiling,
+                    class_name="px-4 py-2 text-sm font-medium text-gray-600 border border-gray-300 rounded-lg hover:bg-gray-50",
+                ),
+                None,
+            ),
+            class_name="flex items-center gap-4",
+        ),
+        on_submit=ProfilingState.arm_profiling,
+        reset_on_submit=False,
+    )
+
+
+def profile_report() -> rx.Component:
+    return rx.cond(
+        ProfilingState.selected != "",
+        rx.el.div(
+            rx.el.h3(
+                ProfilingState.selected,
+                class_name="text-lg font-bold text-gray-900 mb-2",
+                dir="ltr",
+            ),
+            rx.el.pre(
+                ProfilingState.report,
+                class_name="p-4 text-xs text-gray-800 bg-gray-50 rounded-lg overflow-x-auto",
+                dir="ltr",
+            ),
+            class_name="mt-8",
+        ),
+        None,
+    )
+
+
+def profiles_page() -> rx.Component:
+    return rx.el.div(
+        navbar(),
+        rx.el.main(
+            rx.el.div(
+                rx.el.h2(
+                    "تحليل الأداء",
+                    class_name="text-3xl font-bold text-gray-900 mb-2 text-right",
+                ),
+                rx.el.p(
+                    f"يسجل ملف تحليل ({PROFILE_COLLECTOR}) لكل تشغيل من تشغيلات هذه الجلسة التالية لـ: {', '.join(sorted(PROFILE_HANDLERS))}. يمكن أيضًا فتح أي صفحة مع ?profile=5.",
+                    class_name="text-gray-500 mb-8 text-right",
+                ),
+                rx.el.div(
+                    arm_form(),
+                    rx.el.table(
+                        rx.el.thead(
+                            rx.el.tr(
+                                rx.el.th("الملف", class_name="px-4 py-2 text-right"),
+                                rx.el.th("الوقت", class_name="px-4 py-2 text-right"),
+                                rx.el.th("الحجم", class_name="px-4 py-2 text-right"),
+                                rx.el.th("", class_name="px-4 py-2"),
+                                class_name="text-sm text-gray-600 bg-gray-50",
+                            )
+                        ),
+                        rx.el.tbody(rx.foreach(ProfilingState.profiles, profile_row)),
+                        class_name="w-full mt-10 border border-gray-200 rounded-lg",
+                    ),
+                    profile_report(),
+                    class_name="w-full max-w-5xl p-8 bg-white rounded-xl shadow-lg border border-gray-200",
+                ),
+                class_name="relative flex flex-col items-center min-h-screen py-12 px-4 sm:px-6 lg:px-8 pt-24",
+            ),
+            class_name="w-full bg-gray-50 font-['Lora']",
+        ),
+        dir="rtl",
+        class_name="font-['Lora']",
+        on_mount=ProfilingState.load_profiles,
+    )
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""Opt-in profiles of selected event handlers, written to PROFILE_DIR.
+
+A session arms its next N runs of the handlers named in PROFILE_HANDLERS
+(by default ``CitizenState.match_requests``), either from the /profiles
+page or by opening a page with ``?profile=N``. Each armed run is recorded
+by the PROFILE_COLLECTOR: ``cprofile`` writes a pstats file, ``sampling``
+samples the event-loop thread's stack from a helper thread and writes
+collapsed stacks for flamegraph.pl or speedscope.
+
+Both collectors see the whole event-loop thread, so while the handler
+awaits, other sessions' events are recorded too; profile on a quiet
+worker. Only one run is recorded at a time; an armed run that starts
+while another is recording is left unprofiled and keeps its turn. A run
+whose final update never arrives, because it was cancelled or its client
+went away, is cut off after PROFILE_MAX_SECONDS. Only logged-in sessions
+can arm runs.
+"""
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from reflex.event import Event
+from reflex.middleware import Middleware
+from app.auth import session_account
+from app.metrics import event_handler
+
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", ".profiles"))
+PROFILE_HANDLERS = frozenset(
+    name.strip()
+    for name in os.environ.get(
+        "PROFILE_HANDLERS", "CitizenState.match_requests"
+    ).split(",")
+    if name.strip()
+)
+PROFILE_COLLECTOR = os.environ.get("PROFILE_COLLECTOR", "cprofile")
+# Upper bound on the runs one session can arm at once.
+MAX_RUNS = 50
+SAMPLE_INTERVAL = 0.001
+PROFILE_MAX_SECONDS = float(os.environ.get("PROFILE_MAX_SECONDS", "120"))
+
+
+class CProfileCollector:
+    suffix = ".pstats"
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self, path: Path):
+        self._profile.disable()
+        self._profile.dump_stats(path)
+
+
+class SamplingCollector:
+    """Counts the event-loop thread's stacks, sampled from another thread."""
+
+    suffix = ".collapsed"
+
+    def __init__(self):
+        self._thread_id = threading.get_ident()
+        self._stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stopped.wait(SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                module = frame.f_globals.get("__name__", "?")
+                stack.append(f"{module}:{frame.f_code.co_qualname}")
+                frame = frame.f_back
+            self._stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self, path: Path):
+        self._stopped.set()
+        self._sampler.join()
+        path.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self._stacks.items())
+        )
+
+
+COLLECTORS = {"cprofile": CProfileCollector, "sampling": SamplingCollector}
+
+
+class EventProfiler(Middleware):
+    def __init__(self):
+        self._armed: dict[str, int] = {}
+        # Last ?profile= value seen per session, so a reload does not re-arm.
+        self._requested: dict[str, str] = {}
+        self._active: Optional[tuple[Event, object, Path]] = None
+        self._deadline: Optional[asyncio.TimerHandle] = None
+
+    def arm(self, token: str, runs: int):
+        runs = max(0, min(runs, MAX_RUNS))
+        if runs:
+            self._armed[token] = runs
+        else:
+            self._armed.pop(token, None)
+
+    def armed(self, token: str) -> int:
+        return self._armed.get(token, 0)
+
+    async def preprocess(self, app, state, event: Event):
+        requested = state.router.url.query_parameters.get("profile", "")
+        if (
+            requested
+            and self._requested.get(event.token) != requested
+            and await session_account(state)
+        ):
+            self._requested[event.token] = requested
+            self.arm(event.token, int(requested) if requested.isdigit() else 1)
+        if self._active is not None or not self._armed.get(event.token):
+            return None
+        name, background = event_handler(state, event)
+        if background or name not in PROFILE_HANDLERS:
+            return None
+        self.arm(event.token, self._armed[event.token] - 1)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        collector = COLLECTORS[PROFILE_COLLECTOR]()
+        path = PROFILE_DIR / f"{stamp}-{name}-{event.token[:8]}{collector.suffix}"
+        self._active = (event, collector, path)
+        collector.start()
+        self._deadline = asyncio.get_running_loop().call_later(
+            PROFILE_MAX_SECONDS, self._finish, event
+        )
+        return None
+
+    async def postprocess(self, app, state, event: Event, update):
+        if update.final:
+            self._finish(event)
+        return update
+
+    def _finish(self, event: Event):
+        """Stop recording ``event``'s run, if it is the one being recorded."""
+        if self._active is None or self._active[0] is not event:
+            return
+        _, collector, path = self._active
+        self._active = None
+        self._deadline.cancel()
+        collector.stop(path)
+
+
+def list_profiles() -> list[dict]:
+    """Recorded profiles, newest first."""
+    if not PROFILE_DIR.is_dir():
+        return []
+    files = [
+        path
+        for path in PROFILE_DIR.iterdir()
+        if path.suffix in (CProfileCollector.suffix, SamplingCollector.suffix)
+    ]
+    files.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    return [
+        {
+            "name": path.name,
+            "size_kb": round(path.stat().st_size / 1024, 1),
+            "recorded": time.strftime(
+                "%Y-%m-%d %H:%M:%S", time.localtime(path.stat().st_mtime)
+            ),
+        }
+        for path in files
+    ]
+
+
+def profile_path(name: str) -> Optional[Path]:
+    """The file of a listed profile; None for anything else."""
+    if name not in {profile["name"] for profile in list_profiles()}:
+        return None
+    return PROFILE_DIR / name
+
+
+def profile_report(path: Path, limit: int = 40) -> str:
+    """A text summary: the top functions by cumulative time, or top stacks."""
+    if path.suffix == CProfileCollector.suffix:
+        out = io.StringIO()
+        stats = pstats.Stats(str(path), stream=out)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+    stacks = Counter()
+    for line in path.read_text().splitlines():
+        stack, _, count = line.rpartition(" ")
+        stacks[stack] += int(count)
+    total = sum(stacks.values()) or 1
+    return "\n".join(
+        f"{count * 100 / total:5.1f}%  {' ← '.join(reversed(stack.split(';')))}"
+        for stack, count in stacks.most_common(limit)
+    )
+
+
+profiler = EventProfiler()
\ No newline at end of file
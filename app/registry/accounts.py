@@ -0,0 +1,43 @@
+import asyncio
+import hashlib
+import hmac
+import os
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from app.db import accounts_table, engine, ensure_schema
+
+PBKDF2_ITERATIONS = 200_000
+
+
+def _hash_password(password: str, salt: bytes) -> str:
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"{salt.hex()}${digest.hex()}"
+
+
+async def create_account(email: str, password: str, mobile_number: str = "") -> bool:
+    """Store a new account; False when the email is already registered."""
+    await ensure_schema()
+    password_hash = await asyncio.to_thread(_hash_password, password, os.urandom(16))
+    stmt = insert(accounts_table).values(
+        email=email.lower(), password_hash=password_hash, mobile_number=mobile_number
+    )
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(stmt)
+    except IntegrityError:
+        return False
+    return True
+
+
+async def verify_account(email: str, password: str) -> bool:
+    await ensure_schema()
+    stmt = select(accounts_table.c.password_hash).where(
+        accounts_table.c.email == email.lower()
+    )
+    async with engine.connect() as conn:
+        stored = (await conn.execute(stmt)).scalar_one_or_none()
+    if stored is None:
+        return False
+    salt = bytes.fromhex(stored.split("$", 1)[0])
+    candidate = await asyncio.to_thread(_hash_password, password, salt)
+    return hmac.compare_digest(candidate, stored)
\ No newline at end of file
@@ -0,0 +1,9 @@
+from sqlalchemy import insert
+from app.db import apartments_table, engine, ensure_schema
+
+
+async def insert_apartment(apartment: dict) -> int:
+    await ensure_schema()
+    async with engine.begin() as conn:
+        result = await conn.execute(insert(apartments_table).values(**apartment))
+    return result.inserted_primary_key[0]
\ No newline at end of file
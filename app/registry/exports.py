@@ -0,0 +1,112 @@
+import csv
+import importlib.util
+import io
+import json
+from typing import AsyncIterator
+from app.registry.store import registry
+from app.validation import CITIZEN_FIELDS
+
+MATCH_FIELDS = ["national_id", "match_national_id", "rank", "score"]
+INTEGER_FIELDS = {"floor", "rank", "score"}
+DATASETS = {"citizens": CITIZEN_FIELDS, "matches": MATCH_FIELDS}
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+# Parquet needs pyarrow; without it the format is not offered at all.
+AVAILABLE_FORMATS = [
+    fmt
+    for fmt in FORMATS
+    if fmt != "parquet" or importlib.util.find_spec("pyarrow") is not None
+]
+
+
+async def encode_csv(
+    fields: list[str], chunks: AsyncIterator[list[dict]]
+) -> AsyncIterator[bytes]:
+    # The BOM lets Excel open the Arabic text as UTF-8, and the importer
+    # reads it with utf-8-sig, so an export can be imported back as is.
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    async for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def encode_jsonl(
+    fields: list[str], chunks: AsyncIterator[list[dict]]
+) -> AsyncIterator[bytes]:
+    async for chunk in chunks:
+        yield "".join(
+            json.dumps({field: row[field] for field in fields}, ensure_ascii=False)
+            + "\n"
+            for row in chunk
+        ).encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def encode_parquet(
+    fields: list[str], chunks: AsyncIterator[list[dict]]
+) -> AsyncIterator[bytes]:
+    """One row group per chunk, sent as soon as it is written."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            (field, pa.int64() if field in INTEGER_FIELDS else pa.string())
+            for field in fields
+        ]
+    )
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        async for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+ENCODERS = {"csv": encode_csv, "jsonl": encode_jsonl, "parquet": encode_parquet}
+
+
+def export_stream(dataset: str, fmt: str) -> AsyncIterator[bytes]:
+    """Encoded chunks of ``dataset`` ("citizens" or "matches") in ``fmt``."""
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset: {dataset}")
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt not in AVAILABLE_FORMATS:
+        raise ValueError("Parquet export requires the pyarrow package.")
+    chunks = (
+        registry.iter_citizens() if dataset == "citizens" else registry.iter_matches()
+    )
+    return ENCODERS[fmt](DATASETS[dataset], chunks)
\ No newline at end of file
@@ -0,0 +1,311 @@
+import csv
+import io
+import os
+import posixpath
+import re
+import secrets
+import tempfile
+import time
+import zipfile
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, BinaryIO, Iterator, Optional, TypedDict
+from xml.etree.ElementTree import ParseError, iterparse
+from app.registry.store import registry
+from app.validation import CITIZEN_FIELDS, validate_citizen
+
+COLUMN_ALIASES = {
+    "الرقم القومي": "national_id",
+    "الاسم": "name",
+    "رقم العمارة": "building",
+    "الدور الحالي": "floor",
+    "الاتجاه الحالي": "direction",
+    "رقم الموبايل": "phone",
+    "الرغبة في الدور": "wish_floor",
+    "الرغبة في الاتجاه": "wish_direction",
+}
+OPTIONAL_COLUMNS = {"phone"}
+IMPORT_SUFFIXES = (".csv", ".xlsx")
+
+# Uploads are spooled here before they are parsed. With several backend
+# workers, point IMPORT_DIR at a directory they all share.
+IMPORT_DIR = Path(
+    os.environ.get("IMPORT_DIR", Path(tempfile.gettempdir()) / "citizen-imports")
+)
+MAX_IMPORT_BYTES = int(os.environ.get("MAX_IMPORT_BYTES", 200 * 1024 * 1024))
+# Spooled files that were never imported are removed after this long.
+SPOOL_SECONDS = 3600
+# The shared-strings table is the one part of a workbook held in memory, and
+# a small upload can inflate to a huge one, so it is capped.
+MAX_SHARED_STRINGS = 1_000_000
+MAX_SHARED_STRING_CHARS = 50_000_000
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PACKAGE_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+class ImportTooLarge(ValueError):
+    def __init__(self):
+        super().__init__(
+            f"Files larger than {MAX_IMPORT_BYTES / (1024 * 1024):g} MB "
+            "cannot be imported."
+        )
+
+
+class ImportRowError(TypedDict):
+    row: int
+    field: str
+    message: str
+
+
+class ImportReport(TypedDict):
+    rows: int
+    inserted: int
+    updated: int
+    unchanged: int
+    failed: int
+    errors: list[ImportRowError]
+
+
+def iter_csv_rows(stream: BinaryIO) -> Iterator[list[str]]:
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()
+
+
+def _first_sheet(book: zipfile.ZipFile) -> str:
+    sheet_rel = None
+    with book.open("xl/workbook.xml") as xml:
+        for _, elem in iterparse(xml):
+            if elem.tag == _MAIN + "sheet":
+                sheet_rel = elem.get(_REL + "id")
+                break
+    if sheet_rel is None:
+        raise ValueError("Workbook has no worksheet.")
+    with book.open("xl/_rels/workbook.xml.rels") as xml:
+        for _, elem in iterparse(xml):
+            if elem.tag == _PACKAGE_REL + "Relationship" and elem.get("Id") == sheet_rel:
+                target = elem.get("Target")
+                if target.startswith("/"):
+                    return target.lstrip("/")
+                return posixpath.normpath(posixpath.join("xl", target))
+    raise ValueError("Workbook has no worksheet.")
+
+
+def _shared_strings(book: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in book.namelist():
+        return []
+    strings = []
+    chars = 0
+    table = None
+    with book.open("xl/sharedStrings.xml") as xml:
+        for event, elem in iterparse(xml, events=("start", "end")):
+            if event == "start":
+                if elem.tag == _MAIN + "sst":
+                    table = elem
+            elif elem.tag == _MAIN + "si":
+                text = "".join(t.text or "" for t in elem.iter(_MAIN + "t"))
+                strings.append(text)
+                chars += len(text)
+                if len(strings) > MAX_SHARED_STRINGS or chars > MAX_SHARED_STRING_CHARS:
+                    raise ValueError("Workbook has too many shared strings.")
+                if table is not None:
+                    table.remove(elem)
+    return strings
+
+
+def _column_index(reference: str) -> int:
+    index = 0
+    for char in reference:
+        if not char.isalpha():
+            break
+        index = index * 26 + ord(char.upper()) - ord("A") + 1
+    return index - 1
+
+
+def _cell_text(cell, shared: list[str]) -> str:
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(_MAIN + "t"))
+    value = cell.find(_MAIN + "v")
+    if value is None or value.text is None:
+        return ""
+    if kind == "s":
+        return shared[int(value.text)]
+    if kind in ("str", "b", "e"):
+        return value.text
+    # Excel stores every number as a float, so a national ID typed as a
+    # number can come back as "2.9901011234567E13".
+    try:
+        number = Decimal(value.text)
+    except InvalidOperation:
+        return value.text
+    if number == number.to_integral_value():
+        return str(int(number))
+    return str(number)
+
+
+def iter_xlsx_rows(stream: BinaryIO) -> Iterator[list[str]]:
+    """Rows of the first worksheet, parsed incrementally.
+
+    Only the shared-strings table, capped by MAX_SHARED_STRINGS and
+    MAX_SHARED_STRING_CHARS, is held in memory; sheet rows are dropped from
+    the parse tree as soon as they have been yielded. A workbook with missing parts, bad
+    XML or dangling string references raises ValueError.
+    """
+    try:
+        yield from _xlsx_rows(stream)
+    except (KeyError, IndexError, ParseError) as e:
+        raise ValueError(f"Not a valid .xlsx workbook: {e}") from e
+
+
+def _xlsx_rows(stream: BinaryIO) -> Iterator[list[str]]:
+    with zipfile.ZipFile(stream) as book:
+        shared = _shared_strings(book)
+        with book.open(_first_sheet(book)) as xml:
+            row: list[str] = []
+            sheet_data = None
+            for event, elem in iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == _MAIN + "sheetData":
+                        sheet_data = elem
+                elif elem.tag == _MAIN + "c":
+                    reference = elem.get("r")
+                    if reference:
+                        row.extend([""] * (_column_index(reference) - len(row)))
+                    row.append(_cell_text(elem, shared))
+                elif elem.tag == _MAIN + "row":
+                    yield row
+                    row = []
+                    # Clearing the row is not enough: the emptied element
+                    # would stay in sheetData, growing it by one per row.
+                    if sheet_data is not None:
+                        sheet_data.remove(elem)
+
+
+def iter_rows(filename: str, stream: BinaryIO) -> Iterator[list[str]]:
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return iter_csv_rows(stream)
+    if name.endswith(".xlsx"):
+        return iter_xlsx_rows(stream)
+    raise ValueError("Only .csv and .xlsx files can be imported.")
+
+
+def _sweep_spool():
+    cutoff = time.time() - SPOOL_SECONDS
+    for path in IMPORT_DIR.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+async def spool_upload(filename: str, chunks: AsyncIterable[bytes]) -> str:
+    """Write an upload to IMPORT_DIR as it arrives and return its id.
+
+    Uploads larger than MAX_IMPORT_BYTES are discarded with ImportTooLarge,
+    so neither memory nor disk grows with what a client chooses to send.
+    """
+    suffix = Path(filename.lower()).suffix
+    if suffix not in IMPORT_SUFFIXES:
+        raise ValueError("Only .csv and .xlsx files can be imported.")
+    IMPORT_DIR.mkdir(parents=True, exist_ok=True)
+    _sweep_spool()
+    upload_id = secrets.token_hex(16)
+    path = IMPORT_DIR / (upload_id + suffix)
+    size = 0
+    try:
+        with path.open("wb") as spool:
+            async for chunk in chunks:
+                size += len(chunk)
+                if size > MAX_IMPORT_BYTES:
+                    raise ImportTooLarge()
+                spool.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return upload_id + suffix
+
+
+def spooled_upload(upload: str) -> Optional[Path]:
+    """The spooled file ``spool_upload`` returned ``upload`` for, if any."""
+    if not re.fullmatch(r"[0-9a-f]{32}\.(csv|xlsx)", upload):
+        return None
+    path = IMPORT_DIR / upload
+    return path if path.is_file() else None
+
+
+async def import_citizens(
+    filename: str, stream: BinaryIO, chunk_size: int = 500, max_errors: int = 200
+) -> AsyncIterator[ImportReport]:
+    """Validate and upsert rows chunk by chunk, yielding the running report.
+
+    Rows are parsed one at a time from ``stream``, each chunk is written in
+    its own transaction, and at most ``max_errors`` row errors are kept
+    (``failed`` still counts every rejected row). Memory stays flat in the
+    number of rows, except for an .xlsx file's shared-strings table; pass a
+    file on disk, such as one from ``spool_upload``, not an in-memory copy.
+    """
+    report: ImportReport = {
+        "rows": 0,
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "failed": 0,
+        "errors": [],
+    }
+    rows = iter_rows(filename, stream)
+    header = [cell.strip() for cell in next(rows, [])]
+    columns = {
+        COLUMN_ALIASES.get(name, name.lower()): i for i, name in enumerate(header)
+    }
+    missing = [
+        field
+        for field in CITIZEN_FIELDS
+        if field not in columns and field not in OPTIONAL_COLUMNS
+    ]
+    if missing:
+        report["errors"].append(
+            {"row": 1, "field": ", ".join(missing), "message": "أعمدة مفقودة."}
+        )
+        yield report
+        return
+    chunk = []
+    for number, values in enumerate(rows, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        data = {
+            field: values[columns[field]].strip()
+            if field in columns and columns[field] < len(values)
+            else ""
+            for field in CITIZEN_FIELDS
+        }
+        report["rows"] += 1
+        errors = validate_citizen(data)
+        if errors:
+            report["failed"] += 1
+            for field, message in errors.items():
+                if len(report["errors"]) < max_errors:
+                    report["errors"].append(
+                        {"row": number, "field": field, "message": message}
+                    )
+            continue
+        chunk.append({**data, "floor": int(data["floor"])})
+        if len(chunk) >= chunk_size:
+            await _flush(chunk, report)
+            chunk = []
+            yield report
+    if chunk:
+        await _flush(chunk, report)
+    yield report
+
+
+async def _flush(chunk: list[dict], report: ImportReport):
+    outcomes = await registry.upsert_many(chunk)
+    for outcome, count in outcomes.items():
+        report[outcome] += count
\ No newline at end of file
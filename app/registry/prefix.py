@@ -0,0 +1,112 @@
+import bisect
+import heapq
+from array import array
+from typing import Iterator, Optional
+import numpy as np
+from app.matching.records import CitizenTable
+
+_ARABIC_FOLDS = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ى": "ي", "ة": "ه"})
+# New national IDs wait in a small unsorted list and are merged into the
+# sorted arrays in batches, so registering is not a memmove per citizen.
+_PENDING_LIMIT = 1024
+
+
+def normalize(text: str) -> str:
+    return text.strip().casefold().translate(_ARABIC_FOLDS)
+
+
+class PrefixIndex:
+    """Prefix lookups over the names and national IDs of a CitizenTable.
+
+    Every word of the name and the national ID itself are tokens, so typing
+    a family name or the first digits of an ID both find the citizen. Each
+    distinct name word keeps an array of the rows using it, and national IDs
+    sit in one sorted int64 array, so the index costs a few bytes per
+    citizen instead of a tuple per token.
+    """
+
+    def __init__(self, table: CitizenTable):
+        self._table = table
+        self._words: list[str] = []
+        self._postings: dict[str, array] = {}
+        self._ids = np.empty(0, dtype=np.int64)
+        self._id_rows = np.empty(0, dtype=np.int32)
+        self._pending: list[int] = []
+
+    def add(self, row: int, previous_name: Optional[str] = None):
+        """Index ``row``; ``previous_name`` is its name before an update."""
+        if previous_name is None:
+            self._pending.append(row)
+            if len(self._pending) >= _PENDING_LIMIT:
+                self._merge_pending()
+        else:
+            for word in set(normalize(previous_name).split()):
+                postings = self._postings[word]
+                postings.remove(row)
+                if not postings:
+                    del self._postings[word]
+                    del self._words[bisect.bisect_left(self._words, word)]
+        for word in set(normalize(self._table.name(row)).split()):
+            postings = self._postings.get(word)
+            if postings is None:
+                postings = self._postings[word] = array("i")
+                bisect.insort(self._words, word)
+            postings.append(row)
+
+    def _merge_pending(self):
+        rows = np.array(self._pending, dtype=np.int32)
+        ids = np.array(
+            [self._table.national_id[row] for row in self._pending], dtype=np.int64
+        )
+        order = np.argsort(ids, kind="stable")
+        at = np.searchsorted(self._ids, ids[order])
+        self._ids = np.insert(self._ids, at, ids[order])
+        self._id_rows = np.insert(self._id_rows, at, rows[order])
+        self._pending.clear()
+
+    def _tokens(self, row: int) -> list[str]:
+        return [
+            *normalize(self._table.name(row)).split(),
+            self._table.national_id_of(row),
+        ]
+
+    def _id_prefix(self, digits: str) -> Iterator[int]:
+        scale = 10 ** (14 - len(digits))
+        low, high = int(digits) * scale, (int(digits) + 1) * scale
+        i, j = np.searchsorted(self._ids, [low, high])
+        merged = ((int(self._ids[k]), int(self._id_rows[k])) for k in range(i, j))
+        pending = sorted(
+            (key, row)
+            for row in self._pending
+            if low <= (key := self._table.national_id[row]) < high
+        )
+        for _, row in heapq.merge(merged, pending):
+            yield row
+
+    def _word_prefix(self, prefix: str) -> Iterator[int]:
+        i = bisect.bisect_left(self._words, prefix)
+        while i < len(self._words) and self._words[i].startswith(prefix):
+            yield from self._postings[self._words[i]]
+            i += 1
+
+    def search(self, query: str, limit: int = 20) -> list[int]:
+        """Rows whose tokens start with every word of ``query``, at most ``limit``."""
+        words = normalize(query).split()
+        if not words:
+            return []
+        lead = max(words, key=len)
+        rest = [w for w in words if w is not lead]
+        if lead.isascii() and lead.isdigit() and len(lead) <= 14:
+            rows = self._id_prefix(lead)
+        else:
+            rows = self._word_prefix(lead)
+        found: dict[int, None] = {}
+        for row in rows:
+            if len(found) >= limit:
+                break
+            if row in found:
+                continue
+            tokens = self._tokens(row)
+            if all(any(t.startswith(w) for t in tokens) for w in rest):
+                found[row] = None
+        return list(found)
\ No newline at end of file
@@ -0,0 +1,28 @@
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from app.db import engine, ensure_schema, profiles_table
+
+
+async def get_profile(account_email: str) -> Optional[dict]:
+    await ensure_schema()
+    stmt = select(profiles_table).where(
+        profiles_table.c.account_email == account_email.lower()
+    )
+    async with engine.connect() as conn:
+        row = (await conn.execute(stmt)).mappings().first()
+    if row is None:
+        return None
+    profile = dict(row)
+    profile.pop("account_email")
+    return profile
+
+
+async def upsert_profile(account_email: str, profile: dict):
+    await ensure_schema()
+    stmt = insert(profiles_table).values(account_email=account_email.lower(), **profile)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[profiles_table.c.account_email], set_=profile
+    )
+    async with engine.begin() as conn:
+        await conn.execute(stmt)
\ No newline at end of file
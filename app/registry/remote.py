@@ -0,0 +1,172 @@
+import json
+import os
+from collections import Counter
+from typing import AsyncIterator, Iterable, Optional
+import httpx
+from app.matching.batch import RematchRunning
+from app.matching.rules import MatchProfile
+from app.matching.trace import MatchTrace
+
+# Most calls wait only for the registry's lock, so a call that cannot get a
+# connection within POOL_SECONDS fails instead of hanging; reads have no
+# limit because rematch and export streams run for minutes.
+POOL_SECONDS = 10.0
+CALL_TIMEOUT = httpx.Timeout(None, pool=POOL_SECONDS)
+# wait_alerts long-polls hold a connection each for up to their timeout, so
+# they get their own pool and cannot starve match, upsert and get.
+WATCH_CONNECTIONS = int(os.environ.get("MATCH_WATCH_CONNECTIONS", "500"))
+
+
+class RemoteWatch:
+    """A watch held open by the matching service, known here by its id."""
+
+    def __init__(self, watch_id: str):
+        self.watch_id = watch_id
+
+
+class RemoteRegistry:
+    """CitizenRegistry's async API, answered by app.registry.service.
+
+    Every web worker talks to the same service, so all of them see one
+    registry. Pass ``client`` to reach the service some other way, such
+    as an ``httpx.ASGITransport`` around an in-process service in tests;
+    it then carries the long polls too.
+    """
+
+    def __init__(self, url: str = "", client: Optional[httpx.AsyncClient] = None):
+        self._client = client or httpx.AsyncClient(base_url=url, timeout=CALL_TIMEOUT)
+        self._poll_client = client or httpx.AsyncClient(
+            base_url=url,
+            timeout=CALL_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=WATCH_CONNECTIONS,
+                max_keepalive_connections=WATCH_CONNECTIONS,
+            ),
+        )
+
+    async def _call(
+        self, method: str, client: Optional[httpx.AsyncClient] = None, **kwargs
+    ):
+        response = await (client or self._client).post(f"/call/{method}", json=kwargs)
+        response.raise_for_status()
+        return response.json()["result"]
+
+    async def _stream(self, method: str, **kwargs) -> AsyncIterator:
+        async with self._client.stream(
+            "POST", f"/stream/{method}", json=kwargs
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if line:
+                    yield json.loads(line)
+
+    async def upsert(self, citizen: dict) -> str:
+        return await self._call("upsert", citizen=citizen)
+
+    async def upsert_many(self, citizens: Iterable[dict]) -> Counter[str]:
+        return Counter(await self._call("upsert_many", citizens=list(citizens)))
+
+    async def get(self, national_id: str) -> Optional[dict]:
+        return await self._call("get", national_id=national_id)
+
+    async def count(self) -> int:
+        return await self._call("count")
+
+    async def profiles(self) -> list[tuple[str, MatchProfile]]:
+        return [
+            (national_id, MatchProfile(*profile))
+            for national_id, profile in await self._call("profiles")
+        ]
+
+    async def iter_citizens(self, chunk_size: int = 1000) -> AsyncIterator[list[dict]]:
+        async for chunk in self._stream("iter_citizens", chunk_size=chunk_size):
+            yield chunk
+
+    async def iter_matches(self, chunk_size: int = 5000) -> AsyncIterator[list[dict]]:
+        async for chunk in self._stream("iter_matches", chunk_size=chunk_size):
+            yield chunk
+
+    async def suggest(self, query: str, limit: int = 20) -> list[dict]:
+        return await self._call("suggest", query=query, limit=limit)
+
+    async def match(
+        self,
+        national_id: str,
+        trace: Optional[MatchTrace] = None,
+        limit: Optional[int] = None,
+        district: str = "",
+        radius_km: Optional[float] = None,
+    ) -> Optional[list[tuple[str, int]]]:
+        wanted = None if trace is None else {"label": trace.label, "debug": trace.debug}
+        result = await self._call(
+            "match",
+            national_id=national_id,
+            trace=wanted,
+            limit=limit,
+            district=district,
+            radius_km=radius_km,
+        )
+        if trace is not None and result["trace"]:
+            trace.merge(result["trace"], result["candidates"])
+        if result["matches"] is None:
+            return None
+        return [(national_id, score) for national_id, score in result["matches"]]
+
+    async def explain(
+        self, national_id: str, others: Iterable[str]
+    ) -> dict[str, dict[str, int]]:
+        return await self._call("explain", national_id=national_id, others=list(others))
+
+    async def watch(
+        self, national_id: str, district: str = "", radius_km: Optional[float] = None
+    ) -> Optional[RemoteWatch]:
+        watch_id = await self._call(
+            "watch", national_id=national_id, district=district, radius_km=radius_km
+        )
+        return None if watch_id is None else RemoteWatch(watch_id)
+
+    async def wait_alerts(
+        self, watch: RemoteWatch, timeout: float
+    ) -> list[tuple[str, int]]:
+        try:
+            alerts = await self._call(
+                "wait_alerts",
+                self._poll_client,
+                watch_id=watch.watch_id,
+                timeout=timeout,
+            )
+        except httpx.PoolTimeout:
+            # Every long-poll connection is busy; this poll simply saw nothing.
+            return []
+        return [(national_id, score) for national_id, score in alerts or []]
+
+    async def unwatch(self, watch: RemoteWatch):
+        await self._call("unwatch", watch_id=watch.watch_id)
+
+    async def buildings(self) -> list[dict]:
+        return await self._call("buildings")
+
+    async def upsert_building(self, building: dict) -> str:
+        return await self._call("upsert_building", building=building)
+
+    async def districts(self) -> list[str]:
+        return await self._call("districts")
+
+    async def rematch_all(
+        self, limit: Optional[int] = None, workers: Optional[int] = None
+    ) -> AsyncIterator[tuple[int, int]]:
+        try:
+            async for done, total in self._stream(
+                "rematch_all", limit=limit, workers=workers
+            ):
+                yield done, total
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 409:
+                raise RematchRunning("A rematch is already running.") from e
+            raise
+
+    async def rematch_status(self) -> dict:
+        return await self._call("rematch_status")
+
+    async def cache_stats(self) -> dict:
+        return await self._call("cache_stats")
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""The citizen registry served over HTTP, shared by every web worker.
+
+    granian --interface asgi --host 127.0.0.1 --port 8001 app.registry.service:service
+
+One process owns the in-memory table and indexes, so a registration
+handled by any Reflex worker is visible to every search at once. Workers
+reach it through RemoteRegistry by setting MATCH_SERVICE_URL, and share
+session state through Redis by setting REFLEX_REDIS_URL; with neither
+set, the app runs as a single process exactly as before.
+
+This shares the registry; it does not scale search. Every match query is
+answered by this one process, so adding web workers scales websockets
+and rendering but search throughput stays that of a single process. Per-
+worker read replicas of the table are not implemented.
+
+``POST /call/{method}`` takes the method's keyword arguments as JSON and
+answers ``{"result": ...}``. ``POST /stream/{method}`` answers the items
+of an async iterator as JSON lines. Watches are long-polled through
+``wait_alerts`` so no connection stays open between polls.
+"""
+import json
+import time
+import uuid
+from typing import AsyncIterator, Optional
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from app.matching.batch import RematchRunning
+from app.matching.trace import MatchTrace
+from app.registry.store import CitizenRegistry
+from app.registry.watchers import MatchWatch
+
+# Watches not polled for this long belong to workers that went away.
+WATCH_IDLE_SECONDS = 300
+
+
+class _Watches:
+    """Open watches by id, dropped when their worker stops polling."""
+
+    def __init__(self, registry: CitizenRegistry):
+        self._registry = registry
+        self._watches: dict[str, tuple[MatchWatch, float]] = {}
+
+    async def open(self, watch: MatchWatch) -> str:
+        await self._expire()
+        watch_id = uuid.uuid4().hex
+        self._watches[watch_id] = (watch, time.monotonic())
+        return watch_id
+
+    async def get(self, watch_id: str) -> Optional[MatchWatch]:
+        await self._expire()
+        entry = self._watches.get(watch_id)
+        if entry is None:
+            return None
+        self._watches[watch_id] = (entry[0], time.monotonic())
+        return entry[0]
+
+    async def close(self, watch_id: str):
+        entry = self._watches.pop(watch_id, None)
+        if entry is not None:
+            await self._registry.unwatch(entry[0])
+
+    async def _expire(self):
+        cutoff = time.monotonic() - WATCH_IDLE_SECONDS
+        for watch_id, (_, polled) in list(self._watches.items()):
+            if polled < cutoff:
+                await self.close(watch_id)
+
+
+def service_for(registry: CitizenRegistry) -> Starlette:
+    """An ASGI app serving ``registry``; tests can mount it in-process."""
+    watches = _Watches(registry)
+
+    async def match(national_id: str, trace: Optional[dict] = None, **kwargs):
+        local_trace = None if trace is None else MatchTrace(**trace)
+        matches = await registry.match(national_id, local_trace, **kwargs)
+        return {
+            "matches": matches,
+            "trace": None if local_trace is None else local_trace.summary(),
+            "candidates": [] if local_trace is None else local_trace.candidates,
+        }
+
+    async def watch(national_id: str, **kwargs) -> Optional[str]:
+        opened = await registry.watch(national_id, **kwargs)
+        return None if opened is None else await watches.open(opened)
+
+    async def wait_alerts(watch_id: str, timeout: float) -> Optional[list]:
+        opened = await watches.get(watch_id)
+        return None if opened is None else await registry.wait_alerts(opened, timeout)
+
+    async def unwatch(watch_id: str):
+        await watches.close(watch_id)
+
+    calls = {
+        "upsert": registry.upsert,
+        "upsert_many": registry.upsert_many,
+        "get": registry.get,
+        "count": registry.count,
+        "profiles": registry.profiles,
+        "suggest": registry.suggest,
+        "match": match,
+        "explain": registry.explain,
+        "watch": watch,
+        "wait_alerts": wait_alerts,
+        "unwatch": unwatch,
+        "buildings": registry.buildings,
+        "upsert_building": registry.upsert_building,
+        "districts": registry.districts,
+        "rematch_status": registry.rematch_status,
+        "cache_stats": registry.cache_stats,
+    }
+    streams = {
+        "iter_citizens": registry.iter_citizens,
+        "iter_matches": registry.iter_matches,
+        "rematch_all": registry.rematch_all,
+    }
+
+    async def call(request: Request):
+        method = calls.get(request.path_params["method"])
+        if method is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        return JSONResponse({"result": await method(**await request.json())})
+
+    async def stream(request: Request):
+        method = streams.get(request.path_params["method"])
+        if method is None:
+            return PlainTextResponse("Not Found", status_code=404)
+        items = aiter(method(**await request.json()))
+        # Start the iterator before answering, so a refused rematch is a 409
+        # rather than a stream that breaks after a 200.
+        try:
+            first = [await anext(items)]
+        except StopAsyncIteration:
+            first = []
+        except RematchRunning as e:
+            return PlainTextResponse(str(e), status_code=409)
+
+        async def lines() -> AsyncIterator[str]:
+            for item in first:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+            async for item in items:
+                yield json.dumps(item, ensure_ascii=False) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return Starlette(
+        routes=[
+            Route("/call/{method}", call, methods=["POST"]),
+            Route("/stream/{method}", stream, methods=["POST"]),
+        ]
+    )
+
+
+service = service_for(CitizenRegistry())
\ No newline at end of file
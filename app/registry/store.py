@@ -0,0 +1,483 @@
+import asyncio
+import logging
+import os
+from collections import Counter
+from typing import AsyncIterator, Iterable, Literal, Optional
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.db import (
+    buildings_table,
+    citizens_table,
+    engine as default_engine,
+    ensure_schema,
+)
+from app.matching.batch import (
+    BLOCK_CELLS,
+    Rankings,
+    RematchRunning,
+    rank_all,
+    rank_rows,
+)
+from app.matching.cache import MatchCache
+from app.matching.engine import MatchIndex
+from app.matching.records import CitizenTable
+from app.matching.rules import (
+    UNKNOWN,
+    MatchProfile,
+    direction_code,
+    wish_direction_code,
+    wish_floor_code,
+)
+from app.matching.scoring import scorer
+from app.matching.spatial import BuildingMap
+from app.matching.trace import MatchTrace
+from app.matching.vectorized import CitizenColumns
+from app.registry.prefix import PrefixIndex
+from app.registry.remote import RemoteRegistry
+from app.registry.watchers import MatchWatch, MatchWatchers
+
+UpsertOutcome = Literal["inserted", "updated", "unchanged"]
+
+logger = logging.getLogger(__name__)
+
+_CODED_FIELDS = (
+    ("direction", direction_code),
+    ("wish_direction", wish_direction_code),
+    ("wish_floor", wish_floor_code),
+)
+
+
+def _unknown_choices(citizen: dict) -> list[str]:
+    """The citizen's fields whose values are none of the form's choices."""
+    return [
+        f"{field} {citizen[field]!r}"
+        for field, code in _CODED_FIELDS
+        if code(citizen[field]) == UNKNOWN
+    ]
+
+
+class CitizenRegistry:
+    """Process-wide citizen registry persisted in SQLite.
+
+    The table is the source of truth; its rows are loaded on first use into a
+    compact in-memory CitizenTable, with a MatchIndex and a PrefixIndex over
+    the table rows, and kept in step with every upsert. The table's national
+    ID lookup serves gets and duplicate detection, so neither searches nor
+    upserts scan.
+    """
+
+    def __init__(self, engine: AsyncEngine = default_engine):
+        self._engine = engine
+        self._table = CitizenTable()
+        self._index = MatchIndex(self._table)
+        self._names = PrefixIndex(self._table)
+        self._cache = MatchCache(self._table)
+        self._buildings = BuildingMap()
+        self._watchers = MatchWatchers(self._table)
+        self._rankings: Optional[Rankings] = None
+        self._rematch_stale: Optional[set[int]] = None
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        # Upserts look rows up, write, then apply the row they looked up; two
+        # interleaved upserts of one new citizen would both append it.
+        self._write_lock = asyncio.Lock()
+
+    async def _ensure_loaded(self):
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            await ensure_schema(self._engine)
+            async with self._engine.connect() as conn:
+                result = await conn.stream(select(citizens_table))
+                async for rows in result.mappings().partitions(5000):
+                    for row in rows:
+                        # Rows written before today's validation may not fit
+                        # the table; one of them must not keep the app down.
+                        try:
+                            self._apply(dict(row), None)
+                        except ValueError as e:
+                            logger.warning(
+                                "Skipping citizen %r: %s", row["national_id"], e
+                            )
+                            continue
+                        # Such a row is kept, but never matches and its
+                        # unknown values export blank.
+                        unknown = _unknown_choices(row)
+                        if unknown:
+                            logger.warning(
+                                "Citizen %r has unknown %s",
+                                row["national_id"],
+                                ", ".join(unknown),
+                            )
+                buildings = await conn.execute(select(buildings_table))
+                for building in buildings.mappings():
+                    self._place(dict(building))
+            self._loaded = True
+
+    def _existing(self, national_id: str) -> tuple[Optional[int], Optional[dict]]:
+        row = self._table.row(national_id)
+        return row, None if row is None else self._table.record(row)
+
+    async def upsert(self, citizen: dict) -> UpsertOutcome:
+        await self._ensure_loaded()
+        async with self._write_lock:
+            row, existing = self._existing(citizen["national_id"])
+            if existing == citizen:
+                return "unchanged"
+            stmt = insert(citizens_table).values(**citizen)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[citizens_table.c.national_id],
+                set_={k: v for k, v in citizen.items() if k != "national_id"},
+            )
+            async with self._engine.begin() as conn:
+                await conn.execute(stmt)
+            self._apply(citizen, row)
+        return "inserted" if existing is None else "updated"
+
+    async def upsert_many(self, citizens: Iterable[dict]) -> Counter[UpsertOutcome]:
+        """Upsert a batch in one transaction; later rows win on repeated IDs."""
+        await self._ensure_loaded()
+        outcomes: Counter[UpsertOutcome] = Counter()
+        async with self._write_lock:
+            changed = []
+            for citizen in {c["national_id"]: c for c in citizens}.values():
+                row, existing = self._existing(citizen["national_id"])
+                if existing == citizen:
+                    outcomes["unchanged"] += 1
+                else:
+                    changed.append(citizen)
+            if not changed:
+                return outcomes
+            stmt = insert(citizens_table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[citizens_table.c.national_id],
+                set_={
+                    column.name: stmt.excluded[column.name]
+                    for column in citizens_table.columns
+                    if column.name != "national_id"
+                },
+            )
+            async with self._engine.begin() as conn:
+                await conn.execute(stmt, changed)
+            for citizen in changed:
+                row = self._table.row(citizen["national_id"])
+                self._apply(citizen, row)
+                outcomes["inserted" if row is None else "updated"] += 1
+        return outcomes
+
+    def _apply(self, citizen: dict, row: Optional[int]):
+        """Write ``citizen`` to the table and bring every index up to date."""
+        previous = previous_name = None
+        if row is not None:
+            previous = self._table.profile(row)
+            previous_name = self._table.name(row)
+        row = self._table.put(citizen)
+        profile = self._table.profile(row)
+        if previous is not None:
+            self._index.remove(row, previous)
+        self._index.add(row, profile)
+        self._names.add(row, previous_name)
+        if not self._loaded:
+            return
+        if previous is None:
+            self._watchers.notify(row, profile)
+        else:
+            self._watchers.update(row, profile)
+        self._cache.invalidate(row, profile, previous)
+        if self._rankings is not None or self._rematch_stale is not None:
+            stale = {row, *self._index.candidates(profile, row)}
+            if previous is not None:
+                stale.update(self._index.candidates(previous, row))
+            if self._rankings is not None:
+                self._rankings.discard(stale)
+            if self._rematch_stale is not None:
+                self._rematch_stale.update(stale)
+
+    async def get(self, national_id: str) -> Optional[dict]:
+        await self._ensure_loaded()
+        return self._existing(national_id)[1]
+
+    async def count(self) -> int:
+        await self._ensure_loaded()
+        return len(self._table)
+
+    async def profiles(self) -> list[tuple[str, MatchProfile]]:
+        """(national_id, profile) of every citizen, e.g. for the exchange solver."""
+        await self._ensure_loaded()
+        return list(self._table.profiles())
+
+    async def iter_citizens(self, chunk_size: int = 1000) -> AsyncIterator[list[dict]]:
+        """All citizens in chunks, as registered when iteration started."""
+        await self._ensure_loaded()
+        total = len(self._table)
+        for start in range(0, total, chunk_size):
+            yield [
+                self._table.record(row)
+                for row in range(start, min(start + chunk_size, total))
+            ]
+
+    async def iter_matches(self, chunk_size: int = 5000) -> AsyncIterator[list[dict]]:
+        """Every citizen's ranked matches as flat rows, at most ``chunk_size`` a chunk.
+
+        Matches are ranked on a snapshot of the citizen columns, a block of
+        citizens at a time in a worker thread, so an export neither stalls
+        the event loop nor evicts the match cache entries interactive
+        searches rely on. Citizens registered after it started are left out.
+        """
+        await self._ensure_loaded()
+        columns = CitizenColumns.from_table(self._table)
+        national_id_of = self._table.national_id_of
+        total = len(columns)
+        # Each block returns at most BLOCK_CELLS matches, however many a
+        # single citizen has.
+        block_size = max(1, BLOCK_CELLS // max(1, total))
+        rows = []
+        for start in range(0, total, block_size):
+            block = list(range(start, min(start + block_size, total)))
+            for user, positions, scores in await asyncio.to_thread(
+                rank_rows, columns, block
+            ):
+                national_id = national_id_of(user)
+                matches = zip(positions.tolist(), scores.tolist())
+                for rank, (other, score) in enumerate(matches, start=1):
+                    rows.append(
+                        {
+                            "national_id": national_id,
+                            "match_national_id": national_id_of(other),
+                            "rank": rank,
+                            "score": score,
+                        }
+                    )
+                    if len(rows) >= chunk_size:
+                        yield rows
+                        rows = []
+        if rows:
+            yield rows
+
+    async def suggest(self, query: str, limit: int = 20) -> list[dict]:
+        """National ID and name of citizens whose name or ID starts with ``query``."""
+        await self._ensure_loaded()
+        return [
+            {
+                "national_id": self._table.national_id_of(row),
+                "name": self._table.name(row),
+            }
+            for row in self._names.search(query, limit)
+        ]
+
+    async def match(
+        self,
+        national_id: str,
+        trace: Optional[MatchTrace] = None,
+        limit: Optional[int] = None,
+        district: str = "",
+        radius_km: Optional[float] = None,
+    ) -> Optional[list[tuple[str, int]]]:
+        """(national_id, score) matches for the citizen, best first; None if unknown.
+
+        ``district`` and ``radius_km`` (from the citizen's building) restrict
+        candidates to the matching buildings before anything is scored.
+        Restricted searches go straight to the index: the cache and the
+        batch rankings only hold unrestricted results.
+        """
+        await self._ensure_loaded()
+        row = self._table.row(national_id)
+        if row is None:
+            return None
+        if district or radius_km is not None:
+            area = self._area(row, district, radius_km)
+            ranking = self._index.query(
+                self._table.profile(row),
+                row,
+                trace,
+                limit,
+                self._table.building[row],
+                area,
+            )
+            if trace:
+                trace.cache = "area"
+            national_id_of = self._table.national_id_of
+            return [(national_id_of(other), score) for other, score in ranking]
+        ranking = self._cache.get(row, limit)
+        source = "hit"
+        if ranking is None and self._rankings is not None:
+            ranking = self._rankings.get(row, limit)
+            source = "batch"
+        if ranking is None:
+            user = self._table.profile(row)
+            ranking = self._index.query(
+                user, row, trace, limit, self._table.building[row]
+            )
+            self._cache.put(row, user, limit, ranking)
+            source = "miss"
+        elif trace:
+            trace.hits = len(ranking)
+        if trace:
+            trace.cache = source
+        national_id_of = self._table.national_id_of
+        return [(national_id_of(other), score) for other, score in ranking]
+
+    def _area(
+        self, row: int, district: str, radius_km: Optional[float]
+    ) -> Optional[set[int]]:
+        """Building codes allowed by the district and radius filters."""
+        area = None
+        if district:
+            area = self._buildings.in_district(district)
+        if radius_km is not None:
+            nearby = self._buildings.within(self._table.building[row], radius_km)
+            area = nearby if area is None else area & nearby
+        return area
+
+    def _building_record(self, code: int) -> Optional[dict]:
+        entry = self._buildings.get(code)
+        if entry is None:
+            return None
+        district, latitude, longitude = entry
+        return {
+            "name": self._table.building_name(code),
+            "district": district,
+            "latitude": latitude,
+            "longitude": longitude,
+        }
+
+    def _place(self, building: dict) -> int:
+        code = self._table.building_code(building["name"])
+        self._buildings.put(
+            code, building["district"], building["latitude"], building["longitude"]
+        )
+        return code
+
+    async def upsert_building(self, building: dict) -> UpsertOutcome:
+        """Register a building's district and optional coordinates."""
+        await self._ensure_loaded()
+        async with self._write_lock:
+            code = self._table.building_code(building["name"])
+            existing = self._building_record(code)
+            if existing == building:
+                return "unchanged"
+            stmt = insert(buildings_table).values(**building)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[buildings_table.c.name],
+                set_={k: v for k, v in building.items() if k != "name"},
+            )
+            async with self._engine.begin() as conn:
+                await conn.execute(stmt)
+            self._place(building)
+        return "inserted" if existing is None else "updated"
+
+    async def buildings(self) -> list[dict]:
+        """Every registered building, by name."""
+        await self._ensure_loaded()
+        records = [self._building_record(code) for code, _ in self._buildings.items()]
+        return sorted(records, key=lambda b: b["name"])
+
+    async def districts(self) -> list[str]:
+        await self._ensure_loaded()
+        return self._buildings.districts()
+
+    async def watch(
+        self, national_id: str, district: str = "", radius_km: Optional[float] = None
+    ) -> Optional[MatchWatch]:
+        """Start hearing about citizens who register later and match this one.
+
+        Alerts are (national_id, score) pairs read with ``wait_alerts``;
+        ``district`` and ``radius_km`` narrow them like they narrow ``match``.
+        Pass the watch to ``unwatch`` when the listener goes away.
+        """
+        await self._ensure_loaded()
+        row = self._table.row(national_id)
+        if row is None:
+            return None
+        area = None
+        if district or radius_km is not None:
+            area = self._area(row, district, radius_km)
+        watch = MatchWatch(row, area)
+        self._watchers.add(watch)
+        return watch
+
+    async def wait_alerts(
+        self, watch: MatchWatch, timeout: float
+    ) -> list[tuple[str, int]]:
+        return await watch.wait(timeout)
+
+    async def unwatch(self, watch: MatchWatch):
+        self._watchers.remove(watch)
+
+    async def explain(
+        self, national_id: str, others: Iterable[str]
+    ) -> dict[str, dict[str, int]]:
+        """Score breakdown of each of ``others`` as a match for the citizen."""
+        await self._ensure_loaded()
+        row = self._table.row(national_id)
+        if row is None:
+            return {}
+        user = self._table.profile(row)
+        building = self._table.building[row]
+        breakdowns = {}
+        for other_id in others:
+            other = self._table.row(other_id)
+            if other is not None:
+                breakdowns[other_id] = scorer.breakdown(
+                    user,
+                    self._table.profile(other),
+                    self._table.building[other] == building,
+                )
+        return breakdowns
+
+    @property
+    def rematch_running(self) -> bool:
+        return self._rematch_stale is not None
+
+    @property
+    def ranked_count(self) -> int:
+        return 0 if self._rankings is None else len(self._rankings)
+
+    async def rematch_all(
+        self, limit: Optional[int] = None, workers: Optional[int] = None
+    ) -> AsyncIterator[tuple[int, int]]:
+        """Rank every citizen on a process pool, yielding (buildings done, total).
+
+        The finished rankings answer ``match`` for everyone without a search.
+        Citizens registered or changed while the job runs, and everyone they
+        now match, are left out so stale results are never served. Only one
+        job runs at a time: the job is claimed before anything is awaited,
+        and a second caller gets RematchRunning.
+        """
+        if self._rematch_stale is not None:
+            raise RematchRunning("A rematch is already running.")
+        self._rematch_stale = set()
+        try:
+            await self._ensure_loaded()
+            columns = CitizenColumns.from_table(self._table)
+            buildings = np.array(self._table.building, dtype=np.int32)
+            order = np.argsort(buildings, kind="stable")
+            bounds = np.flatnonzero(np.diff(buildings[order])) + 1
+            groups = [
+                group.tolist() for group in np.split(order, bounds) if len(group)
+            ]
+            rankings = Rankings(limit)
+            async for progress in rank_all(columns, groups, rankings, workers):
+                yield progress
+            rankings.discard(self._rematch_stale)
+            self._rankings = rankings
+        finally:
+            self._rematch_stale = None
+
+    async def rematch_status(self) -> dict:
+        return {"running": self.rematch_running, "ranked": self.ranked_count}
+
+    async def cache_stats(self) -> dict:
+        """Hits, misses and size of the match cache, for /metrics."""
+        return self._cache.stats()
+
+
+# With several web workers, MATCH_SERVICE_URL points them all at one
+# app.registry.service process instead of each loading its own registry.
+MATCH_SERVICE_URL = os.environ.get("MATCH_SERVICE_URL", "")
+
+registry = RemoteRegistry(MATCH_SERVICE_URL) if MATCH_SERVICE_URL else CitizenRegistry()
\ No newline at end of file
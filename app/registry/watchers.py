@@ -0,0 +1,91 @@
+import asyncio
+from typing import Optional
+from app.matching.engine import MatchIndex
+from app.matching.records import CitizenTable
+from app.matching.rules import MatchProfile
+from app.matching.scoring import scorer
+
+# Alerts a watcher can fall behind by before the oldest are dropped.
+QUEUE_SIZE = 100
+
+
+class MatchWatch:
+    """One open search waiting to hear about new compatible citizens."""
+
+    def __init__(self, row: int, area: Optional[set[int]]):
+        self.row = row
+        self.area = area
+        self.queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue(QUEUE_SIZE)
+
+    def push(self, alert: tuple[str, int]):
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(alert)
+
+    async def wait(self, timeout: float) -> list[tuple[str, int]]:
+        """Every queued alert, waiting up to ``timeout`` seconds for the first."""
+        try:
+            alerts = [await asyncio.wait_for(self.queue.get(), timeout)]
+        except asyncio.TimeoutError:
+            return []
+        while not self.queue.empty():
+            alerts.append(self.queue.get_nowait())
+        return alerts
+
+
+class MatchWatchers:
+    """Reverse-match index: the saved searches a new citizen would appear in.
+
+    Watched citizens are kept in a MatchIndex of their own. Compatibility
+    goes both ways, so the watchers a newcomer satisfies are exactly the
+    newcomer's candidates in that index, found with the same bucket and
+    floor-range lookup as a search, however large the registry is.
+    """
+
+    def __init__(self, table: CitizenTable):
+        self._table = table
+        self._index = MatchIndex(table)
+        self._watches: dict[int, list[MatchWatch]] = {}
+        self._profiles: dict[int, MatchProfile] = {}
+
+    def __len__(self) -> int:
+        return sum(len(watches) for watches in self._watches.values())
+
+    def add(self, watch: MatchWatch):
+        row = watch.row
+        if row not in self._watches:
+            self._profiles[row] = self._table.profile(row)
+            self._index.add(row, self._profiles[row])
+            self._watches[row] = []
+        self._watches[row].append(watch)
+
+    def remove(self, watch: MatchWatch):
+        watches = self._watches.get(watch.row, [])
+        if watch in watches:
+            watches.remove(watch)
+        if not watches and watch.row in self._watches:
+            del self._watches[watch.row]
+            self._index.remove(watch.row, self._profiles.pop(watch.row))
+
+    def update(self, row: int, profile: MatchProfile):
+        """Follow a watched citizen's change of flat or wishes."""
+        if row in self._profiles:
+            self._index.remove(row, self._profiles[row])
+            self._profiles[row] = profile
+            self._index.add(row, profile)
+
+    def notify(self, row: int, profile: MatchProfile):
+        """Push ``row`` as a new match to every watch it satisfies."""
+        if not self._watches:
+            return
+        national_id = self._table.national_id_of(row)
+        building = self._table.building[row]
+        for owner in self._index.candidates(profile, row):
+            score = scorer.score(
+                self._profiles[owner],
+                profile,
+                self._table.building[owner] == building,
+            )
+            for watch in self._watches[owner]:
+                if watch.area is None or building in watch.area:
+                    watch.push((national_id, score))
\ No newline at end of file
@@ -1,15 +1,11 @@
 import reflex as rx
-from typing import Optional, TypedDict
-import asyncio
-import logging
+from app.latency import simulated_latency
+from app.registry.apartments import insert_apartment
+from app.states.form_state import FormState, field_error
+from app.validation import APARTMENT_RULES, validate
 
 
-class ApartmentError(TypedDict):
-    field: str
-    message: str
-
-
-class ApartmentState(rx.State):
+class ApartmentState(FormState, rx.State):
     name: str = ""
     address: str = ""
     bedrooms: str = ""
@@ -17,70 +13,24 @@ class ApartmentState(rx.State):
     rent: str = ""
     description: str = ""
     is_loading: bool = False
-    errors: list[ApartmentError] = []
-
-    @rx.event
-    def get_error(self, field: str) -> Optional[str]:
-        for error in self.errors:
-            if error["field"] == field:
-                return error["message"]
-        return None
-
-    @rx.var
-    def name_error(self) -> Optional[str]:
-        return self.get_error("name")
-
-    @rx.var
-    def address_error(self) -> Optional[str]:
-        return self.get_error("address")
-
-    @rx.var
-    def bedrooms_error(self) -> Optional[str]:
-        return self.get_error("bedrooms")
-
-    @rx.var
-    def bathrooms_error(self) -> Optional[str]:
-        return self.get_error("bathrooms")
 
-    @rx.var
-    def rent_error(self) -> Optional[str]:
-        return self.get_error("rent")
+    name_error = field_error("name")
+    address_error = field_error("address")
+    bedrooms_error = field_error("bedrooms")
+    bathrooms_error = field_error("bathrooms")
+    rent_error = field_error("rent")
 
     def _validate_fields(self):
-        self.errors = []
-        if not self.name:
-            self.errors.append({"field": "name", "message": "Name is required."})
-        if not self.address:
-            self.errors.append({"field": "address", "message": "Address is required."})
-        try:
-            if self.bedrooms and int(self.bedrooms) <= 0:
-                self.errors.append(
-                    {"field": "bedrooms", "message": "Must be a positive number."}
-                )
-        except ValueError as e:
-            logging.exception(f"Error: {e}")
-            self.errors.append({"field": "bedrooms", "message": "Must be a number."})
-        try:
-            if self.bathrooms and float(self.bathrooms) <= 0:
-                self.errors.append(
-                    {"field": "bathrooms", "message": "Must be a positive number."}
-                )
-        except ValueError as e:
-            logging.exception(f"Error: {e}")
-            self.errors.append({"field": "bathrooms", "message": "Must be a number."})
-        try:
-            if self.rent and float(self.rent) <= 0:
-                self.errors.append(
-                    {"field": "rent", "message": "Must be a positive number."}
-                )
-        except ValueError as e:
-            logging.exception(f"Error: {e}")
-            self.errors.append({"field": "rent", "message": "Must be a number."})
+        self._set_errors(
+            validate(
+                APARTMENT_RULES,
+                {field: getattr(self, field) for field in APARTMENT_RULES},
+            )
+        )
 
     @rx.event
     async def add_apartment(self, form_data: dict):
         self.is_loading = True
-        self.errors = []
         self.name = form_data.get("name", "")
         self.address = form_data.get("address", "")
         self.bedrooms = form_data.get("bedrooms", "")
@@ -89,10 +39,20 @@ class ApartmentState(rx.State):
         self.description = form_data.get("description", "")
         yield
         self._validate_fields()
-        if self.errors:
+        if self._errors:
             self.is_loading = False
             yield rx.toast.error("Please fix the errors.")
             return
-        await asyncio.sleep(1.5)
+        await simulated_latency(1.5)
+        await insert_apartment(
+            {
+                "name": self.name,
+                "address": self.address,
+                "bedrooms": int(self.bedrooms) if self.bedrooms else None,
+                "bathrooms": float(self.bathrooms) if self.bathrooms else None,
+                "rent": float(self.rent) if self.rent else None,
+                "description": self.description,
+            }
+        )
         self.is_loading = False
         yield rx.toast.success("Apartment added successfully!")
\ No newline at end of file
@@ -0,0 +1,51 @@
+import reflex as rx
+from typing import Optional, TypedDict
+from app.latency import simulated_latency
+from app.registry.store import registry
+from app.states.form_state import FormState, field_error
+from app.validation import BUILDING_FIELDS, validate_building
+
+
+class Building(TypedDict):
+    name: str
+    district: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+
+class BuildingState(FormState, rx.State):
+    buildings: list[Building] = []
+    is_loading: bool = False
+
+    name_error = field_error("name")
+    district_error = field_error("district")
+    latitude_error = field_error("latitude")
+    longitude_error = field_error("longitude")
+
+    @rx.event
+    async def load_buildings(self):
+        self.buildings = await registry.buildings()
+
+    @rx.event
+    async def handle_submit(self, form_data: dict):
+        data = {field: form_data.get(field, "").strip() for field in BUILDING_FIELDS}
+        self._set_errors(validate_building(data))
+        if self._errors:
+            yield rx.toast.error("الراجاء إصلاح الأخطاء", position="bottom-right")
+            return
+        self.is_loading = True
+        yield
+        await simulated_latency(1)
+        building: Building = {
+            "name": data["name"],
+            "district": data["district"],
+            "latitude": float(data["latitude"]) if data["latitude"] else None,
+            "longitude": float(data["longitude"]) if data["longitude"] else None,
+        }
+        outcome = await registry.upsert_building(building)
+        self.buildings = await registry.buildings()
+        self.is_loading = False
+        yield rx.toast.success(
+            "تم حفظ العمارة." if outcome != "unchanged" else "العمارة مسجلة بالفعل.",
+            position="bottom-right",
+        )
\ No newline at end of file
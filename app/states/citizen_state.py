@@ -1,8 +1,25 @@
 import reflex as rx
+from reflex.utils import prerequisites
 from typing import Optional, TypedDict, ClassVar
-import re
 import asyncio
 import logging
+import time
+from app.latency import simulated_latency
+from app.matching.exchange import solve_exchanges
+from app.matching.rules import direction_code, wish_direction_code, wish_floor_code
+from app.matching.trace import MatchTrace
+from app.metrics import MATCH_SCANNED
+from app.registry.store import registry
+from app.states.form_state import FormState, field_error
+from app.validation import (
+    CITIZEN_FIELDS,
+    DIRECTION_OPTIONS,
+    MATCH_RADIUS_RULE,
+    WISH_DIRECTION_OPTIONS,
+    WISH_FLOOR_OPTIONS,
+    check,
+    validate_citizen,
+)
 
 
 class Citizen(TypedDict):
@@ -16,17 +33,46 @@ class Citizen(TypedDict):
     wish_direction: str
 
 
-class MatchResult(TypedDict):
-    citizen: Citizen
+class CitizenOption(TypedDict):
+    national_id: str
+    name: str
+
+
+# (name, building, floor, phone, direction, wish_floor, wish_direction), the
+# last three as rules codes, which index the matching *_OPTIONS lists.
+MatchDetails = tuple[str, str, int, str, int, int, int]
+
+
+class ExchangeCycleView(TypedDict):
+    members: list[str]
     score: int
 
 
-class CitizenState(rx.State):
-    citizens: list[Citizen] = []
+class CitizenState(FormState, rx.State):
+    citizen_query: str = ""
+    citizen_suggestions: list[CitizenOption] = []
     current_citizen_id: str = ""
-    matches: list[MatchResult] = []
+    matches: list[tuple[str, int]] = []
+    match_details: dict[str, MatchDetails] = {}
+    match_breakdowns: dict[str, str] = {}
+    match_offset: int = 0
+    match_total: int = 0
+    _ranked_matches: list[tuple[str, int]] = []
+    _match_user_id: str = ""
+    _match_area: tuple[str, Optional[float]] = ("", None)
+    _watch_generation: int = 0
+    new_match_count: int = 0
+    match_district: str = ""
+    match_radius_km: str = ""
+    district_options: list[str] = []
     is_searching: bool = False
     search_performed: bool = False
+    exchange_cycles: list[ExchangeCycleView] = []
+    plan_cycle_count: int = 0
+    plan_matched_count: int = 0
+    plan_unmatched_count: int = 0
+    is_planning: bool = False
+    plan_built: bool = False
     national_id: str = ""
     name: str = ""
     building: str = ""
@@ -37,69 +83,62 @@ class CitizenState(rx.State):
     wish_direction: str = ""
     is_loading: bool = False
     is_successful: bool = False
-    errors: dict[str, str] = {}
-    DIRECTION_OPTIONS: ClassVar[list[str]] = ["بحرى", "قبلى", "شرقى", "غربى"]
-    WISH_FLOOR_OPTIONS: ClassVar[list[str]] = ["أعلى", "أسفل", "أى"]
-    WISH_DIRECTION_OPTIONS: ClassVar[list[str]] = ["بحرى", "قبلى", "شرقى", "غربى", "أى"]
-
-    @rx.var
-    def name_error(self) -> str:
-        return self.errors.get("name", "")
-
-    @rx.var
-    def national_id_error(self) -> str:
-        return self.errors.get("national_id", "")
-
-    @rx.var
-    def building_error(self) -> str:
-        return self.errors.get("building", "")
-
-    @rx.var
-    def floor_error(self) -> str:
-        return self.errors.get("floor", "")
+    DIRECTION_OPTIONS: ClassVar[list[str]] = DIRECTION_OPTIONS
+    WISH_FLOOR_OPTIONS: ClassVar[list[str]] = WISH_FLOOR_OPTIONS
+    WISH_DIRECTION_OPTIONS: ClassVar[list[str]] = WISH_DIRECTION_OPTIONS
+    SUBMIT_MESSAGES: ClassVar[dict[str, str]] = {
+        "inserted": "تم حفظ البيانات بنجاح!",
+        "updated": "تم تحديث بياناتك بنجاح!",
+        "unchanged": "بياناتك مسجلة بالفعل بدون تغيير.",
+    }
+    PLAN_PREVIEW_SIZE: ClassVar[int] = 50
+    SUGGESTION_LIMIT: ClassVar[int] = 20
+    MATCH_PAGE_SIZE: ClassVar[int] = 12
+    MATCH_RESULT_LIMIT: ClassVar[int] = 500
+    # A search keeps listening for newly registered matches this long, and
+    # checks this often whether a newer search has replaced it.
+    WATCH_SECONDS: ClassVar[int] = 30 * 60
+    WATCH_POLL_SECONDS: ClassVar[int] = 30
+    SCORE_FACTOR_LABELS: ClassVar[dict[str, str]] = {
+        "base": "أساسي",
+        "direction": "الاتجاه",
+        "floor_proximity": "قرب الدور",
+        "same_building": "نفس العمارة",
+        "ground_floor": "دور أرضي",
+    }
 
     @rx.var
-    def direction_error(self) -> str:
-        return self.errors.get("direction", "")
+    def has_prev_match_page(self) -> bool:
+        return self.match_offset > 0
 
     @rx.var
-    def phone_error(self) -> str:
-        return self.errors.get("phone", "")
+    def has_next_match_page(self) -> bool:
+        return self.match_offset + self.MATCH_PAGE_SIZE < self.match_total
 
     @rx.var
-    def wish_floor_error(self) -> str:
-        return self.errors.get("wish_floor", "")
+    def match_page_label(self) -> str:
+        if not self.match_total:
+            return ""
+        last = min(self.match_offset + self.MATCH_PAGE_SIZE, self.match_total)
+        # Searches stop at MATCH_RESULT_LIMIT, so a full list may have more.
+        total = str(self.match_total)
+        if self.match_total >= self.MATCH_RESULT_LIMIT:
+            total += "+"
+        return f"{self.match_offset + 1}–{last} من {total}"
 
-    @rx.var
-    def wish_direction_error(self) -> str:
-        return self.errors.get("wish_direction", "")
+    name_error = field_error("name")
+    national_id_error = field_error("national_id")
+    building_error = field_error("building")
+    floor_error = field_error("floor")
+    direction_error = field_error("direction")
+    phone_error = field_error("phone")
+    wish_floor_error = field_error("wish_floor")
+    wish_direction_error = field_error("wish_direction")
 
     def _validate(self):
-        self.errors = {}
-        if not self.name:
-            self.errors["name"] = "الاسم مطلوب."
-        if not self.national_id:
-            self.errors["national_id"] = "الرقم القومي مطلوب."
-        elif not (self.national_id.isdigit() and len(self.national_id) == 14):
-            self.errors["national_id"] = "الرقم القومي يجب أن يتكون من 14 رقمًا."
-        if not self.building:
-            self.errors["building"] = "رقم العمارة مطلوب."
-        if not self.floor:
-            self.errors["floor"] = "رقم الدور مطلوب."
-        else:
-            try:
-                int(self.floor)
-            except ValueError as e:
-                logging.exception(f"Error: {e}")
-                self.errors["floor"] = "رقم الدور يجب أن يكون رقمًا صحيحًا."
-        if not self.direction:
-            self.errors["direction"] = "الاتجاه الحالي مطلوب."
-        if not self.wish_floor:
-            self.errors["wish_floor"] = "الرجاء تحديد الرغبة في الدور."
-        if not self.wish_direction:
-            self.errors["wish_direction"] = "الرجاء تحديد الرغبة في الاتجاه."
-        if self.phone and (not re.match("^01[0-2,5]\\d{8}$", self.phone)):
-            self.errors["phone"] = "صيغة رقم الموبايل غير صحيحة."
+        self._set_errors(
+            validate_citizen({field: getattr(self, field) for field in CITIZEN_FIELDS})
+        )
 
     @rx.event
     async def handle_submit(self, form_data: dict):
@@ -115,11 +154,11 @@ class CitizenState(rx.State):
         self.wish_floor = form_data.get("wish_floor", "")
         self.wish_direction = form_data.get("wish_direction", "")
         self._validate()
-        if self.errors:
+        if self._errors:
             self.is_loading = False
             yield rx.toast.error("الراجاء إصلاح الأخطاء", position="bottom-right")
             return
-        await asyncio.sleep(1.5)
+        await simulated_latency(1.5)
         new_citizen: Citizen = {
             "name": self.name,
             "national_id": self.national_id,
@@ -130,20 +169,44 @@ class CitizenState(rx.State):
             "wish_floor": self.wish_floor,
             "wish_direction": self.wish_direction,
         }
-        citizen_index = -1
-        for i, c in enumerate(self.citizens):
-            if c["national_id"] == self.national_id:
-                citizen_index = i
-                break
-        if citizen_index != -1:
-            self.citizens[citizen_index] = new_citizen
-        else:
-            self.citizens.append(new_citizen)
-        logging.info(f"Citizen data saved: {new_citizen}")
-        logging.info(f"Total citizens: {len(self.citizens)}")
+        outcome = await registry.upsert(new_citizen)
+        logging.info(f"Citizen data {outcome}: {new_citizen}")
+        logging.info(f"Total citizens: {await registry.count()}")
         self.is_loading = False
         self.is_successful = True
-        yield rx.toast.success("تم حفظ البيانات بنجاح!", position="bottom-right")
+        yield rx.toast.success(
+            self.SUBMIT_MESSAGES[outcome], position="bottom-right"
+        )
+
+    @rx.event
+    async def search_citizens(self, query: str):
+        self.citizen_query = query
+        self.current_citizen_id = ""
+        self.citizen_suggestions = await registry.suggest(
+            query, self.SUGGESTION_LIMIT
+        )
+
+    @rx.event
+    def select_citizen(self, option: CitizenOption):
+        self.current_citizen_id = option["national_id"]
+        self.citizen_query = f"{option['name']} ({option['national_id']})"
+        self.citizen_suggestions = []
+
+    @rx.event
+    async def load_match_filters(self):
+        self.district_options = await registry.districts()
+
+    @rx.event
+    def set_is_successful(self, is_successful: bool):
+        self.is_successful = is_successful
+
+    @rx.event
+    def set_match_district(self, district: str):
+        self.match_district = district
+
+    @rx.event
+    def set_match_radius_km(self, radius_km: str):
+        self.match_radius_km = radius_km.strip()
 
     @rx.event
     async def match_requests(self, national_id: str):
@@ -151,68 +214,164 @@ class CitizenState(rx.State):
         self.is_searching = True
         self.search_performed = True
         self.matches = []
+        self.match_details = {}
+        self._ranked_matches = []
+        self.match_offset = 0
+        self.match_total = 0
+        self.new_match_count = 0
+        self._watch_generation += 1
         yield
-        await asyncio.sleep(1)
-        user = None
-        for c in self.citizens:
-            if c["national_id"] == national_id:
-                user = c
-                break
-        if not user:
+        radius_error = check(MATCH_RADIUS_RULE, self.match_radius_km)
+        if radius_error:
             self.is_searching = False
-            yield rx.toast.error("لم يتم العثور على المواطن.")
+            yield rx.toast.error(radius_error)
             return
-        logging.info(
-            f"Searching matches for: {user['name']} (Floor {user['floor']}, wants {user['wish_floor']})"
+        radius_km = float(self.match_radius_km) if self.match_radius_km else None
+        await simulated_latency(1)
+        trace_param = self.router.url.query_parameters.get("trace", "")
+        trace = MatchTrace.sampled(
+            f"match_requests:{national_id}",
+            force=bool(trace_param),
+            debug=trace_param == "debug",
         )
-        potential_matches = []
-        for other in self.citizens:
-            if other["national_id"] == user["national_id"]:
-                continue
-            floor_ok = False
-            if user["wish_floor"] == "أعلى" and other["floor"] > user["floor"]:
-                floor_ok = True
-            elif user["wish_floor"] == "أسفل" and other["floor"] < user["floor"]:
-                floor_ok = True
-            elif user["wish_floor"] == "أى":
-                floor_ok = True
-            direction_ok = False
-            if user["wish_direction"] == "أى":
-                direction_ok = True
-            elif other["direction"] == user["wish_direction"]:
-                direction_ok = True
-            reverse_floor_ok = False
-            if other["wish_floor"] == "أسفل" and user["floor"] < other["floor"]:
-                reverse_floor_ok = True
-            elif other["wish_floor"] == "أعلى" and user["floor"] > other["floor"]:
-                reverse_floor_ok = True
-            elif other["wish_floor"] == "أى":
-                reverse_floor_ok = True
-            reverse_direction_ok = False
-            if other["wish_direction"] == "أى":
-                reverse_direction_ok = True
-            elif user["direction"] == other["wish_direction"]:
-                reverse_direction_ok = True
-            logging.info(
-                f"Checking {other['name']}: floor_ok={floor_ok}, direction_ok={direction_ok}, reverse_floor_ok={reverse_floor_ok}, reverse_direction_ok={reverse_direction_ok}"
-            )
-            if floor_ok and direction_ok and reverse_floor_ok and reverse_direction_ok:
-                score = 50
-                if (
-                    user["wish_direction"] == other["direction"]
-                    or user["wish_direction"] == "أى"
-                    or other["wish_direction"] == "أى"
-                ):
-                    score += 30
-                floor_diff = abs(other["floor"] - user["floor"])
-                if floor_diff <= 2:
-                    score += 20 - floor_diff * 10
-                potential_matches.append(
-                    {"citizen": other, "score": min(100, int(score))}
-                )
-                logging.info(f"✓ Match found: {other['name']} with score {score}%")
-        potential_matches.sort(key=lambda x: x["score"], reverse=True)
-        self.matches = potential_matches
+        # Unsampled searches still count their candidates for the metrics.
+        counted = trace or MatchTrace(f"match_requests:{national_id}")
+        ranked = await registry.match(
+            national_id,
+            counted,
+            limit=self.MATCH_RESULT_LIMIT,
+            district=self.match_district,
+            radius_km=radius_km,
+        )
+        if ranked is None:
+            self.is_searching = False
+            yield rx.toast.error("لم يتم العثور على المواطن.")
+            return
+        self._ranked_matches = ranked
+        self._match_user_id = national_id
+        self._match_area = (self.match_district, radius_km)
+        self.match_total = len(self._ranked_matches)
+        MATCH_SCANNED.observe(counted.cache, counted.scanned)
+        await self._load_match_page(0)
         self.is_searching = False
-        logging.info(f"Found {len(potential_matches)} total matches")
-        yield
\ No newline at end of file
+        if trace:
+            trace.emit()
+        yield CitizenState.watch_new_matches
+
+    @rx.event(background=True)
+    async def watch_new_matches(self):
+        """Tell this session about citizens who register and match its search.
+
+        The registry pushes alerts as soon as a compatible citizen is
+        inserted; the loop ends when a newer search replaces this one, when
+        the tab's websocket closes, or after WATCH_SECONDS.
+        """
+        async with self:
+            generation = self._watch_generation
+            national_id = self._match_user_id
+            district, radius_km = self._match_area
+            token = self.router.session.client_token
+        # Sockets are tracked by the worker that holds them, which is the one
+        # running this task.
+        sockets = prerequisites.get_and_validate_app().app.event_namespace
+        watch = await registry.watch(national_id, district, radius_km)
+        if watch is None:
+            return
+        deadline = time.monotonic() + self.WATCH_SECONDS
+        try:
+            while time.monotonic() < deadline:
+                alerts = await registry.wait_alerts(watch, self.WATCH_POLL_SECONDS)
+                if sockets is not None and token not in sockets.token_to_sid:
+                    return
+                async with self:
+                    if self._watch_generation != generation:
+                        return
+                    self.new_match_count += len(alerts)
+                for match_id, score in alerts:
+                    citizen = await registry.get(match_id)
+                    name = citizen["name"] if citizen else match_id
+                    yield rx.toast.info(
+                        f"مواطن جديد متوافق: {name} ({score}%)",
+                        position="bottom-right",
+                    )
+        finally:
+            await registry.unwatch(watch)
+
+    async def _load_match_page(self, offset: int):
+        """Send the page as (national_id, score) refs plus packed details.
+
+        Details are keyed by national ID, cover only the page on screen and
+        are positional tuples with interned direction and wish codes that
+        the client turns back into labels, so a page costs about half the
+        bytes of full citizen dicts. They are always read from the registry,
+        since a citizen may have changed since the last page was sent.
+        """
+        self.match_offset = offset
+        page = self._ranked_matches[offset : offset + self.MATCH_PAGE_SIZE]
+        details = {}
+        for national_id, _ in page:
+            if citizen := await registry.get(national_id):
+                details[national_id] = (
+                    citizen["name"],
+                    citizen["building"],
+                    citizen["floor"],
+                    citizen["phone"],
+                    direction_code(citizen["direction"]),
+                    wish_floor_code(citizen["wish_floor"]),
+                    wish_direction_code(citizen["wish_direction"]),
+                )
+        self.match_details = details
+        self.matches = [ref for ref in page if ref[0] in details]
+        breakdowns = await registry.explain(self._match_user_id, details)
+        self.match_breakdowns = {
+            national_id: " + ".join(
+                f"{self.SCORE_FACTOR_LABELS[part]} {points}"
+                for part, points in breakdown.items()
+                if points
+            )
+            for national_id, breakdown in breakdowns.items()
+        }
+
+    @rx.event
+    async def next_match_page(self):
+        if self.has_next_match_page:
+            await self._load_match_page(self.match_offset + self.MATCH_PAGE_SIZE)
+
+    @rx.event
+    async def prev_match_page(self):
+        if self.has_prev_match_page:
+            await self._load_match_page(
+                max(0, self.match_offset - self.MATCH_PAGE_SIZE)
+            )
+
+    @rx.event
+    async def build_exchange_plan(self):
+        """Solve exchange cycles across every registered citizen at once."""
+        self.is_planning = True
+        yield
+        profiles = await registry.profiles()
+        plan = await asyncio.to_thread(solve_exchanges, profiles)
+        preview = plan["cycles"][: self.PLAN_PREVIEW_SIZE]
+        by_id = {
+            nid: await registry.get(nid)
+            for cycle in preview
+            for nid in cycle["members"]
+        }
+        self.exchange_cycles = [
+            {
+                "members": [
+                    f"{by_id[nid]['name']} (عمارة {by_id[nid]['building']}، دور {by_id[nid]['floor']})"
+                    for nid in cycle["members"]
+                ],
+                "score": cycle["score"] // len(cycle["members"]),
+            }
+            for cycle in preview
+        ]
+        self.plan_cycle_count = len(plan["cycles"])
+        self.plan_matched_count = len(profiles) - len(plan["unmatched"])
+        self.plan_unmatched_count = len(plan["unmatched"])
+        self.is_planning = False
+        self.plan_built = True
+        logging.info(
+            f"Exchange plan: {self.plan_cycle_count} cycles, total score {plan['total_score']}"
+        )
\ No newline at end of file
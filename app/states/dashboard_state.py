@@ -1,5 +1,52 @@
 import reflex as rx
+import logging
+from app.matching.batch import RematchRunning
+from app.registry.store import registry
+from app.states.citizen_state import CitizenState
 
 
 class DashboardState(rx.State):
-    pass
\ No newline at end of file
+    is_rematching: bool = False
+    rematch_done: int = 0
+    rematch_total: int = 0
+    rematch_citizens: int = 0
+    rematch_finished: bool = False
+
+    @rx.var
+    def rematch_percent(self) -> int:
+        if not self.rematch_total:
+            return 0
+        return self.rematch_done * 100 // self.rematch_total
+
+    @rx.event(background=True)
+    async def start_rematch(self):
+        """Rank every registered citizen in the background, reporting progress."""
+        async with self:
+            self.is_rematching = True
+            self.rematch_finished = False
+            self.rematch_done = 0
+            self.rematch_total = 0
+        try:
+            async for done, total in registry.rematch_all(
+                limit=CitizenState.MATCH_RESULT_LIMIT
+            ):
+                async with self:
+                    self.rematch_done = done
+                    self.rematch_total = total
+        except RematchRunning:
+            async with self:
+                self.is_rematching = False
+            yield rx.toast.info("إعادة المطابقة قيد التشغيل بالفعل.")
+            return
+        except Exception as e:
+            logging.exception(f"Error: {e}")
+            async with self:
+                self.is_rematching = False
+            yield rx.toast.error("حدث خطأ أثناء إعادة المطابقة.")
+            return
+        status = await registry.rematch_status()
+        async with self:
+            self.rematch_citizens = status["ranked"]
+            self.is_rematching = False
+            self.rematch_finished = True
+        yield rx.toast.success("اكتملت إعادة المطابقة لجميع المواطنين.")
\ No newline at end of file
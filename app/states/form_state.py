@@ -0,0 +1,28 @@
+import reflex as rx
+
+
+class FormState(rx.State, mixin=True):
+    """Validation errors of a form, as field -> message.
+
+    The mapping stays on the backend; the page sees one ``<field>_error``
+    var per field, declared with field_error. Those vars depend on
+    ``_errors`` alone, declared rather than traced, so editing a field
+    recomputes none of them, and _set_errors leaves ``_errors`` untouched
+    when a validation pass finds the same problems again.
+    """
+
+    _errors: dict[str, str] = {}
+
+    def _set_errors(self, errors: dict[str, str]):
+        if errors != self._errors:
+            self._errors = errors
+
+
+def field_error(field: str):
+    """A computed var holding the error message of ``field``, or ""."""
+
+    def error(self) -> str:
+        return self._errors.get(field, "")
+
+    error.__name__ = f"{field}_error"
+    return rx.var(error, deps=["_errors"], auto_deps=False)
\ No newline at end of file
@@ -0,0 +1,89 @@
+import reflex as rx
+import json
+import logging
+import zipfile
+from app.auth import open_url, session_account, signed_url
+from app.registry.imports import ImportRowError, import_citizens, spooled_upload
+
+EXPORT_URL = f"{rx.config.get_config().api_url}/export"
+IMPORT_URL = f"{rx.config.get_config().api_url}/import"
+UPLOAD_ID = "citizens_upload"
+
+
+class ImportState(rx.State):
+    is_importing: bool = False
+    import_done: bool = False
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    row_errors: list[ImportRowError] = []
+
+    @rx.event
+    async def start_import(self):
+        """Send the chosen file to the spooling route, then import it."""
+        account = await session_account(self)
+        if not account:
+            yield rx.toast.error("الرجاء تسجيل الدخول أولاً.", position="bottom-right")
+            return
+        self.is_importing = True
+        self.import_done = False
+        self.rows = self.inserted = self.updated = self.unchanged = self.failed = 0
+        self.row_errors = []
+        yield
+        url = json.dumps(signed_url(IMPORT_URL, account))
+        yield rx.call_script(
+            f"""(async () => {{
+                const file = document.getElementById({json.dumps(UPLOAD_ID)}).files[0];
+                if (!file) return {{}};
+                try {{
+                    const response = await fetch(
+                        {url} + "&name=" + encodeURIComponent(file.name),
+                        {{method: "POST", body: file}},
+                    );
+                    return await response.json();
+                }} catch (e) {{
+                    return {{error: String(e)}};
+                }}
+            }})()""",
+            callback=ImportState.import_upload,
+        )
+
+    @rx.event
+    async def import_upload(self, result: dict):
+        path = spooled_upload(result.get("upload", ""))
+        if path is None:
+            self.is_importing = False
+            yield rx.toast.error(
+                result.get("error") or "الرجاء اختيار ملف.", position="bottom-right"
+            )
+            return
+        try:
+            with path.open("rb") as stream:
+                async for report in import_citizens(path.name, stream):
+                    self.rows = report["rows"]
+                    self.inserted = report["inserted"]
+                    self.updated = report["updated"]
+                    self.unchanged = report["unchanged"]
+                    self.failed = report["failed"]
+                    yield
+            self.row_errors = report["errors"]
+        except (ValueError, zipfile.BadZipFile) as e:
+            logging.exception(f"Error: {e}")
+            yield rx.toast.error(str(e), position="bottom-right")
+            return
+        finally:
+            path.unlink(missing_ok=True)
+            self.is_importing = False
+        self.import_done = True
+        yield rx.set_value(UPLOAD_ID, "")
+        yield rx.toast.success("تم استيراد الملف.", position="bottom-right")
+
+    @rx.event
+    async def export_dataset(self, dataset: str, fmt: str):
+        account = await session_account(self)
+        if not account:
+            yield rx.toast.error("الرجاء تسجيل الدخول أولاً.", position="bottom-right")
+            return
+        yield open_url(signed_url(f"{EXPORT_URL}/{dataset}.{fmt}", account))
\ No newline at end of file
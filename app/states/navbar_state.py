@@ -8,12 +8,12 @@ class NavbarState(rx.State):
     @rx.event
     async def check_login_status(self):
         login_state = await self.get_state(LoginState)
-        self.is_logged_in = login_state.email != ""
+        self.is_logged_in = login_state._account != ""
 
     @rx.event
     async def logout(self):
         login_state = await self.get_state(LoginState)
-        login_state.email = ""
+        login_state._account = ""
         login_state.password = ""
         login_state.is_loading = False
         self.is_logged_in = False
@@ -1,17 +1,15 @@
 import reflex as rx
-from typing import Optional, TypedDict
-import re
-import asyncio
+from typing import ClassVar
+from app.auth import session_account
+from app.latency import simulated_latency
+from app.registry.profiles import get_profile, upsert_profile
+from app.states.form_state import FormState, field_error
+from app.validation import PROFILE_RULES, validate
 
 
-class ProfileError(TypedDict):
-    field: str
-    message: str
-
-
-class ProfileState(rx.State):
+class ProfileState(FormState, rx.State):
     full_name: str = ""
-    email: str = "user@example.com"
+    email: str = ""
     mobile_number: str = ""
     date_of_birth: str = ""
     address: str = ""
@@ -23,71 +21,82 @@ class ProfileState(rx.State):
     avatar_url: str = ""
     is_loading: bool = False
     is_saved: bool = False
-    errors: list[ProfileError] = []
-
-    @rx.event
-    def get_error(self, field: str) -> Optional[str]:
-        for error in self.errors:
-            if error["field"] == field:
-                return error["message"]
-        return None
+    PROFILE_FIELDS: ClassVar[list[str]] = [
+        "full_name",
+        "email",
+        "mobile_number",
+        "date_of_birth",
+        "address",
+        "city",
+        "state_province",
+        "postal_code",
+        "country",
+        "bio",
+        "avatar_url",
+    ]
 
-    @rx.var
-    def full_name_error(self) -> Optional[str]:
-        return self.get_error("full_name")
-
-    @rx.var
-    def email_error(self) -> Optional[str]:
-        return self.get_error("email")
-
-    @rx.var
-    def mobile_number_error(self) -> Optional[str]:
-        return self.get_error("mobile_number")
+    full_name_error = field_error("full_name")
+    email_error = field_error("email")
+    mobile_number_error = field_error("mobile_number")
 
     def _validate_fields(self):
-        self.errors = []
-        if not self.full_name:
-            self.errors.append(
-                {"field": "full_name", "message": "Full name cannot be empty."}
-            )
-        if self.mobile_number and (
-            not re.match("^\\+?1?\\d{9,15}$", self.mobile_number)
-        ):
-            self.errors.append(
-                {"field": "mobile_number", "message": "Invalid phone number format."}
+        self._set_errors(
+            validate(
+                PROFILE_RULES, {field: getattr(self, field) for field in PROFILE_RULES}
             )
+        )
+
+    async def _account_email(self) -> str:
+        """The logged-in account's email; "" when the session is logged out."""
+        return await session_account(self)
 
     @rx.event
-    async def save_profile(self):
+    async def save_profile(self, form_data: dict):
+        account_email = await self._account_email()
+        if not account_email:
+            yield rx.toast.error("Please log in to save your profile.")
+            yield rx.redirect("/login")
+            return
         self.is_loading = True
         self.is_saved = False
+        for field in self.PROFILE_FIELDS:
+            if field in form_data:
+                setattr(self, field, form_data[field])
         yield
         self._validate_fields()
-        if self.errors:
+        if self._errors:
             self.is_loading = False
             yield rx.toast.error("Please fix the errors before saving.")
             return
-        await asyncio.sleep(1.5)
+        await simulated_latency(1.5)
+        await upsert_profile(
+            account_email,
+            {field: getattr(self, field) for field in self.PROFILE_FIELDS},
+        )
         self.is_loading = False
         self.is_saved = True
         yield rx.toast.success("Profile saved successfully!", position="bottom-right")
 
     @rx.event
     async def load_profile(self):
+        account_email = await self._account_email()
+        if not account_email:
+            yield rx.redirect("/login")
+            return
         self.is_loading = True
         yield
-        await asyncio.sleep(1)
-        self.full_name = "John Doe"
-        self.email = "john.doe@example.com"
-        self.mobile_number = "+11234567890"
-        self.date_of_birth = "1990-01-01"
-        self.address = "123 Main St"
-        self.city = "Anytown"
-        self.state_province = "CA"
-        self.postal_code = "12345"
-        self.country = "USA"
-        self.bio = "Reflex enthusiast and developer."
-        self.avatar_url = (
-            f"https://api.dicebear.com/9.x/notionists/svg?seed={self.email}"
-        )
+        await simulated_latency(1)
+        profile = await get_profile(account_email)
+        # Nothing of an account used earlier in this session carries over.
+        for field in self.PROFILE_FIELDS:
+            setattr(self, field, "")
+        if profile:
+            for field, value in profile.items():
+                setattr(self, field, value)
+        else:
+            self.email = account_email
+        if not self.avatar_url:
+            self.avatar_url = (
+                f"https://api.dicebear.com/9.x/notionists/svg?seed={self.email}"
+            )
         self.is_loading = False
\ No newline at end of file
@@ -0,0 +1,72 @@
+import reflex as rx
+from typing import TypedDict
+from app.auth import open_url, session_account, signed_url
+from app.profiling import (
+    MAX_RUNS,
+    list_profiles,
+    profile_path,
+    profile_report,
+    profiler,
+)
+
+PROFILES_URL = f"{rx.config.get_config().api_url}/profiles"
+
+
+class ProfileFile(TypedDict):
+    name: str
+    size_kb: float
+    recorded: str
+
+
+class ProfilingState(rx.State):
+    profiles: list[ProfileFile] = []
+    armed_runs: int = 0
+    selected: str = ""
+    report: str = ""
+
+    @rx.event
+    async def load_profiles(self):
+        if not await session_account(self):
+            return rx.redirect("/login")
+        self.profiles = list_profiles()
+        self.armed_runs = profiler.armed(self.router.session.client_token)
+
+    @rx.event
+    async def arm_profiling(self, form_data: dict):
+        """Profile this session's next runs of the selected handlers."""
+        if not await session_account(self):
+            return rx.redirect("/login")
+        runs = form_data.get("runs", "").strip()
+        if not runs.isdigit() or not 1 <= int(runs) <= MAX_RUNS:
+            return rx.toast.error(
+                f"عدد المرات يجب أن يكون بين 1 و{MAX_RUNS}.",
+                position="bottom-right",
+            )
+        profiler.arm(self.router.session.client_token, int(runs))
+        self.armed_runs = int(runs)
+        return rx.toast.success(
+            "سيتم تحليل العمليات التالية لهذه الجلسة.", position="bottom-right"
+        )
+
+    @rx.event
+    def disarm_profiling(self):
+        profiler.arm(self.router.session.client_token, 0)
+        self.armed_runs = 0
+
+    @rx.event
+    async def show_profile(self, name: str):
+        if not await session_account(self):
+            return rx.redirect("/login")
+        path = profile_path(name)
+        if path is None:
+            self.profiles = list_profiles()
+            return rx.toast.error("الملف غير موجود.", position="bottom-right")
+        self.selected = name
+        self.report = profile_report(path)
+
+    @rx.event
+    async def download_profile(self, name: str):
+        account = await session_account(self)
+        if not account:
+            return rx.redirect("/login")
+        return open_url(signed_url(f"{PROFILES_URL}/{name}", account))
\ No newline at end of file
@@ -0,0 +1,232 @@
+import math
+import re
+from typing import NamedTuple, Optional
+from app.matching.rules import ANY, DIRECTIONS, WISH_FLOORS
+
+DIRECTION_OPTIONS = list(DIRECTIONS)
+WISH_FLOOR_OPTIONS = list(WISH_FLOORS)
+WISH_DIRECTION_OPTIONS = [*DIRECTION_OPTIONS, ANY]
+# Basements are numbered below the ground floor (0).
+MIN_FLOOR = -5
+MAX_FLOOR = 200
+CITIZEN_FIELDS = [
+    "national_id",
+    "name",
+    "building",
+    "floor",
+    "direction",
+    "phone",
+    "wish_floor",
+    "wish_direction",
+]
+
+
+class FieldRule(NamedTuple):
+    """How one form field is validated, declared once for both sides.
+
+    ``check`` applies the rule on the server; ``html_attributes`` compiles
+    it into the input's constraint attributes (required, pattern, min, max,
+    step), so the browser refuses to submit what the server would reject.
+    Patterns must match the whole value and stay within the syntax Python
+    and JavaScript share. Each message is the error shown for that rule.
+    """
+
+    required: str = ""
+    checks: tuple[tuple[str, str], ...] = ()
+    number: str = ""
+    integer: bool = False
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    exclusive_minimum: bool = False
+    range_message: str = ""
+    choices: tuple[str, ...] = ()
+    choice_message: str = ""
+
+
+def check(rule: FieldRule, value: str) -> str:
+    """The message for the first part of ``rule`` that ``value`` breaks, or ""."""
+    if not value:
+        return rule.required
+    for pattern, message in rule.checks:
+        if not re.fullmatch(pattern, value):
+            return message
+    if rule.number:
+        try:
+            number = int(value) if rule.integer else float(value)
+        except ValueError:
+            return rule.number
+        # float() takes "nan" and "inf", and overflows long runs of digits.
+        if not math.isfinite(number):
+            return rule.number
+        below = rule.minimum is not None and (
+            number <= rule.minimum if rule.exclusive_minimum else number < rule.minimum
+        )
+        if below or (rule.maximum is not None and number > rule.maximum):
+            return rule.range_message
+    if rule.choices and value not in rule.choices:
+        return rule.choice_message
+    return ""
+
+
+def validate(rules: dict[str, FieldRule], data: dict[str, str]) -> dict[str, str]:
+    """Field -> message for every field of ``data`` that breaks its rule."""
+    errors = {}
+    for field, rule in rules.items():
+        message = check(rule, data.get(field, ""))
+        if message:
+            errors[field] = message
+    return errors
+
+
+def html_attributes(rule: FieldRule) -> dict:
+    """The HTML constraint attributes enforcing ``rule`` in the browser.
+
+    The browser anchors ``pattern`` itself, so several checks become
+    lookaheads of one pattern, and ``title`` names what they require. An
+    exclusive minimum is sent as the integer above it, or as an inclusive
+    minimum for decimals, which the server then narrows.
+    """
+    attributes = {}
+    if rule.required:
+        attributes["required"] = True
+    if rule.checks:
+        *ahead, (last, _) = rule.checks
+        attributes["pattern"] = "".join(
+            [*(f"(?=(?:{pattern})$)" for pattern, _ in ahead), f"(?:{last})"]
+        )
+        attributes["title"] = " ".join(message for _, message in rule.checks)
+    if rule.number:
+        attributes["step"] = "1" if rule.integer else "any"
+        if rule.minimum is not None:
+            minimum = rule.minimum
+            if rule.exclusive_minimum and rule.integer:
+                minimum += 1
+            attributes["min"] = f"{minimum:g}"
+        if rule.maximum is not None:
+            attributes["max"] = f"{rule.maximum:g}"
+    return attributes
+
+
+CITIZEN_RULES = {
+    "name": FieldRule(required="الاسم مطلوب."),
+    "national_id": FieldRule(
+        required="الرقم القومي مطلوب.",
+        checks=(("[0-9]{14}", "الرقم القومي يجب أن يتكون من 14 رقمًا."),),
+    ),
+    "building": FieldRule(required="رقم العمارة مطلوب."),
+    "floor": FieldRule(
+        required="رقم الدور مطلوب.",
+        number="رقم الدور يجب أن يكون رقمًا صحيحًا.",
+        integer=True,
+        minimum=MIN_FLOOR,
+        maximum=MAX_FLOOR,
+        range_message=f"رقم الدور يجب أن يكون بين {MIN_FLOOR} و {MAX_FLOOR}.",
+    ),
+    "direction": FieldRule(
+        required="الاتجاه الحالي مطلوب.",
+        choices=tuple(DIRECTION_OPTIONS),
+        choice_message="الاتجاه الحالي غير معروف.",
+    ),
+    "wish_floor": FieldRule(
+        required="الرجاء تحديد الرغبة في الدور.",
+        choices=tuple(WISH_FLOOR_OPTIONS),
+        choice_message="الرغبة في الدور غير معروفة.",
+    ),
+    "wish_direction": FieldRule(
+        required="الرجاء تحديد الرغبة في الاتجاه.",
+        choices=tuple(WISH_DIRECTION_OPTIONS),
+        choice_message="الرغبة في الاتجاه غير معروفة.",
+    ),
+    "phone": FieldRule(
+        checks=(("01[0125][0-9]{8}", "صيغة رقم الموبايل غير صحيحة."),)
+    ),
+}
+MATCH_RADIUS_MESSAGE = "المسافة يجب أن تكون رقمًا موجبًا بالكيلومتر."
+MATCH_RADIUS_RULE = FieldRule(
+    checks=(("[0-9]*\\.?[0-9]+", MATCH_RADIUS_MESSAGE),),
+    number=MATCH_RADIUS_MESSAGE,
+    minimum=0,
+    exclusive_minimum=True,
+    range_message=MATCH_RADIUS_MESSAGE,
+)
+
+
+def validate_citizen(data: dict[str, str]) -> dict[str, str]:
+    """Field -> message for every rule an exchange request breaks."""
+    return validate(CITIZEN_RULES, data)
+
+
+BUILDING_FIELDS = ["name", "district", "latitude", "longitude"]
+BUILDING_RULES = {
+    "name": FieldRule(required="رقم العمارة مطلوب."),
+    "district": FieldRule(required="الحي مطلوب."),
+    **{
+        field: FieldRule(
+            number="القيمة يجب أن تكون رقمًا.",
+            minimum=-limit,
+            maximum=limit,
+            range_message=f"القيمة يجب أن تكون بين {-limit} و {limit}.",
+        )
+        for field, limit in (("latitude", 90), ("longitude", 180))
+    },
+}
+
+
+def validate_building(data: dict[str, str]) -> dict[str, str]:
+    """Field -> message for every rule a building registration breaks."""
+    errors = validate(BUILDING_RULES, data)
+    latitude, longitude = data.get("latitude", ""), data.get("longitude", "")
+    if bool(latitude) != bool(longitude):
+        field = "longitude" if latitude else "latitude"
+        errors[field] = "يجب إدخال خط العرض وخط الطول معًا."
+    return errors
+
+
+EMAIL_RULE = FieldRule(
+    required="Email cannot be empty.",
+    checks=(("[^@]+@[^@]+\\.[^@]+", "Invalid email format."),),
+)
+MOBILE_NUMBER_RULE = FieldRule(
+    checks=(("\\+?1?[0-9]{9,15}", "Invalid phone number format."),)
+)
+REGISTRATION_RULES = {
+    "email": EMAIL_RULE,
+    "password": FieldRule(
+        required="Password cannot be empty.",
+        checks=(
+            (".{8,}", "Password must be at least 8 characters."),
+            (".*[A-Z].*", "Password needs an uppercase letter."),
+            (".*[a-z].*", "Password needs a lowercase letter."),
+            (".*[0-9].*", "Password needs a number."),
+        ),
+    ),
+    "mobile_number": MOBILE_NUMBER_RULE,
+}
+LOGIN_RULES = {
+    "email": EMAIL_RULE,
+    "password": FieldRule(required="Password cannot be empty."),
+}
+PROFILE_RULES = {
+    "full_name": FieldRule(required="Full name cannot be empty."),
+    "mobile_number": MOBILE_NUMBER_RULE,
+}
+APARTMENT_RULES = {
+    "name": FieldRule(required="Name is required."),
+    "address": FieldRule(required="Address is required."),
+    "bedrooms": FieldRule(
+        number="Must be a number.",
+        integer=True,
+        minimum=0,
+        exclusive_minimum=True,
+        range_message="Must be a positive number.",
+    ),
+    **{
+        field: FieldRule(
+            number="Must be a number.",
+            minimum=0,
+            exclusive_minimum=True,
+            range_message="Must be a positive number.",
+        )
+        for field in ("bathrooms", "rent")
+    },
+}
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Cross-check of the vectorized scorer against the scan_matches reference.
+
+    python -m benchmarks.equivalence --populations 50 --size 300
+
+Every population is random, including unknown directions and wishes, and
+scored under a random ScoringProfile (the first one uses the default
+profile). For every citizen, ``CitizenColumns.score_rows`` and
+``CitizenColumns.matches_for`` must agree with ``scan_matches`` on who
+matches, with what score and in what order. Exits non-zero on the first
+difference.
+"""
+import argparse
+import random
+import sys
+from contextlib import contextmanager
+import numpy as np
+from app.matching import engine, vectorized
+from app.matching.engine import scan_matches
+from app.matching.rules import ANY, DIRECTIONS, WISH_FLOORS
+from app.matching.scoring import DEFAULT_PROFILE, ScoringProfile, Scorer
+from app.matching.vectorized import CitizenColumns
+
+BUILDINGS = 6
+MAX_FLOOR = 8
+# Unknown values become UNKNOWN codes, which must never match on either path.
+DIRECTION_VALUES = (*DIRECTIONS, "")
+WISH_FLOOR_VALUES = (*WISH_FLOORS, "")
+WISH_DIRECTION_VALUES = (*DIRECTIONS, ANY, "")
+
+
+def random_citizens(size: int, rng: random.Random) -> list[dict]:
+    return [
+        {
+            "national_id": str(29_000_000_000_000 + i),
+            "building": str(rng.randrange(BUILDINGS)),
+            "floor": rng.randint(0, MAX_FLOOR),
+            "direction": rng.choice(DIRECTION_VALUES),
+            "wish_floor": rng.choice(WISH_FLOOR_VALUES),
+            "wish_direction": rng.choice(WISH_DIRECTION_VALUES),
+        }
+        for i in range(size)
+    ]
+
+
+def random_profile(rng: random.Random) -> ScoringProfile:
+    base = rng.randint(1, 100)
+    return ScoringProfile(
+        base=base,
+        direction=rng.randint(0, 40),
+        floor_proximity=rng.randint(0, 40),
+        floor_step=rng.randint(0, 20),
+        same_building=rng.choice((0, rng.randint(1, 30))),
+        ground_floor=rng.choice((0, rng.randint(1, 30))),
+        cap=rng.randint(base, 100),
+    )
+
+
+@contextmanager
+def scoring(profile: ScoringProfile):
+    """Score with ``profile`` on both paths, whatever MATCH_SCORING says."""
+    active = Scorer(profile)
+    saved = engine.scorer, vectorized.scorer
+    engine.scorer = vectorized.scorer = active
+    try:
+        yield
+    finally:
+        engine.scorer, vectorized.scorer = saved
+
+
+def compare(citizens: list[dict]) -> str | None:
+    """The first difference between the two paths, or None."""
+    columns = CitizenColumns.from_citizens(citizens)
+    matrix = columns.score_rows(slice(None))
+    for i, citizen in enumerate(citizens):
+        expected = [
+            (match["citizen"]["national_id"], match["score"])
+            for match in scan_matches(citizen, citizens)
+        ]
+        row = matrix[i]
+        hits = np.flatnonzero(row)
+        if sorted(expected) != sorted(
+            (citizens[j]["national_id"], int(row[j])) for j in hits
+        ):
+            return f"score_rows differs for {citizen}"
+        ordered = [
+            (citizens[j]["national_id"], score) for j, score in columns.matches_for(i)
+        ]
+        if ordered != expected:
+            return f"matches_for differs for {citizen}"
+    return None
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--populations", type=int, default=50)
+    parser.add_argument("--size", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    rng = random.Random(args.seed)
+    for n in range(args.populations):
+        profile = DEFAULT_PROFILE if n == 0 else random_profile(rng)
+        citizens = random_citizens(args.size, rng)
+        with scoring(profile):
+            difference = compare(citizens)
+        if difference:
+            print(f"population {n}, {profile}: {difference}", file=sys.stderr)
+            sys.exit(1)
+    print(f"{args.populations} populations of {args.size} citizens agree.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,228 @@
+"""Match-engine benchmarks over synthetic populations, without the Reflex server.
+
+    python -m benchmarks.matching --sizes 1000 10000 --output bench.json
+
+Each size reports single-user search latency, all-pairs ranking time,
+registry upsert throughput and the memory held by the citizen records and
+match structures. Results are JSON so runs can be compared across commits.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.matching.batch import rank_rows
+from app.matching.engine import MatchIndex, scan_matches
+from app.matching.records import CitizenTable
+from app.matching.vectorized import CitizenColumns
+from app.registry.prefix import PrefixIndex
+from app.registry.store import CitizenRegistry
+from benchmarks.population import generate_citizens
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# CitizenState.MATCH_RESULT_LIMIT; imported from the state it would pull in Reflex.
+MATCH_LIMIT = 500
+# The linear scan is only timed up to this size as a baseline for the index.
+SCAN_MAX_SIZE = 100_000
+SCAN_QUERIES = 20
+UPSERT_CHUNK_SIZE = 500
+SINGLE_UPSERTS = 200
+
+
+def _latency(samples: list[float]) -> dict:
+    samples_ms = sorted(s * 1000 for s in samples)
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3),
+        "p50_ms": round(samples_ms[len(samples_ms) // 2], 3),
+        "p95_ms": round(samples_ms[int(len(samples_ms) * 0.95)], 3),
+        "max_ms": round(samples_ms[-1], 3),
+    }
+
+
+def _timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def bench_memory(size: int, seed: int) -> dict:
+    """Bytes held by the citizen table, its indexes and the numpy columns.
+
+    ``dict_records_bytes`` is the same population as plain dicts, the shape
+    citizens arrive in, for comparison.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        citizens = list(generate_citizens(size, seed))
+        dict_records = tracemalloc.get_traced_memory()[0]
+        table = CitizenTable()
+        for citizen in citizens:
+            table.put(citizen)
+        del citizens
+        gc.collect()
+        records = tracemalloc.get_traced_memory()[0]
+        index = MatchIndex(table)
+        for row in range(len(table)):
+            index.add(row, table.profile(row))
+        with_index = tracemalloc.get_traced_memory()[0]
+        names = PrefixIndex(table)
+        for row in range(len(table)):
+            names.add(row)
+        with_names = tracemalloc.get_traced_memory()[0]
+        columns = CitizenColumns.from_table(table)
+        with_columns = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del table, index, names, columns
+    return {
+        "dict_records_bytes": dict_records,
+        "records_bytes": records,
+        "index_bytes": with_index - records,
+        "prefix_bytes": with_names - with_index,
+        "columns_bytes": with_columns - with_names,
+        "bytes_per_citizen": round(with_names / size, 1),
+    }
+
+
+def bench_search(citizens: list[dict], queries: int, rng: random.Random) -> dict:
+    build_s, index = _timed(MatchIndex.from_citizens, citizens)
+    users = rng.sample(range(len(citizens)), min(queries, len(citizens)))
+    samples, hits = [], []
+    for row in users:
+        elapsed, matches = _timed(
+            index.query, index.table.profile(row), row, None, MATCH_LIMIT
+        )
+        samples.append(elapsed)
+        hits.append(len(matches))
+    result = {
+        "index_build_s": round(build_s, 3),
+        "indexed": _latency(samples),
+        "mean_hits": round(statistics.fmean(hits), 1),
+    }
+    if len(citizens) <= SCAN_MAX_SIZE:
+        result["scan"] = _latency(
+            [
+                _timed(scan_matches, citizens[row], citizens)[0]
+                for row in users[:SCAN_QUERIES]
+            ]
+        )
+    return result
+
+
+def bench_all_pairs(citizens: list[dict], sample: int, rng: random.Random) -> dict:
+    """Vectorized ranking of a sample of rows, extrapolated to everyone."""
+    build_s, columns = _timed(CitizenColumns.from_citizens, citizens)
+    rows = sorted(rng.sample(range(len(citizens)), min(sample, len(citizens))))
+    elapsed, _ = _timed(rank_rows, columns, rows, MATCH_LIMIT)
+    return {
+        "columns_build_s": round(build_s, 3),
+        "rows_ranked": len(rows),
+        "ranked_s": round(elapsed, 3),
+        "per_citizen_ms": round(elapsed * 1000 / len(rows), 3),
+        "estimated_total_s": round(elapsed * len(citizens) / len(rows), 3),
+        "exact": len(rows) == len(citizens),
+    }
+
+
+async def bench_upsert(citizens: list[dict], rng: random.Random) -> dict:
+    """Bulk load into an empty SQLite registry, then single-row updates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        try:
+            registry = CitizenRegistry(engine)
+            started = time.perf_counter()
+            for start in range(0, len(citizens), UPSERT_CHUNK_SIZE):
+                await registry.upsert_many(
+                    citizens[start : start + UPSERT_CHUNK_SIZE]
+                )
+            bulk_s = time.perf_counter() - started
+            samples = []
+            for citizen in rng.sample(citizens, min(SINGLE_UPSERTS, len(citizens))):
+                changed = {**citizen, "floor": citizen["floor"] + 1}
+                started = time.perf_counter()
+                await registry.upsert(changed)
+                samples.append(time.perf_counter() - started)
+        finally:
+            await engine.dispose()
+    return {
+        "bulk_s": round(bulk_s, 3),
+        "bulk_rows_per_s": round(len(citizens) / bulk_s),
+        "single": _latency(samples),
+        "single_rows_per_s": round(len(samples) / sum(samples)),
+    }
+
+
+def run(size: int, queries: int, sample: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    result = {"size": size, "memory": bench_memory(size, seed)}
+    citizens = list(generate_citizens(size, seed))
+    result["search"] = bench_search(citizens, queries, rng)
+    gc.collect()
+    result["all_pairs"] = bench_all_pairs(citizens, sample, rng)
+    gc.collect()
+    result["upsert"] = asyncio.run(bench_upsert(citizens, rng))
+    return result
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--queries", type=int, default=100, help="single-user searches per size"
+    )
+    parser.add_argument(
+        "--all-pairs-sample",
+        type=int,
+        default=2000,
+        help="citizens ranked per size; the full all-pairs time is extrapolated",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    report = {
+        "commit": _commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": [],
+    }
+    for size in args.sizes:
+        print(f"benchmarking {size} citizens...", file=sys.stderr)
+        report["results"].append(
+            run(size, args.queries, args.all_pairs_sample, args.seed)
+        )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
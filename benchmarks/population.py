@@ -0,0 +1,73 @@
+import random
+from typing import Iterator
+from app.validation import DIRECTION_OPTIONS, WISH_DIRECTION_OPTIONS, WISH_FLOOR_OPTIONS
+
+FIRST_NAMES = [
+    "محمد",
+    "أحمد",
+    "محمود",
+    "مصطفى",
+    "علي",
+    "حسن",
+    "إبراهيم",
+    "يوسف",
+    "فاطمة",
+    "مريم",
+    "نور",
+    "هدى",
+    "سارة",
+    "منى",
+    "آية",
+    "ياسمين",
+]
+FAMILY_NAMES = [
+    "عبد الله",
+    "السيد",
+    "حسين",
+    "عبد الرحمن",
+    "الشافعي",
+    "منصور",
+    "سليمان",
+    "عثمان",
+    "النجار",
+    "الجمال",
+    "عيسى",
+    "رمضان",
+]
+# Blocks are ground + four or five floors, one flat per direction.
+FLOORS_PER_BUILDING = (5, 6)
+FLATS_PER_FLOOR = len(DIRECTION_OPTIONS)
+# More families ask to move down than up, and about a third take any floor.
+WISH_FLOOR_WEIGHTS = [20, 45, 35]
+# "أى" is the most common direction wish; the rest spread evenly.
+WISH_DIRECTION_WEIGHTS = [15, 15, 15, 15, 40]
+
+
+def generate_citizens(count: int, seed: int = 0) -> Iterator[dict]:
+    """``count`` valid exchange requests spread over fully occupied buildings.
+
+    Floors and directions follow the buildings' layout; wishes follow the
+    weights above. The same seed always yields the same population.
+    """
+    rng = random.Random(seed)
+    building = 0
+    flats: list[tuple[int, str]] = []
+    for i in range(count):
+        if not flats:
+            building += 1
+            floors = rng.randint(*FLOORS_PER_BUILDING)
+            flats = [(f, d) for f in range(floors) for d in DIRECTION_OPTIONS]
+            rng.shuffle(flats)
+        floor, direction = flats.pop()
+        yield {
+            "national_id": str(29_000_000_000_000 + i),
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}",
+            "building": str(building),
+            "floor": floor,
+            "direction": direction,
+            "phone": f"01{rng.choice('0125')}{rng.randrange(10**8):08d}",
+            "wish_floor": rng.choices(WISH_FLOOR_OPTIONS, WISH_FLOOR_WEIGHTS)[0],
+            "wish_direction": rng.choices(
+                WISH_DIRECTION_OPTIONS, WISH_DIRECTION_WEIGHTS
+            )[0],
+        }
\ No newline at end of file
@@ -1,3 +1,9 @@
 import reflex as rx
 
-config = rx.Config(app_name="app", plugins=[rx.plugins.TailwindV3Plugin()])
+config = rx.Config(
+    app_name="app",
+    plugins=[rx.plugins.TailwindV3Plugin()],
+    # Every setter is written out, so clients can only change what a
+    # handler allows; LoginState in particular must not be settable.
+    state_auto_setters=False,
+)
\ No newline at end of file
@@ -0,0 +1,28 @@
+import random
+from app.matching.exchange import solve_exchanges
+from app.matching.rules import MatchProfile, is_match, profile
+from app.matching.scoring import scorer
+from benchmarks.equivalence import random_citizens
+
+
+def best_swaps(people: list[tuple[str, MatchProfile]]) -> int:
+    """The highest total score of any set of disjoint two-way swaps."""
+    if not people:
+        return 0
+    (_, first), rest = people[0], people[1:]
+    best = best_swaps(rest)
+    for i, (_, other) in enumerate(rest):
+        if is_match(first, other):
+            swap = scorer.score(first, other) + scorer.score(other, first)
+            best = max(best, swap + best_swaps(rest[:i] + rest[i + 1 :]))
+    return best
+
+
+def test_two_way_swaps_score_at_least_half_the_optimum():
+    rng = random.Random(0)
+    for _ in range(500):
+        citizens = random_citizens(rng.randint(4, 10), rng)
+        people = [(citizen["national_id"], profile(citizen)) for citizen in citizens]
+        plan = solve_exchanges(people, max_cycle_length=2)
+        optimum = best_swaps(people)
+        assert optimum / 2 <= plan["total_score"] <= optimum
\ No newline at end of file
@@ -0,0 +1,51 @@
+import asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.registry.store import CitizenRegistry
+
+CITIZEN = {
+    "national_id": "29901011234567",
+    "name": "أحمد علي",
+    "building": "5",
+    "floor": 2,
+    "direction": "بحرى",
+    "phone": "",
+    "wish_floor": "أى",
+    "wish_direction": "أى",
+}
+# Matches CITIZEN and is matched by it: both accept any direction.
+PARTNER = {**CITIZEN, "national_id": "29901011234568", "name": "سارة محمد", "floor": 3}
+
+
+def test_concurrent_upserts_of_one_new_citizen(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/registry.db")
+        registry = CitizenRegistry(engine)
+        await registry.upsert(PARTNER)
+        outcomes = await asyncio.gather(
+            registry.upsert(CITIZEN), registry.upsert({**CITIZEN, "floor": 4})
+        )
+        matches = await registry.match(PARTNER["national_id"])
+        count = await registry.count()
+        await engine.dispose()
+        return outcomes, matches, count
+
+    outcomes, matches, count = asyncio.run(run())
+    assert sorted(outcomes) == ["inserted", "updated"]
+    assert count == 2
+    assert [national_id for national_id, _ in matches] == [CITIZEN["national_id"]]
+
+def test_loading_flags_unknown_directions(tmp_path, caplog):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/registry.db")
+        await CitizenRegistry(engine).upsert(
+            {**CITIZEN, "floor": -1, "direction": "شمال"}
+        )
+        with caplog.at_level("WARNING", logger="app.registry.store"):
+            loaded = await CitizenRegistry(engine).get(CITIZEN["national_id"])
+        await engine.dispose()
+        return loaded
+
+    loaded = asyncio.run(run())
+    assert loaded["floor"] == -1
+    assert loaded["direction"] == ""
+    assert "unknown direction 'شمال'" in caplog.text
\ No newline at end of file
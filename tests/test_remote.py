@@ -0,0 +1,40 @@
+import asyncio
+import httpx
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.registry.remote import RemoteRegistry
+from app.registry.service import service_for
+from app.registry.store import CitizenRegistry
+from tests.test_registry import CITIZEN, PARTNER
+
+
+def test_round_trip_through_the_service(tmp_path):
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/registry.db")
+        service = service_for(CitizenRegistry(engine))
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=service), base_url="http://registry"
+        ) as client:
+            remote = RemoteRegistry(client=client)
+            assert await remote.upsert(CITIZEN) == "inserted"
+            assert await remote.get(CITIZEN["national_id"]) == CITIZEN
+            assert await remote.match(PARTNER["national_id"]) is None
+
+            watch = await remote.watch(CITIZEN["national_id"])
+            assert watch is not None
+            alerts, outcome = await asyncio.gather(
+                remote.wait_alerts(watch, timeout=5), remote.upsert(PARTNER)
+            )
+            assert outcome == "inserted"
+            assert [national_id for national_id, _ in alerts] == [
+                PARTNER["national_id"]
+            ]
+            await remote.unwatch(watch)
+
+            matches = await remote.match(CITIZEN["national_id"])
+            assert [national_id for national_id, _ in matches] == [
+                PARTNER["national_id"]
+            ]
+            assert (await remote.cache_stats())["misses"] >= 1
+        await engine.dispose()
+
+    asyncio.run(run())
\ No newline at end of file